@@ -0,0 +1,98 @@
+"""
+Microbenchmark of selection candidates with large hands.
+
+"before" is the previous implementation, which makes all
+itertools.combinations and removes duplicates with a set.
+"""
+import itertools
+import random
+from common import measure
+from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.game import Game
+from hoshizukuri_game.models.pile import Pile, PileName, PileType
+from hoshizukuri_game.models.player import Player
+from hoshizukuri_game.steps.phase_steps import (
+    PlaySelectStep, _make_playset_candidates
+)
+from hoshizukuri_game.utils.other_util import (
+    make_combination, make_permutation
+)
+
+
+def make_combination_before(cards, count, less_flag):
+    count = min(count, len(cards))
+    if len(cards) <= 0:
+        return [[]]
+    candidates = sorted(cards)
+    result = []
+    if less_flag is False:
+        for t_e in set(itertools.combinations(candidates, count)):
+            result.append(list(t_e))
+    else:
+        for i in range(count):
+            result += make_combination_before(candidates, i + 1, False)
+        result += [[]]
+    return result
+
+
+def make_permutation_before(cards, count, less_flag):
+    count = min(count, len(cards))
+    if len(cards) <= 0:
+        return [[]]
+    candidates = sorted(cards)
+    if less_flag:
+        result = []
+        for i in range(count):
+            result += make_permutation_before(candidates, i + 1, False)
+        return result + [[]]
+    queue = [[[], candidates]]
+    while len(queue[0][1]) > len(candidates) - count:
+        next_queue = []
+        for item in queue:
+            for cand in list(set(item[1])):
+                next_candidates = list(item[1])
+                next_candidates.remove(cand)
+                next_queue.append([item[0] + [cand], next_candidates])
+        queue = next_queue
+    return [n[0] for n in queue]
+
+
+def make_hand(rng: random.Random, size: int):
+    # starting cards and a few gained cards, as after many draws
+    pool = [1] * 7 + [2] * 3 + [rng.randint(6, 25) for _ in range(6)]
+    return sorted(rng.sample(pool, size))
+
+
+def main():
+    rng = random.Random(0)
+    repeat = 20
+    step = PlaySelectStep(0)
+    for size in [8, 12, 16]:
+        hand = make_hand(rng, size)
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.players[0].pile[PileName.HAND] = Pile(
+            PileType.LIST, card_list=[
+                Card(card_id, n) for n, card_id in enumerate(hand)])
+        results = {
+            "combination before": measure(
+                lambda: make_combination_before(hand, size, True), repeat),
+            "combination": measure(
+                lambda: make_combination(hand, size, True), repeat),
+            "permutation before": measure(
+                lambda: make_permutation_before(hand, 4, True), repeat),
+            "permutation": measure(
+                lambda: make_permutation(hand, 4, True), repeat),
+            "playset uncached": measure(
+                lambda: _make_playset_candidates.__wrapped__(
+                    0, tuple(hand)), repeat),
+            "playset": measure(
+                lambda: step._create_candidates(game), repeat),
+        }
+        print("hand: %d cards %s" % (size, hand))
+        for name, sec in results.items():
+            print("  %-20s: %10.1f us" % (name, sec * 1e6))
+
+
+if __name__ == "__main__":
+    main()
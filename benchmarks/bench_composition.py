@@ -0,0 +1,27 @@
+"""
+Benchmark of composition queries at mid-game positions.
+"""
+from common import mid_games, measure
+from hoshizukuri_game.steps.base.seiza_step import SeizaStep
+from hoshizukuri_game.utils.card_util import get_card_id, get_count
+
+
+def main():
+    games = mid_games(20, turn=20)
+    repeat = 200
+    hoshikuzu = get_card_id("hoshikuzu")
+    results = {"composition": 0, "get_count": 0, "seiza": 0}
+    for game in games:
+        player = game.players[0]
+        seiza = SeizaStep(0, 0, -1)
+        results["composition"] += measure(player.composition, repeat)
+        results["get_count"] += measure(
+            lambda: get_count(player.pile, hoshikuzu), repeat)
+        results["seiza"] += measure(lambda: seiza.get_victory(game), repeat)
+    print("positions: %d (turn 20)" % len(games))
+    for name, sec in results.items():
+        print("%-12s: %8.2f us" % (name, sec / len(games) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
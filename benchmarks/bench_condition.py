@@ -0,0 +1,61 @@
+"""
+Microbenchmark of get_match_card_ids for piles at mid-game positions.
+
+"before" is the previous implementation, which checks all fields of
+the condition for each card ID in the pile.
+"""
+from common import mid_games, measure
+from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.card_condition import (
+    CardCondition, CardConditionOr, get_match_card_ids, is_match_card
+)
+from hoshizukuri_game.models.pile import PileName
+from hoshizukuri_game.utils.card_util import CardColor
+
+
+def get_match_card_ids_before(pile, condition, game):
+    result = []
+    for card_id, count in enumerate(pile.composition()):
+        if count > 0 and is_match_card(Card(card_id, -1), condition, game):
+            result += [card_id] * count
+    return sorted(result)
+
+
+def make_conditions():
+    # conditions made in each play (InsekiStep and BlackholeStep)
+    return [
+        CardConditionOr([
+            CardCondition(color=CardColor.RED),
+            CardCondition(color=CardColor.BLUE),
+            CardCondition(color=CardColor.GREEN)]),
+        CardCondition(create=True),
+    ]
+
+
+def main():
+    games = mid_games(20, turn=20)
+    repeat = 200
+    results = {"before": 0, "compiled": 0}
+    for game in games:
+        piles = [
+            player.pile[pilename] for player in game.players
+            for pilename in [PileName.DECK, PileName.DISCARD]]
+
+        def before():
+            for condition in make_conditions():
+                for pile in piles:
+                    get_match_card_ids_before(pile, condition, game)
+
+        def compiled():
+            for condition in make_conditions():
+                for pile in piles:
+                    get_match_card_ids(pile, condition, game)
+        results["before"] += measure(before, repeat)
+        results["compiled"] += measure(compiled, repeat)
+    print("positions: %d (turn 20, 2 conditions x 4 piles)" % len(games))
+    for name, sec in results.items():
+        print("%-12s: %8.2f us" % (name, sec / len(games) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Benchmark of Game.fork against copy.deepcopy at mid-game positions.
+"""
+import copy
+
+from common import mid_games, measure
+
+
+def main():
+    games = mid_games(20, turn=10)
+    repeat = 50
+    fork_sec = sum(
+        measure(lambda: game.fork(), repeat) for game in games) / len(games)
+    deepcopy_sec = sum(
+        measure(lambda: copy.deepcopy(game), repeat) for game in games
+    ) / len(games)
+    print("positions: %d (turn 10)" % len(games))
+    print("deepcopy : %8.1f us" % (deepcopy_sec * 1e6))
+    print("fork     : %8.1f us" % (fork_sec * 1e6))
+    print("speedup  : %8.1f x" % (deepcopy_sec / fork_sec))
+
+
+if __name__ == "__main__":
+    main()
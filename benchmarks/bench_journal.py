@@ -0,0 +1,40 @@
+"""
+Benchmark of apply/undo with Game.checkpoint and Game.rollback
+against forking per node.
+"""
+import random
+
+from common import HoshizukuriGame, mid_games, measure
+
+
+def main():
+    games = mid_games(20, turn=10)
+    simulator = HoshizukuriGame()
+    repeat = 50
+    rng = random.Random(0)
+    fork_sec = 0
+    rollback_sec = 0
+    for game in games:
+        candidates = simulator.simulate(game)["candidates"]
+        choice = rng.choice(candidates).split("#")[0]
+
+        def by_fork():
+            simulator.simulate(game.fork(), choice)
+
+        token = game.checkpoint()
+
+        def by_rollback():
+            simulator.simulate(game, choice)
+            game.rollback(token)
+
+        fork_sec += measure(by_fork, repeat)
+        rollback_sec += measure(by_rollback, repeat)
+        game.release_journal()
+    print("positions: %d (turn 10)" % len(games))
+    print("fork + simulate    : %8.1f us" % (fork_sec / len(games) * 1e6))
+    print("simulate + rollback: %8.1f us" % (
+        rollback_sec / len(games) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
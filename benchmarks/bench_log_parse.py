@@ -0,0 +1,32 @@
+"""
+Benchmark of log parsing throughput.
+
+The logs in tests/test_log are replicated to a large corpus.
+"""
+import glob
+from common import measure
+from hoshizukuri_game.models.log import LogManager
+
+
+def main():
+    corpus = []
+    for filename in sorted(glob.glob("tests/test_log/*.txt")):
+        with open(filename) as file:
+            lines = [n.strip() for n in file.readlines()]
+        log_manager = LogManager()
+        log_manager.read_lines(lines)
+        corpus.append((log_manager, lines))
+    corpus = corpus * 200
+    line_count = sum(len(lines) for _, lines in corpus)
+
+    def parse():
+        for log_manager, lines in corpus:
+            log_manager._log_formatter.format(lines)
+
+    sec = measure(parse, 3)
+    print("files: %d, lines: %d" % (len(corpus), line_count))
+    print("format: %10.0f lines/sec" % (line_count / sec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Benchmark of Game.move_card moving a whole pile (like ReshuffleStep).
+"""
+from common import Game, measure
+from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.pile import Pile, PileType
+
+
+def main():
+    game = Game()
+    for size in [40, 200, 1000]:
+        cards = [Card(6, n + 1) for n in range(size)]
+        uniq_ids = [card.uniq_id for card in reversed(cards)]
+
+        def move():
+            discard = Pile(PileType.LIST, card_list=cards)
+            deck = Pile(PileType.LIST, card_list=[])
+            game.move_card(discard, deck, uniq_ids=uniq_ids)
+
+        sec = measure(move, 20)
+        print("cards: %5d  %10.1f us" % (size, sec * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Benchmark of encoding game states into observations.
+"""
+import json
+
+import numpy as np
+
+from common import mid_games, measure
+from hoshizukuri_game.utils.observation_util import ObservationEncoder
+
+
+def main():
+    games = mid_games(64, turn=10)
+    encoder = ObservationEncoder(2)
+    out = np.zeros((len(games), encoder.size), dtype=np.float32)
+    repeat = 50
+    sec = measure(lambda: [json.dumps(n.get_status_json()) for n in games],
+                  repeat) / len(games)
+    print("get_status_json: %8.2f us/state" % (sec * 1e6))
+    sec = measure(lambda: encoder.encode_batch(games, out), repeat) / len(
+        games)
+    print("encode_batch   : %8.2f us/state (size %d)" % (
+        sec * 1e6, encoder.size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark of random rollouts with and without step traces.
+"""
+import random
+
+from common import HoshizukuriGame, mid_games, measure
+from hoshizukuri_game.hoshizukuri_game import Trace
+
+
+def rollout(simulator, game, seed, trace):
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = game.fork()
+    if trace is None:
+        candidates = simulator.run_until_decision(game)
+        while len(candidates) > 0:
+            choice = rng.choice(candidates).split("#")[0]
+            candidates = simulator.run_until_decision(game, choice)
+        return
+    candidates = simulator.simulate(game, trace=trace)["candidates"]
+    while len(candidates) > 0:
+        choice = rng.choice(candidates).split("#")[0]
+        candidates = simulator.simulate(
+            game, choice, trace=trace)["candidates"]
+
+
+def main():
+    games = mid_games(10, turn=5)
+    simulator = HoshizukuriGame()
+    repeat = 5
+    results = {}
+    for name, trace in [
+            ("full", Trace.FULL), ("name", Trace.NAME),
+            ("off", Trace.OFF), ("decision", None)]:
+        results[name] = sum(
+            measure(lambda: rollout(simulator, game, n, trace), repeat)
+            for n, game in enumerate(games)) / len(games)
+    print("rollouts from %d positions (turn 5)" % len(games))
+    for name, sec in results.items():
+        print("%-9s: %8.2f ms (%.2f x)" % (
+            name, sec * 1e3, results["full"] / sec))
+
+
+if __name__ == "__main__":
+    main()
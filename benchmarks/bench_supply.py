@@ -0,0 +1,45 @@
+"""
+Microbenchmark of affordable supply queries at mid-game positions.
+
+"before" is the previous implementation, which checks a new Card
+for each supply pile and makes the list of all matched cards.
+"""
+from common import mid_games, measure
+from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.card_condition import (
+    CardCondition, get_match_card_ids, is_match_card
+)
+from hoshizukuri_game.models.cost import Cost
+
+
+def get_affordable_before(game, starflake):
+    condition = CardCondition(le_cost=Cost(starflake))
+    result = []
+    for pile in game.supply.values():
+        if pile.count > 0 and is_match_card(
+                Card(pile.pile_card_id, -1), condition, game):
+            result += [pile.pile_card_id] * pile.count
+    return sorted(set(result))
+
+
+def main():
+    games = mid_games(20, turn=20)
+    repeat = 200
+    results = {"before": 0, "match ids": 0, "affordable": 0}
+    for game in games:
+        starflake = 6
+        results["before"] += measure(
+            lambda: get_affordable_before(game, starflake), repeat)
+        results["match ids"] += measure(
+            lambda: get_match_card_ids(
+                game.supply, CardCondition(le_cost=Cost(starflake)),
+                game, uniq_flag=True), repeat)
+        results["affordable"] += measure(
+            lambda: game.get_affordable_supply_ids(starflake), repeat)
+    print("positions: %d (turn 20)" % len(games))
+    for name, sec in results.items():
+        print("%-12s: %8.2f us" % (name, sec / len(games) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Microbenchmark of Player.update_tmp_orbit.
+
+"before" is the previous implementation, which looks up colors
+through CardData for each card.
+"""
+from common import mid_games, measure
+from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.pile import Pile, PileName, PileType
+from hoshizukuri_game.utils.card_util import CardColor, CardData
+
+
+def update_tmp_orbit_before(player, game):
+    add_orbit = 0
+    for card_list in player.pile[PileName.FIELD].card_list:
+        if len(card_list) <= 0:
+            continue
+        stop_orbit = False
+        for card in card_list:
+            if hasattr(card, "stop_orbit") and card.stop_orbit:
+                stop_orbit = True
+                break
+        if stop_orbit:
+            continue
+        color_check = {
+            CardColor.RED: False,
+            CardColor.BLUE: False,
+            CardColor.GREEN: False
+        }
+        for card_id in [n.id for n in card_list]:
+            for color in CardData().cardinfo[card_id]["color"]:
+                color_check[color] = True
+        if (color_check[CardColor.RED] and color_check[CardColor.BLUE] and
+                color_check[CardColor.GREEN]):
+            continue
+        add_orbit += 1
+    player.tmp_orbit = player.orbit + add_orbit
+
+
+def main():
+    games = mid_games(20, turn=12)
+    repeat = 2000
+    before = 0
+    after = 0
+    for game in games:
+        # play all own cards as sets of three.
+        player = game.players[0]
+        cards = [
+            Card(card_id, n) for n, card_id in enumerate(
+                player.get_own_card_ids())]
+        player.pile[PileName.FIELD] = Pile(PileType.LISTLIST, card_list=[
+            cards[n:n + 3] for n in range(0, len(cards), 3)])
+        before += measure(
+            lambda: update_tmp_orbit_before(player, game), repeat)
+        after += measure(lambda: player.update_tmp_orbit(game), repeat)
+    print("positions: %d" % len(games))
+    print("before: %8.2f us" % (before / len(games) * 1e6))
+    print("after : %8.2f us" % (after / len(games) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
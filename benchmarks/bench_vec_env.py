@@ -0,0 +1,28 @@
+"""
+Benchmark of VecHoshizukuriEnv steps with random actions.
+"""
+import time
+
+import numpy as np
+
+import common  # noqa: F401
+from hoshizukuri_game.vec_env import VecHoshizukuriEnv
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for num_envs in [1, 64, 256]:
+        env = VecHoshizukuriEnv(num_envs)
+        _, masks = env.reset()
+        steps = 0
+        start = time.perf_counter()
+        while steps < 20000:
+            actions = [rng.choice(np.flatnonzero(m)) for m in masks]
+            _, _, _, masks, _ = env.step(actions)
+            steps += num_envs
+        sec = time.perf_counter() - start
+        print("num_envs %4d: %8.0f game steps/sec" % (num_envs, steps / sec))
+
+
+if __name__ == "__main__":
+    main()
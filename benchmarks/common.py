@@ -0,0 +1,100 @@
+"""
+Common helpers for benchmarks.
+
+Run benchmarks from the repository root, e.g.
+    python benchmarks/bench_fork.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+
+from hoshizukuri_game.hoshizukuri_game import HoshizukuriGame  # noqa: E402
+from hoshizukuri_game.models.game import Game  # noqa: E402
+from hoshizukuri_game.models.player import Player  # noqa: E402
+
+
+def new_game(player_num: int = 2):
+    """
+    Create a game which is ready to simulate.
+
+    Args:
+        player_num (int): the number of players.
+
+    Returns:
+        Game: new game.
+    """
+    game = Game()
+    game.set_players([Player(n) for n in range(player_num)])
+    game.set_supply([n for n in range(6, 26)])
+    game.set_initial_step()
+    return game
+
+
+def play_random(
+        simulator: HoshizukuriGame, game: Game,
+        rng: random.Random, max_turn: int = None):
+    """
+    Play random choices until the game finishes or reaches max_turn.
+
+    Args:
+        simulator (HoshizukuriGame): simulator.
+        game (Game): now game.
+        rng (random.Random): random generator for choices.
+        max_turn (int, Optional): stop when turn reaches this.
+
+    Returns:
+        int: the number of choices.
+    """
+    choices = 0
+    result = simulator.simulate(game)
+    while len(result["candidates"]) > 0:
+        if max_turn is not None and game.turn.turn >= max_turn:
+            break
+        choice = rng.choice(result["candidates"]).split("#")[0]
+        result = simulator.simulate(game, choice)
+        choices += 1
+    return choices
+
+
+def mid_games(count: int, turn: int = 10, seed: int = 0):
+    """
+    Make games at mid-game positions.
+
+    Args:
+        count (int): the number of games.
+        turn (int): stop at this turn.
+        seed (int): random seed.
+
+    Returns:
+        List[Game]: games.
+    """
+    random.seed(seed)
+    rng = random.Random(seed)
+    simulator = HoshizukuriGame()
+    games = []
+    for _ in range(count):
+        game = new_game()
+        play_random(simulator, game, rng, max_turn=turn)
+        games.append(game)
+    return games
+
+
+def measure(func, repeat: int):
+    """
+    Measure average seconds of func.
+
+    Args:
+        func (Callable): function to measure.
+        repeat (int): the number of calls.
+
+    Returns:
+        float: average seconds per call.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
@@ -4,10 +4,21 @@ Simulator module of the Hoshizukuri.
 from .models.game import Game
 from .models.log import LogManager
 from .models.player import Player
+from .models.journal import record_attributes
 from typing import List, Callable
+from enum import Enum
 import traceback
 
 
+class Trace(Enum):
+    """
+    How HoshizukuriGame.simulate records processed steps.
+    """
+    OFF = "off"
+    NAME = "name"
+    FULL = "full"
+
+
 class HoshizukuriGame:
     """
     This is HoshizukuriGame class.
@@ -20,7 +31,9 @@ class HoshizukuriGame:
             [Game, List[str], str], None] = None):
         self.choice_callback = choice_callback
 
-    def simulate(self, game: Game, choice: str = "", debug: bool = False):
+    def simulate(
+            self, game: Game, choice: str = "", debug: bool = False,
+            trace: Trace = Trace.FULL):
         """
         Simulate transition of game status with choice.
 
@@ -28,39 +41,80 @@ class HoshizukuriGame:
             game (Game): now game.
             choice (str): simulate with this choice.
             debug (bool): True is for show game status.
+            trace (Trace, Optional): How processed steps are recorded.
+
+        Returns:
+            Dict[str, Any]: processed steps and candidates.
+
+        Note:
+            - Result dictionary likes bellow.
+            - {"steps": STEPS, "candidates": CANDIDATES}
+            - CANDIDATES is the candidate of choices are need
+              to move the game status.
+              If game is finished, this is empty list.
+            - STEPS is empty list when trace is Trace.OFF.
+        """
+        steps = []
+        candidates = self._run(game, choice, trace, steps)
+        return {
+            "steps": steps,
+            "candidates": candidates
+        }
+
+    def run_until_decision(self, game: Game, choice: str = ""):
+        """
+        Simulate until next choice without recording steps.
+        This is for rollouts.
+
+        Args:
+            game (Game): now game.
+            choice (str): simulate with this choice.
 
         Returns:
-            List[str]: The candidate of choices are need
-                to move the game status,
+            List[str]: The candidate of choices.
                 If game is finished, this is empty list.
         """
+        return self._run(game, choice, Trace.OFF, None)
+
+    def _run(self, game: Game, choice: str, trace: Trace, steps: List[str]):
         if not hasattr(game, "log_manager"):
             game.log_manager = None
-        steps = []
         candidates = []
         game.choice = choice
-        while len(game.stack) > 0:
-            step = game.stack.pop()
+        journal = getattr(game, "journal", None)
+        stack = game.stack
+        while len(stack) > 0:
+            step = stack.pop()
+            if journal is not None:
+                journal.record(stack.append, step)
+                attributes = dict(step.__dict__)
             next_steps = step.process(game)
-            steps.append(str(step))
+            if journal is not None:
+                record_attributes(journal, step, attributes)
+            if trace is Trace.FULL:
+                steps.append(str(step))
+            elif trace is Trace.NAME:
+                steps.append(type(step).__name__)
             if len(next_steps) > 0:
-                game.stack += next_steps
+                if journal is not None:
+                    journal.record(
+                        stack.__delitem__, slice(len(stack), None))
+                stack += next_steps
             candidates = step.get_candidates(game)
             if len(candidates) > 0:
                 break
-        return {
-            "steps": steps,
-            "candidates": candidates
-        }
+        return candidates
 
     def simulate_with_log(
-            self, log_filename: str, debug: bool = False):
+            self, log_filename: str, debug: bool = False,
+            stream: bool = False):
         """
         Simulate transition of game status with log.
 
         Args:
             log_filename (str): log filename.
             debug (bool, Option): True is for show game status.
+            stream (bool, Option): True is for parsing the log lazily.
 
         Returns:
             Dict[str, ANY]: Message and Results.
@@ -70,13 +124,15 @@ class HoshizukuriGame:
             - {"message": MESSAGE, "results": [
                 {"game": GAME, "step": STEPNAME, "candidates": []}]}
             - MESSAGE: "ok" or "error message"
+            - When the log is invalid, "line" is the line number of
+              the next log. (None when there are no logs.)
 
         Raises:
             InvalidLogException: Invalid log.
         """
         log_manager = LogManager()
         log_manager.debug = debug
-        log_manager.read_log(log_filename)
+        log_manager.read_log(log_filename, stream=stream)
         players = []
         for i in range(len(log_manager.get_names())):
             players.append(Player(i))
@@ -114,6 +170,7 @@ class HoshizukuriGame:
                 traceback.print_exc()
             return {
                 "message": str(e),
+                "line": self._get_log_line(game),
                 "results": []
             }
         if game.log_manager.has_logs():
@@ -122,6 +179,7 @@ class HoshizukuriGame:
                 "message": "Logs are still there. (%s)" % (
                     game.log_manager._logs[0]
                 ),
+                "line": self._get_log_line(game),
                 "results": []
             }
         if debug:
@@ -142,3 +200,9 @@ class HoshizukuriGame:
                 }
             ]
         }
+
+    def _get_log_line(self, game: Game):
+        log_manager = game.log_manager
+        if not log_manager.has_logs():
+            return None
+        return log_manager._logs[0].line_n + 1
@@ -2,7 +2,7 @@
 This module defines the Card model.
 """
 from __future__ import annotations
-from ..utils.card_util import get_starflake, is_create
+from ..utils.card_util import get_card_table
 
 
 class Card:
@@ -19,14 +19,41 @@ class Card:
     def __init__(self, card_id: int, uniq_id: int):
         self.id = card_id
         self.uniq_id = uniq_id
-        self.starflake = get_starflake(card_id)
-        self.create = is_create(card_id)
+        table = get_card_table()
+        self.starflake = table.starflakes[card_id]
+        self.create = table.creates[card_id]
         self.stop_orbit = False
 
     def __str__(self):
         return "%d-%d" % (self.id, self.uniq_id)
 
     def reset(self):
-        self.starflake = get_starflake(self.id)
-        self.create = is_create(self.id)
+        table = get_card_table()
+        self.starflake = table.starflakes[self.id]
+        self.create = table.creates[self.id]
         self.stop_orbit = False
+
+    def is_reset(self):
+        """
+        Check if this card has the initial status.
+
+        Returns:
+            bool: True is for that reset doesn't change this card.
+        """
+        table = get_card_table()
+        return (
+            self.starflake == table.starflakes[self.id] and
+            self.create == table.creates[self.id] and
+            not self.stop_orbit
+        )
+
+    def copy(self):
+        """
+        Copy this card without looking up card data.
+
+        Returns:
+            Card: copied card.
+        """
+        card = Card.__new__(Card)
+        card.__dict__.update(self.__dict__)
+        return card
@@ -2,16 +2,15 @@
 This module defines the CardCondition model.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict, List, Union
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 if TYPE_CHECKING:
     from ..models.game import Game
 from .card import Card
-from ..utils.card_util import CardType, CardColor, get_colors
-from .cost import Cost
-from .pile import Pile, PileType
 from ..utils.card_util import (
-    get_types, get_cost, is_create,
+    CardType, CardColor, COLOR_BITS, TYPE_BITS, get_card_table
 )
+from .cost import Cost
+from .pile import Pile, PileType
 
 
 class CardCondition:
@@ -87,6 +86,145 @@ class CardConditionOr(CardCondition):
         return "/".join([str(n) for n in self.conditions])
 
 
+class CompiledCondition:
+    """
+    CardCondition compiled into tables indexed by card ID.
+    Make this with compile_condition.
+
+    Args:
+        table (Tuple[bool]): True is for matched card IDs.
+            Conditions with uniq_id are not included.
+        uniq_tables (Tuple[Tuple[int, Tuple[bool]]]): unique ID and
+            the table of each condition with uniq_id.
+    """
+    def __init__(
+            self, table: Tuple[bool],
+            uniq_tables: Tuple[Tuple[int, Tuple[bool]]] = ()):
+        self.table = table
+        self.uniq_tables = uniq_tables
+        self._card_ids = [n for n, matched in enumerate(table) if matched]
+
+    def match(self, card_id: int, uniq_id: int = -1):
+        """
+        Check if the card satisfies the condition.
+
+        Args:
+            card_id (int): card ID.
+            uniq_id (int, Optional): unique card ID.
+
+        Returns:
+            bool: If the card satisfies the condition, True.
+        """
+        if self.table[card_id]:
+            return True
+        for n, table in self.uniq_tables:
+            if n == uniq_id and table[card_id]:
+                return True
+        return False
+
+    def get_card_ids(self, pile: Pile):
+        """
+        Get card IDs of cards satisfied the condition in pile.
+        Without uniq_id, this only looks up the table for each card ID
+        in the histogram of the pile.
+
+        Args:
+            pile (Pile): target pile.
+
+        Returns:
+            List[int]: card IDs. This is not sorted.
+        """
+        if pile.type != PileType.LIST:
+            if pile.count > 0 and self.match(pile.pile_card_id):
+                return [pile.pile_card_id] * pile.count
+            return []
+        if len(self.uniq_tables) > 0:
+            return [
+                card.id for card in pile.card_list
+                if self.match(card.id, card.uniq_id)]
+        counts = pile.composition()
+        result = []
+        for card_id in self._card_ids:
+            if counts[card_id] > 0:
+                result += [card_id] * counts[card_id]
+        return result
+
+
+COMPILED_CACHE_SIZE = 1024
+"""The max number of cached results of compile_condition."""
+
+_compiled_conditions: Dict[tuple, CompiledCondition] = {}
+
+
+def compile_condition(condition: CardCondition):
+    """
+    Compile condition into tables.
+    The fields except uniq_id only depend on card IDs, so they are
+    checked for all card IDs once and the result is cached
+    for the same fields.
+
+    Args:
+        condition (CardCondition): Condition.
+
+    Returns:
+        CompiledCondition: compiled condition.
+
+    Note:
+        - Conditions with uniq_id are not cached,
+          because unique IDs differ in each game.
+        - The cache is cleared when it has COMPILED_CACHE_SIZE results.
+    """
+    key = _get_condition_key(condition)
+    if key is None:
+        return _compile_condition(condition)
+    compiled = _compiled_conditions.get(key)
+    if compiled is None:
+        if len(_compiled_conditions) >= COMPILED_CACHE_SIZE:
+            _compiled_conditions.clear()
+        compiled = _compile_condition(condition)
+        _compiled_conditions[key] = compiled
+    return compiled
+
+
+def _compile_condition(condition: CardCondition):
+    size = len(get_card_table().starflakes)
+    table = [False] * size
+    uniq_tables = []
+    conditions = [condition]
+    while len(conditions) > 0:
+        cond = conditions.pop()
+        if isinstance(cond, CardConditionOr):
+            conditions += cond.conditions
+            continue
+        cond_table = tuple([_is_match_static(n, cond) for n in range(size)])
+        if cond.uniq_id is None:
+            table = [a or b for a, b in zip(table, cond_table)]
+        else:
+            uniq_tables.append((cond.uniq_id, cond_table))
+    return CompiledCondition(tuple(table), tuple(uniq_tables))
+
+
+def _get_condition_key(condition: CardCondition):
+    """
+    Get the hashable key of the fields of condition.
+    When condition has uniq_id, this returns None.
+    """
+    if isinstance(condition, CardConditionOr):
+        keys = [_get_condition_key(cond) for cond in condition.conditions]
+        if None in keys:
+            return None
+        return ("or",) + tuple(keys)
+    if condition.uniq_id is not None:
+        return None
+    return (
+        condition.card_id,
+        None if condition.card_ids is None else tuple(condition.card_ids),
+        None if condition.le_cost is None else condition.le_cost.cost,
+        None if condition.eq_cost is None else condition.eq_cost.cost,
+        condition.type, condition.create, condition.color,
+        condition.not_card_id)
+
+
 def get_match_card_ids(
         pile_or_piles: Union[Pile, List[Pile], Dict[int, Pile]],
         condition: CardCondition,
@@ -103,41 +241,55 @@ def get_match_card_ids(
     Returns:
         list[int]: List of card ids satisfied condition.
     """
-    if isinstance(pile_or_piles, list):
-        result = []
-        for pile in pile_or_piles:
-            result += get_match_card_ids(
-                pile, condition, game, uniq_flag=uniq_flag)
-        if uniq_flag:
-            result = list(set(result))
-        result = sorted(result)
-        return result
     if isinstance(pile_or_piles, dict):
-        result = []
-        for pile in pile_or_piles.values():
-            result += get_match_card_ids(
-                pile, condition, game, uniq_flag=uniq_flag)
-        if uniq_flag:
-            result = list(set(result))
-        result = sorted(result)
-        return result
-    assert isinstance(pile_or_piles, Pile)
-    pile = pile_or_piles
-    result = []
-    if pile.type == PileType.LIST:
-        for card in pile.card_list:
-            if is_match_card(card, condition, game):
-                result.append(card.id)
+        piles = pile_or_piles.values()
+    elif isinstance(pile_or_piles, list):
+        piles = pile_or_piles
     else:
-        for _ in range(pile.count):
-            if is_match_card(Card(pile.pile_card_id, -1), condition, game):
-                result.append(pile.pile_card_id)
+        assert isinstance(pile_or_piles, Pile)
+        piles = [pile_or_piles]
+    compiled = compile_condition(condition)
+    result = []
+    for pile in piles:
+        result += compiled.get_card_ids(pile)
     if uniq_flag:
         result = list(set(result))
     result = sorted(result)
     return result
 
 
+def get_supply_match_counts(
+        supply: Dict[int, Pile], condition: CardCondition):
+    """
+    Get the number of cards satisfied condition in each supply pile.
+    Cards in a supply pile are all the same, so condition is checked
+    once for each pile without making Cards.
+
+    Args:
+        supply (Dict[int, Pile]): supply piles. (PileType.NUMBER)
+        condition (CardCondition): Condition.
+
+    Returns:
+        Dict[int, int]: the number of cards for each card ID.
+            Empty piles and unmatched piles are not included.
+            Keys are sorted.
+    """
+    compiled = compile_condition(condition)
+    counts = {}
+    for card_id in sorted(supply):
+        pile = supply[card_id]
+        assert pile.type == PileType.NUMBER
+        if pile.count > 0 and compiled.match(card_id):
+            counts[card_id] = pile.count
+    return counts
+
+
+def _has_uniq_id(condition: CardCondition):
+    if isinstance(condition, CardConditionOr):
+        return any(_has_uniq_id(cond) for cond in condition.conditions)
+    return condition.uniq_id is not None
+
+
 def is_match_card(
         card: Card, condition: CardCondition, game: Game):
     """
@@ -151,37 +303,52 @@ def is_match_card(
     Returns:
         boolean: If target card satisfies condition, True.
     """
+    return _is_match_id(card.id, card.uniq_id, condition)
+
+
+def _is_match_id(card_id: int, uniq_id: int, condition: CardCondition):
+    """
+    Check if the card with card_id and uniq_id satisfies condition.
+    This doesn't need a Card, so this is for piles without Cards.
+    """
     if isinstance(condition, CardConditionOr):
         for cond in condition.conditions:
-            if is_match_card(card, cond, game):
+            if _is_match_id(card_id, uniq_id, cond):
                 return True
         return False
-    if condition.card_id is not None:
-        if condition.card_id != card.id:
-            return False
     if condition.uniq_id is not None:
-        if condition.uniq_id != card.uniq_id:
+        if condition.uniq_id != uniq_id:
+            return False
+    return _is_match_static(card_id, condition)
+
+
+def _is_match_static(card_id: int, condition: CardCondition):
+    """
+    Check the fields of condition except uniq_id.
+    """
+    if condition.card_id is not None:
+        if condition.card_id != card_id:
             return False
     if condition.card_ids is not None:
-        if card.id not in condition.card_ids:
+        if card_id not in condition.card_ids:
             return False
+    table = get_card_table()
     if condition.type is not None:
-        types = get_types(card.id, game=game)
-        if condition.type not in types:
+        if not table.type_bits[card_id] & TYPE_BITS[condition.type]:
             return False
     if condition.le_cost is not None:
-        if (get_cost(card.id, game) <= condition.le_cost) is False:
+        if table.cost_values[card_id] > condition.le_cost.cost:
             return False
     if condition.eq_cost is not None:
-        if (get_cost(card.id, game) == condition.eq_cost) is False:
+        if table.cost_values[card_id] != condition.eq_cost.cost:
             return False
     if condition.create is not None:
-        if condition.create != is_create(card.id):
+        if condition.create != table.creates[card_id]:
             return False
     if condition.color is not None:
-        if condition.color not in get_colors(card.id):
+        if not table.color_bits[card_id] & COLOR_BITS[condition.color]:
             return False
     if condition.not_card_id is not None:
-        if condition.not_card_id == card.id:
+        if condition.not_card_id == card_id:
             return False
     return True
@@ -8,8 +8,9 @@ if TYPE_CHECKING:
     from .player import Player
 from .pile import Pile, PileType
 from .log import LogManager
+from .journal import Journal
 from .variable import Variable, VariableName
-from .trigger import Trigger
+from .trigger import Trigger, TriggerRegistry
 from ..steps.phase_steps import (
     TurnStartStep,
     PrepareFirstDeckStep,
@@ -17,14 +18,24 @@ from ..steps.phase_steps import (
 from ..steps.common.draw_step import DrawStep
 from ..steps.common.shuffle_step import ReshuffleStep
 from .card import Card
+from .card_condition import CardCondition, get_supply_match_counts
+from .cost import Cost
 from .turn import Phase, Turn, TurnType
-from typing import Dict, List
+from typing import Dict, Iterable, List
+import copy
 import random
 from ..utils.card_util import (
     get_card_id
 )
+from ..utils.hash_util import (
+    HASH_MASK, get_slot_keys, get_text_hash, get_zobrist_keys)
 from .pile import PileName
 
+_PHASE_INDICES = {phase: n for n, phase in enumerate(Phase)}
+_TURN_TYPE_INDICES = {turn_type: n for n, turn_type in enumerate(TurnType)}
+AFFORDABLE_CACHE_SIZE = 1024
+"""The max number of cached results of get_affordable_supply_ids."""
+
 
 class Game:
     """Game model class.
@@ -41,8 +52,18 @@ class Game:
         choice (str): Now player's choice.
         start_deck (List[int]): The contents of start deck.
         log_manager (LogManager): This is for simulation with shuffle it log.
+        journal (Journal): Changes for rollback. This is set by checkpoint.
+        triggers (TriggerRegistry): Triggers. A list can be set.
+        rng (random.Random): Random generator of this game.
+            When this is None, the random module is used.
+        chance (bool): True: Random events stop with chance decisions.
+            (See ReshuffleStep.)
+
+    Args:
+        seed (int, Optional): When this is set, this game has its own
+            random generator with this seed.
     """
-    def __init__(self):
+    def __init__(self, seed: int = None):
         self.version = "1.0"
         self.supply: Dict[int, Pile] = {}
         self.trash: Pile = Pile(PileType.LIST, card_list=[])
@@ -57,12 +78,168 @@ class Game:
             "hoshikuzu")] * 3 + [get_card_id("ganseki")] * 1 + [get_card_id(
                 "eisei")] * 3
         self._uniq_id = 0
+        self._object_id = 0
         self.result: List[dict] = []
         self.winner_id: int = -1
-        self.triggers: List[Trigger] = []
+        self.triggers = []
         self.variables: Dict[VariableName, Variable] = {}
         self.log_manager: LogManager = None
         self.choice_callback = None
+        self.journal: Journal = None
+        self.rng: random.Random = None
+        self.chance: bool = False
+        self._affordable_supply_cache: Dict[tuple, List[int]] = {}
+        if seed is not None:
+            self.rng = random.Random(seed)
+
+    @property
+    def triggers(self) -> TriggerRegistry:
+        return self._triggers
+
+    @triggers.setter
+    def triggers(self, triggers: Iterable[Trigger]):
+        if not isinstance(triggers, TriggerRegistry):
+            triggers = list(triggers)
+            for trigger in triggers:
+                if trigger.id is None:
+                    trigger.set_id(self.make_object_id())
+            triggers = TriggerRegistry(triggers)
+        self._triggers = triggers
+
+    def add_trigger(self, trigger: Trigger):
+        """
+        Add a trigger. Its ID is made by this game unless it has one.
+
+        Args:
+            trigger (Trigger): added trigger.
+        """
+        if trigger.id is None:
+            trigger.set_id(self.make_object_id())
+        self.triggers.append(trigger)
+
+    def fork(self):
+        """
+        Make an independent copy of this game for tree search.
+
+        Piles share their cards with this game until either game changes
+        them (copy-on-write), so the cost is about the number of piles,
+        not the number of cards.
+        Steps on the stack and triggers are deep copied together,
+        because they are changed during processing.
+
+        Returns:
+            Game: forked game.
+
+        Note:
+            - choice_callback is shared.
+            - rng is copied, so both games make the same random results.
+            - This is much faster than copy.deepcopy(game).
+        """
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.supply = {
+            card_id: pile.fork() for card_id, pile in self.supply.items()}
+        game.trash = self.trash.fork()
+        game.players = [player.fork() for player in self.players]
+        memo = {}
+        game.triggers = copy.deepcopy(self.triggers, memo)
+        game.stack = copy.deepcopy(self.stack, memo)
+        game.variables = {
+            name: variable.copy() for name, variable in self.variables.items()
+        }
+        game.start_deck = list(self.start_deck)
+        game.result = copy.deepcopy(self.result)
+        if getattr(self, "log_manager", None) is not None:
+            game.log_manager = self.log_manager.fork()
+        game.journal = None
+        if getattr(self, "rng", None) is not None:
+            game.rng = random.Random()
+            game.rng.setstate(self.rng.getstate())
+        return game
+
+    def checkpoint(self):
+        """
+        Make a checkpoint for rolling back this game in place.
+
+        After the first call, changes of piles, variables and the stack
+        are recorded in the journal, and the other small status is saved
+        in each checkpoint.
+
+        Returns:
+            int: token for rollback.
+
+        Note:
+            - The log_manager and the random state are not rolled back.
+        """
+        if getattr(self, "journal", None) is None:
+            self.journal = Journal()
+            for pile in self._get_all_piles():
+                pile.journal = self.journal
+        return self.journal.mark((
+            self.phase, self.turn, self.starflake, self.created,
+            self.choice, self._uniq_id, getattr(self, "_object_id", 0),
+            self.result, self.winner_id, self.triggers.copy(),
+            [(player.orbit, player.tmp_orbit) for player in self.players]
+        ))
+
+    def rollback(self, token: int):
+        """
+        Rewind this game to the checkpoint.
+        Checkpoints after it are discarded, but it can be used again.
+
+        Args:
+            token (int): token from checkpoint.
+        """
+        assert self.journal is not None
+        (
+            self.phase, self.turn, self.starflake, self.created,
+            self.choice, self._uniq_id, self._object_id,
+            self.result, self.winner_id, triggers, orbits
+        ) = self.journal.rollback(token)
+        self.triggers = triggers.copy()
+        for player, (orbit, tmp_orbit) in zip(self.players, orbits):
+            player.orbit = orbit
+            player.tmp_orbit = tmp_orbit
+
+    def commit(self, token: int):
+        """
+        Keep changes after the checkpoint and discard it.
+        When it is the outermost checkpoint, the journal is released,
+        so that records don't grow while no checkpoint can use them.
+
+        Args:
+            token (int): token from checkpoint.
+        """
+        assert self.journal is not None
+        self.journal.commit(token)
+        if len(self.journal.marks) == 0:
+            self.release_journal()
+
+    def release_journal(self):
+        """
+        Stop recording changes. All checkpoints are discarded.
+        """
+        self.journal = None
+        for pile in self._get_all_piles():
+            pile.journal = None
+
+    def _get_all_piles(self):
+        piles = list(self.supply.values()) + [self.trash]
+        for player in self.players:
+            piles += list(player.pile.values())
+        return piles
+
+    def get_random(self):
+        """
+        Get the random generator of this game.
+
+        Returns:
+            random.Random: rng, or the random module when rng is None.
+        """
+        rng = getattr(self, "rng", None)
+        if rng is None:
+            return random
+        return rng
 
     def make_card(self, card_id: int):
         """
@@ -78,6 +255,18 @@ class Game:
         card = Card(card_id, self._uniq_id)
         return card
 
+    def make_object_id(self):
+        """
+        Create new ID of a step or a trigger.
+        IDs are unique in this game and the games forked from it,
+        so pickled games and games in other processes don't collide.
+
+        Returns:
+            int: created ID.
+        """
+        self._object_id = getattr(self, "_object_id", 0) + 1
+        return self._object_id
+
     def set_players(self, players: List[Player]):
         """
         Set players before starting game.
@@ -99,7 +288,7 @@ class Game:
         """
         cands = list(candidates)
         if len(cands) > 8:
-            random.shuffle(cands)
+            self.get_random().shuffle(cands)
             cands = sorted(cands[:8])
 
         common_supplys = [
@@ -113,6 +302,45 @@ class Game:
             pile = Pile(PileType.NUMBER, card_id_and_count=[card_id, count])
             self.supply[pile.pile_card_id] = pile
 
+    def get_supply_counts(self):
+        """
+        Get the card counts of supply.
+        This is the same in any process for the same supply,
+        unlike versions of piles.
+
+        Returns:
+            Tuple[Tuple[int, int]]: card ID and count of each supply pile.
+        """
+        return tuple([
+            (card_id, pile.count) for card_id, pile in self.supply.items()])
+
+    def get_affordable_supply_ids(self, starflake: int):
+        """
+        Get card IDs of non-empty supply piles whose cost is
+        less equal than starflake.
+        Results are cached for each supply counts and starflake,
+        and the cache is shared with forked and pickled games.
+
+        Args:
+            starflake (int): starflake to pay.
+
+        Returns:
+            List[int]: sorted card IDs.
+        """
+        cache = getattr(self, "_affordable_supply_cache", None)
+        if cache is None:
+            cache = {}
+            self._affordable_supply_cache = cache
+        key = (self.get_supply_counts(), starflake)
+        card_ids = cache.get(key)
+        if card_ids is None:
+            if len(cache) >= AFFORDABLE_CACHE_SIZE:
+                cache.clear()
+            card_ids = list(get_supply_match_counts(
+                self.supply, CardCondition(le_cost=Cost(starflake))))
+            cache[key] = card_ids
+        return list(card_ids)
+
     def set_initial_step(self):
         """
         Set initial step for starting game.
@@ -123,7 +351,7 @@ class Game:
         )
         for n in reversed(range(len(self.players))):
             self.stack.append(DrawStep(n, 0, 4))
-            self.stack.append(ReshuffleStep(n, 0))
+            self.stack.append(ReshuffleStep(n, 0, 4))
             self.stack.append(PrepareFirstDeckStep(n))
 
     def _get_start_supply_count(self, card_id: int, player_num: int):
@@ -137,6 +365,51 @@ class Game:
                 return dic[k]
         return 2 * player_num if player_num >= 2 else 4
 
+    def get_hash(self):
+        """
+        Get the 64 bits hash of this game state.
+
+        Piles keep the hashes of their cards by card ID incrementally,
+        so this costs about the number of piles. Cards with the same
+        card ID are not distinguished, and the order in a pile is ignored.
+        Orbits, starflake, phase, turn, created, the cards of each
+        field group and the pending step (the top of the stack with
+        its candidates) are also hashed.
+
+        Returns:
+            int: hash.
+
+        Note:
+            - Steps under the top of the stack, triggers and variables
+              are not hashed.
+        """
+        slot_keys = get_slot_keys(3 + len(self.players) * len(PileName))
+        zobrist_keys = get_zobrist_keys()
+        value = sum(
+            pile.get_hash() for pile in self.supply.values()) * slot_keys[0]
+        value += self.trash.get_hash() * slot_keys[1]
+        index = 2
+        status = [
+            _PHASE_INDICES[self.phase], self.turn.turn, self.turn.player_id,
+            _TURN_TYPE_INDICES[self.turn.turn_type], self.starflake,
+            self.created]
+        for player in self.players:
+            for pile in player.pile.values():
+                value += pile.get_hash() * slot_keys[index]
+                index += 1
+            groups = player.pile[PileName.FIELD].card_list
+            status += [player.orbit, player.tmp_orbit, len(groups)]
+            status += [
+                sum([zobrist_keys[card.id] for card in group])
+                for group in groups]
+        value += hash(tuple(status)) * slot_keys[index]
+        if len(self.stack) > 0:
+            step = self.stack[-1]
+            value += get_text_hash("%s:%s" % (
+                type(step).__name__, "|".join(step.candidates)
+            )) * slot_keys[index + 1]
+        return value & HASH_MASK
+
     def get_status_json(self):
         supply = {}
         for k, v in self.supply.items():
@@ -195,12 +468,8 @@ class Game:
         moved_uniq_ids = []
         if from_pile.type == PileType.LIST:
             assert uniq_ids is not None
-            for uniq_id in uniq_ids:
-                index = from_pile.index(uniq_id=uniq_id)
-                assert index != -1
-                move_card = from_pile.card_list[index]
+            for move_card in from_pile.remove_cards(uniq_ids):
                 moved_uniq_ids.append(move_card.uniq_id)
-                from_pile.remove_at(index)
                 if to_pile.type == PileType.LISTLIST:
                     to_pile.insert(move_card, orbit_index, -1)
                 else:
@@ -211,13 +480,9 @@ class Game:
         elif from_pile.type == PileType.LISTLIST:
             assert uniq_ids is not None
             for uniq_id in uniq_ids:
-                index = from_pile.index(uniq_id=uniq_id)
+                index, sub_index = from_pile.position(uniq_id)
                 assert index != -1
-                sub_index = [n.uniq_id for n in from_pile.card_list[
-                    index]].index(uniq_id)
-                assert sub_index != -1
-                move_card = from_pile.card_list[index][sub_index]
-                from_pile.remove_at(index, sub_index)
+                move_card = from_pile.remove_at(index, sub_index)
                 if reverse:
                     to_pile.insert(move_card, 0)
                 else:
@@ -0,0 +1,113 @@
+"""
+This module defines the Journal model.
+"""
+from typing import Any, Callable, List, Tuple
+
+
+class Journal:
+    """Journal model class.
+
+    This records how to undo changes of a game,
+    so that the game can be rewound to a checkpoint in place.
+
+    Attributes:
+        records (List[Tuple[Callable, tuple]]): Undo functions and arguments.
+        marks (List[Tuple[int, Any]]): Checkpoints.
+            Each is the number of records and the snapshot of the game.
+    """
+    def __init__(self):
+        self.records: List[Tuple[Callable, tuple]] = []
+        self.marks: List[Tuple[int, Any]] = []
+
+    def record(self, undo: Callable, *args):
+        """
+        Record a change.
+
+        Args:
+            undo (Callable): This is called with args when rolling back.
+            args: Arguments of undo.
+        """
+        self.records.append((undo, args))
+
+    def mark(self, snapshot: Any):
+        """
+        Make a checkpoint.
+
+        Args:
+            snapshot (Any): Values which are not recorded as changes.
+
+        Returns:
+            int: token of the checkpoint.
+        """
+        self.marks.append((len(self.records), snapshot))
+        return len(self.marks) - 1
+
+    def rollback(self, token: int):
+        """
+        Undo changes after the checkpoint.
+        Checkpoints after this are discarded.
+
+        Args:
+            token (int): token of the checkpoint.
+
+        Returns:
+            Any: the snapshot of the checkpoint.
+        """
+        assert token >= 0 and token < len(self.marks)
+        size, snapshot = self.marks[token]
+        records = self.records
+        while len(records) > size:
+            undo, args = records.pop()
+            undo(*args)
+        del self.marks[token + 1:]
+        return snapshot
+
+    def commit(self, token: int):
+        """
+        Keep changes after the checkpoint.
+        The checkpoint and checkpoints after this are discarded.
+        When this is the outermost checkpoint, records after it
+        are discarded too because nothing can be rolled back to them.
+
+        Args:
+            token (int): token of the checkpoint.
+        """
+        assert token >= 0 and token < len(self.marks)
+        size = self.marks[token][0]
+        del self.marks[token:]
+        if len(self.marks) == 0:
+            del self.records[size:]
+
+
+def record_attributes(journal: Journal, obj: Any, attributes: dict):
+    """
+    Record attributes of an object which are changed from attributes.
+    Unchanged attributes are not kept in the journal.
+
+    Args:
+        journal (Journal): journal.
+        obj (Any): target object.
+        attributes (dict): attributes saved by dict(obj.__dict__)
+            before the change.
+    """
+    current = obj.__dict__
+    changed = {
+        key: value for key, value in attributes.items()
+        if key not in current or current[key] is not value}
+    added = [key for key in current if key not in attributes]
+    if len(changed) > 0 or len(added) > 0:
+        journal.record(restore_attributes, obj, changed, added)
+
+
+def restore_attributes(obj: Any, attributes: dict, added: List[str] = ()):
+    """
+    Restore attributes of an object.
+
+    Args:
+        obj (Any): target object.
+        attributes (dict): old values of the changed attributes.
+        added (List[str], Optional): names of the added attributes.
+    """
+    obj.__dict__.update(attributes)
+    for key in added:
+        del obj.__dict__[key]
@@ -16,7 +16,7 @@ class TargetLimit:
             self,
             limit_class: Type[Limit],
             player_id: int = None,
-            trigger_id: str = None,
+            trigger_id: int = None,
             card_id: int = None,
             uniq_id: int = None,
             uniq_turn: int = None):
@@ -60,22 +60,33 @@ class LimitTriggerActivate(Limit):
     Lifetime is until the trigger will be activated.
 
     Args:
-        trigger_id (str): Trigger unique ID.
+        trigger_id (int): Trigger unique ID.
 
     Note:
         - When trigger_id is None, this will be set during added in trigger.
     """
-    def __init__(self, trigger_id: str):
+    def __init__(self, trigger_id: int):
         super().__init__()
         self.trigger_id = trigger_id
 
     def __str__(self):
         trigger_id = "None"
         if self.trigger_id is not None:
-            trigger_id = self.trigger_id
+            trigger_id = str(self.trigger_id)
         return "limit:trigger_activate:%s" % trigger_id
 
 
+class LimitTurn(Limit):
+    """
+    Lifetime is until the end of the turn.
+    """
+    def __init__(self):
+        pass
+
+    def __str__(self):
+        return "limit:turn"
+
+
 class LimitForever(Limit):
     """
     Lifetime is forever.
@@ -107,4 +118,6 @@ def is_match_limit(target_limit: TargetLimit, limit: Limit):
         return False
     if isinstance(limit, LimitTriggerActivate):
         return target_limit.trigger_id == limit.trigger_id
+    if isinstance(limit, LimitTurn):
+        return True
     raise Exception("Not found limit:", limit.__class__)
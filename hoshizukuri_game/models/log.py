@@ -2,11 +2,13 @@
 This module defines the Log model.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Deque, Iterable, Iterator, List
 if TYPE_CHECKING:
     from ..models.game import Game
 from enum import Enum
 from ..utils.card_util import get_card_id, str2ids, is_same_card_ids
+from collections import deque
+import itertools
 import re
 from copy import deepcopy
 
@@ -223,13 +225,22 @@ class Log():
 class LogFormatter():
     """
     Make Log list from log strings.
+
+    Note:
+        - Patterns are dispatched by their keyword,
+          which is the first word after <PLAYER> (e.g. "draws")
+          or the first word of the pattern (e.g. "Turn").
     """
     def __init__(self):
         self._names = []
         self.preds = []
+        self._dispatch = {}
         for pred in sorted([
                 n.value for n in Command]):
-            self.preds.append(self._get_re_pattern(pred))
+            pattern = self._get_re_pattern(pred)
+            self.preds.append(pattern)
+            self._dispatch.setdefault(
+                self._get_keyword(pred), []).append(pattern)
 
     def set_names(self, names):
         """
@@ -240,6 +251,33 @@ class LogFormatter():
         """
         self._names = names
 
+    def _get_keyword(self, line: str, name: str = "<PLAYER>"):
+        if line.startswith(name + " "):
+            line = line[len(name) + 1:]
+        return line.split(" ", 1)[0]
+
+    def _get_preds(self, line: str):
+        """
+        Get patterns which can match the line.
+        All patterns are returned when the keyword is unknown.
+        """
+        dispatch = self._dispatch
+        preds = dispatch.get(self._get_keyword(line, ""))
+        for name in self._names:
+            if not line.startswith(name + " "):
+                continue
+            name_preds = dispatch.get(self._get_keyword(line, name))
+            if name_preds is None or preds is name_preds:
+                continue
+            if preds is None:
+                preds = name_preds
+            else:
+                preds = [
+                    n for n in self.preds if n in preds or n in name_preds]
+        if preds is None:
+            return self.preds
+        return preds
+
     def _get_re_pattern(self, pred: str):
         replaced_pred = pred
         replace_tokens = ["(", ")", "+", "$", ".", "[", "]"]
@@ -254,46 +292,74 @@ class LogFormatter():
         return {
             "command": Command(pred),
             "re_pattern": replaced_pred,
+            "compiled": re.compile(replaced_pred),
             "key_list": keys
         }
 
     def _get_indent_and_line(self, line: str):
-        m = re.match(r"@*", line)
-        indent = len(m.group())
-        line = line.replace("@", "")
+        indent = len(line) - len(line.lstrip("@"))
+        if indent > 0 or "@" in line:
+            line = line.replace("@", "")
         return indent, line
 
     def format(self, lines: List[str]) -> List[Log]:
+        return list(self.iter_format(lines))
+
+    def iter_format(self, lines: Iterable[str]) -> Iterator[Log]:
+        """
+        Make Logs from log strings lazily.
+        Lines before "starts with" are skipped,
+        and this stops at "Game over.".
+
+        Args:
+            lines (Iterable[str]): log strings.
+
+        Yields:
+            Log: log.
+        """
+        lines = iter(lines)
         # skip initial lines
+        head_lines = []
         index = 0
-        for n, line in enumerate(lines):
+        for line in lines:
             if "starts with" in line:
-                index = n
+                index = len(head_lines)
+                head_lines = [line]
                 break
-        result_logs = []
-        lines = lines[index:]
-        while len(lines) > 0:
-            if lines[0] == "Game over.":
+            head_lines.append(line)
+        for line in itertools.chain(head_lines, lines):
+            if line == "Game over.":
                 break
-            logs, lines = self._make_log(lines)
-            for log in logs:
+            for log in self._make_line_log(line):
                 log.line_n = index
+                yield log
             index += 1
-            result_logs += logs
-        return result_logs
 
     def _make_log(self, lines: List[str]):
-        line = lines[0]
+        return self._make_line_log(lines[0]), lines[1:]
+
+    def _make_line_log(self, line: str) -> List[Log]:
         if line == "":
-            return [], lines[1:]
+            return []
         indent, line = self._get_indent_and_line(line)
-        for pred in self.preds:
-            m = re.match(pred["re_pattern"], line)
+        preds = self._get_preds(line)
+        for pred in preds:
+            m = pred["compiled"].match(line)
             if m:
                 log = self._parse_log(m, pred, indent, line)
                 if log is None:
                     continue
-                return [log], lines[1:]
+                return [log]
+        if preds is not self.preds:
+            # fallback for unusual names
+            for pred in self.preds:
+                if pred in preds:
+                    continue
+                m = pred["compiled"].match(line)
+                if m:
+                    log = self._parse_log(m, pred, indent, line)
+                    if log is not None:
+                        return [log]
         raise Exception("Not found command pattern: %s", line)
 
     def _parse_log(self, m: re.Match, pred: dict, indent: int, line: str):
@@ -311,15 +377,56 @@ class LogFormatter():
 class LogManager():
     """
     LogManager model class.
+
+    Note:
+        - In stream mode, logs are parsed lazily
+          and only a few logs ahead are kept in _logs.
     """
     def __init__(self):
         self.debug = False
         self._names: List[str] = []
         self._supply_ids: List[int] = []
         self._logs: List[Log] = []
+        self._log_iter: Iterator[Log] = None
         self._log_formatter: LogFormatter = LogFormatter()
         self._result: List[dict] = []
 
+    @property
+    def _logs(self) -> Deque[Log]:
+        """
+        Logs which are read and not popped yet.
+        """
+        return self._log_buffer
+
+    @_logs.setter
+    def _logs(self, logs: Iterable[Log]):
+        self._log_buffer = deque(logs)
+
+    def fork(self):
+        """
+        Make a copy of this for another game state.
+        Logs are shared, but popping logs doesn't affect each other.
+
+        Returns:
+            LogManager: forked log manager.
+        """
+        log_manager = LogManager.__new__(LogManager)
+        log_manager.__dict__.update(self.__dict__)
+        log_manager._logs = self._logs
+        if self._log_iter is not None:
+            self._log_iter, log_manager._log_iter = itertools.tee(
+                self._log_iter)
+        return log_manager
+
+    def __deepcopy__(self, memo):
+        log_manager = self.fork()
+        memo[id(self)] = log_manager
+        for key, value in self.__dict__.items():
+            if key not in ["_log_iter", "_log_buffer"]:
+                setattr(log_manager, key, deepcopy(value, memo))
+        log_manager._logs = [deepcopy(n, memo) for n in self._logs]
+        return log_manager
+
     def get_names(self):
         """
         Get player names.
@@ -406,6 +513,8 @@ class LogManager():
         Returns:
             str: "ok" or error message.
         """
+        while self._log_iter is not None:
+            self._fill(len(self._logs) + 1)
         if len(self._result) == 0:
             return "Not found result of log."
         if len(self._result) != len(result):
@@ -420,20 +529,73 @@ class LogManager():
                     )
         return "ok"
 
-    def read_log(self, filename: str):
+    def read_log(self, filename: str, stream: bool = False):
         """
         Read log.
 
         Args:
             filename (str): filename of log.
+            stream (bool, Optional): True is for parsing logs lazily.
+        """
+        if stream:
+            self.read_lines(_read_lines(filename), stream=True)
+            return
+        with open(filename) as file:
+            lines = [n.strip() for n in file.readlines()]
+        self.read_lines(lines)
+
+    def read_lines(self, lines: Iterable[str], stream: bool = False):
+        """
+        Read log from strings.
+
+        Args:
+            lines (Iterable[str]): log strings.
+            stream (bool, Optional): True is for parsing logs lazily.
+                lines can be an iterator.
+
+        Note:
+            - In stream mode, player names and supplies are read
+              from the lines before the first turn.
         """
-        lines = [n.strip() for n in open(filename).readlines()]
-        lines = self._preprocess(lines)
-        self._names = self._get_names(lines)
-        self._supply_ids = self._get_supply(lines)
+        if not stream:
+            lines = self._preprocess(lines)
+            self._names = self._get_names(lines)
+            self._supply_ids = self._get_supply(lines)
+            self._log_formatter.set_names(self._names)
+            self._logs = self._log_formatter.format(lines)
+            self._log_iter = None
+            self._result = self._get_result(lines)
+            return
+        lines = (line for line in lines if not self._is_invalid_line(line))
+        head_lines = []
+        for line in lines:
+            head_lines.append(line)
+            if line.startswith("Turn - "):
+                break
+        self._names = self._get_names(head_lines)
+        self._supply_ids = self._get_supply(head_lines)
         self._log_formatter.set_names(self._names)
-        self._logs = self._log_formatter.format(lines)
-        self._result = self._get_result(lines)
+        self._logs = []
+        self._result = []
+        self._log_iter = self._stream_logs(
+            itertools.chain(head_lines, lines), self._result)
+
+    def _stream_logs(self, lines: Iterator[str], result: List[dict]):
+        yield from self._log_formatter.iter_format(lines)
+        # lines after "Game over."
+        result += self._get_result(list(lines))
+
+    def _fill(self, size: int):
+        """
+        Read logs from the stream until _logs has size logs.
+        """
+        logs = self._log_buffer
+        while len(logs) < size and self._log_iter is not None:
+            log = next(self._log_iter, None)
+            if log is None:
+                self._log_iter = None
+            else:
+                logs.append(log)
 
     def _preprocess(self, lines: List[str]):
         """
@@ -441,11 +603,14 @@ class LogManager():
         """
         fix_lines = []
         for line in lines:
-            if "draws ." in line:
+            if self._is_invalid_line(line):
                 continue
             fix_lines.append(line)
         return fix_lines
 
+    def _is_invalid_line(self, line: str):
+        return "draws ." in line
+
     def pop(self):
         """
         Pop next Log.
@@ -453,9 +618,9 @@ class LogManager():
         Returns:
             Log: next log.
         """
+        self._fill(1)
         if len(self._logs) > 0:
-            log = self._logs[0]
-            del self._logs[0]
+            log = self._logs.popleft()
             if self.debug:
                 print('\033[31m'+'%s' % log+'\033[0m')
             return log
@@ -472,6 +637,7 @@ class LogManager():
         Returns:
             bool: True if for match.
         """
+        self._fill(offset + 1)
         if log_condition is None:
             raise Exception("Invalid Log, %s %d" % (
                 self._logs[offset].line, self._logs[offset].line_n + 1))
@@ -517,6 +683,7 @@ class LogManager():
         Returns:
             bool: True is that there are any logs.
         """
+        self._fill(1)
         return len(self._logs) > 0
 
     def get_indent(self, offset: int):
@@ -529,6 +696,7 @@ class LogManager():
         Returns:
             int: indent. (This is None when offset is out of log size.)
         """
+        self._fill(offset + 1)
         if len(self._logs) <= offset:
             return None
         return self._logs[offset].indent
@@ -563,3 +731,9 @@ class LogManager():
         if self.debug:
             print('\033[32m'+'%s' % self._logs[0]+'\033[0m')
         return self._logs[offset]
+
+
+def _read_lines(filename: str):
+    with open(filename) as file:
+        for line in file:
+            yield line.strip()
@@ -6,7 +6,38 @@ from enum import Enum
 from typing import TYPE_CHECKING, Union
 if TYPE_CHECKING:
     from .card import Card
-from typing import List
+    from .journal import Journal
+from typing import Dict, List
+import itertools
+
+
+_card_id_size = None
+_zobrist_keys = None
+_versions = itertools.count(1)
+_fork_generation = 0
+"""The number of forks. Rollback copies cards removed before a fork."""
+
+
+def _get_card_id_size():
+    """
+    Get the size of lists indexed by card ID.
+    """
+    global _card_id_size
+    if _card_id_size is None:
+        from ..utils.card_util import get_card_table
+        _card_id_size = len(get_card_table().starflakes)
+    return _card_id_size
+
+
+def _get_zobrist_keys():
+    """
+    Get the hash key of each card ID.
+    """
+    global _zobrist_keys
+    if _zobrist_keys is None:
+        from ..utils.hash_util import get_zobrist_keys
+        _zobrist_keys = get_zobrist_keys()
+    return _zobrist_keys
 
 
 class PileName(Enum):
@@ -58,6 +89,16 @@ class Pile:
         count (int): The number of cards.
         card_list (list[Card] or list[list[Card]]):
             The list of Cards (Only LIST Type or LISTLIST Type).
+        journal (Journal): When this is set, changes are recorded
+            for rolling back.
+        version (int): This is renewed whenever the pile is changed.
+            Versions are unique in the process, so piles with the same
+            version (forked and not changed) have the same cards.
+
+    Note:
+        - card_list is read only from outside.
+          Use insert, remove_at and update_card to change the pile,
+          because forked piles share card_list until they are changed.
     """
     def __init__(
             self, pile_type: PileType,
@@ -68,6 +109,12 @@ class Pile:
         self.pile_card_id = None
         self.count = 0
         self.card_list = []
+        self._shared = False
+        self._cards: Dict[int, Card] = {}
+        self._counts: List[int] = []
+        self._hash = 0
+        self.journal: Journal = None
+        self.version = next(_versions)
         if pile_type == PileType.NUMBER:
             self.pile_card_id = card_id_and_count[0]
             self.count = card_id_and_count[1]
@@ -83,6 +130,7 @@ class Pile:
                 self.count = 0
                 for pile in card_list:
                     self.count += len(pile)
+        self._index_cards()
 
     def __str__(self):
         if self.type == PileType.NUMBER:
@@ -115,26 +163,44 @@ class Pile:
             return -1
         elif self.type == PileType.LIST:
             if uniq_id is not None:
-                for i, card in enumerate(self.card_list):
-                    if card.uniq_id == uniq_id:
-                        return i
-                return -1
+                card = self._cards.get(uniq_id)
+                if card is None:
+                    return -1
+                return self.card_list.index(card)
             for i, card in enumerate(self.card_list):
                 if card.id == card_id:
                     return i
             return -1
         if uniq_id is not None:
-            for i, card_list in enumerate(self.card_list):
-                for card in card_list:
-                    if card.uniq_id == uniq_id:
-                        return i
-            return -1
+            return self.position(uniq_id)[0]
         for i, card_list in enumerate(self.card_list):
             for card in card_list:
                 if card.id == card_id:
                     return i
         return -1
 
+    def position(self, uniq_id: int):
+        """
+        Get the position of a card with uniq_id.
+
+        Args:
+            uniq_id (int): unique ID.
+
+        Returns:
+            Tuple[int, int]: index and sub index.
+                sub index is None for PileType.LIST.
+                When PileType.NUMBER or not found, (-1, None).
+        """
+        card = self._cards.get(uniq_id)
+        if card is None:
+            return -1, None
+        if self.type == PileType.LIST:
+            return self.card_list.index(card), None
+        for i, card_list in enumerate(self.card_list):
+            if card in card_list:
+                return i, card_list.index(card)
+        return -1, None
+
     def push(self, card: Card):
         """
         Add a card at the last position of pile.
@@ -156,6 +222,7 @@ class Pile:
             index (int): position. -1 is the last.
             sub_index (int): sub index for PileType.LISTLIST. -1 is the last.
         """
+        self._own()
         if self.type != PileType.NUMBER:
             if index == -1:
                 index = len(self.card_list)
@@ -170,6 +237,9 @@ class Pile:
         if self.type == PileType.LIST:
             self.card_list.insert(index, card)
             self.count = len(self.card_list)
+            self._cards[card.uniq_id] = card
+            self._counts[card.id] += 1
+            self._hash += _get_zobrist_keys()[card.id]
         if self.type == PileType.NUMBER:
             assert self.pile_card_id == card.id
             self.count += 1
@@ -180,6 +250,11 @@ class Pile:
             assert sub_index >= 0 and sub_index <= len(self.card_list[index])
             self.card_list[index].insert(sub_index, card)
             self.count += 1
+            self._cards[card.uniq_id] = card
+            self._counts[card.id] += 1
+            self._hash += _get_zobrist_keys()[card.id]
+        if self.journal is not None:
+            self.journal.record(self._undo_insert, index, sub_index)
 
     def remove_at(self, index: int, sub_index: int = None):
         """
@@ -188,11 +263,17 @@ class Pile:
         Args:
             index (int): index.
             sub_index (int): sub index for PileType.LISTLIST
+
+        Returns:
+            Card: Removed card. (PileType.NUMBER returns None.)
         """
+        self._own()
+        card = None
+        removed_group = False
         if self.type != PileType.NUMBER:
             assert index >= 0 and index < len(self.card_list)
         if self.type == PileType.LIST:
-            del self.card_list[index]
+            card = self.card_list.pop(index)
             self.count = len(self.card_list)
         elif self.type == PileType.NUMBER:
             self.count -= 1
@@ -201,18 +282,289 @@ class Pile:
             assert sub_index is not None
             assert sub_index >= 0 and sub_index < len(self.card_list[index])
             self.count -= 1
-            del self.card_list[index][sub_index]
+            card = self.card_list[index].pop(sub_index)
             if len(self.card_list[index]) == 0:
                 del self.card_list[index]
+                removed_group = True
+        if card is not None:
+            del self._cards[card.uniq_id]
+            self._counts[card.id] -= 1
+            self._hash -= _get_zobrist_keys()[card.id]
+        if self.journal is not None:
+            self.journal.record(
+                self._undo_remove, card, index, sub_index, removed_group,
+                _fork_generation)
+        return card
+
+    def remove_cards(self, uniq_ids: List[int]):
+        """
+        Remove cards with unique IDs at once.
+        This is for PileType.LIST and PileType.LISTLIST.
+
+        Args:
+            uniq_ids (List[int]): unique IDs of removed cards.
+
+        Returns:
+            List[Card]: Removed cards in the order of uniq_ids.
+        """
+        assert self.type != PileType.NUMBER
+        if self.type == PileType.LISTLIST:
+            return [self.remove_at(
+                *self.position(uniq_id)) for uniq_id in uniq_ids]
+        removed_uniq_ids = set(uniq_ids)
+        assert len(removed_uniq_ids) == len(uniq_ids)
+        for uniq_id in uniq_ids:
+            assert uniq_id in self._cards
+        self._own()
+        cards = [self._cards.pop(uniq_id) for uniq_id in uniq_ids]
+        for card in cards:
+            self._counts[card.id] -= 1
+            self._hash -= _get_zobrist_keys()[card.id]
+        card_list = []
+        positions = []
+        for i, card in enumerate(self.card_list):
+            if card.uniq_id in removed_uniq_ids:
+                positions.append(i)
+            else:
+                card_list.append(card)
+        if self.journal is not None:
+            self.journal.record(
+                self._undo_remove_cards, positions,
+                [self.card_list[i] for i in positions], _fork_generation)
+        self.card_list = card_list
+        self.count = len(card_list)
+        return cards
 
     def get_card(self, uniq_id: int):
+        """
+        Get a card with unique ID.
+
+        Args:
+            uniq_id (int): unique ID.
+
+        Returns:
+            Card: the card. When not found, None.
+        """
+        return self._cards.get(uniq_id)
+
+    def get_count(self, card_id: int):
+        """
+        Get the number of cards with card ID.
+
+        Args:
+            card_id (int): card ID.
+
+        Returns:
+            int: the number of cards.
+        """
+        if self.type == PileType.NUMBER:
+            return self.count if self.pile_card_id == card_id else 0
+        return self._counts[card_id]
+
+    def composition(self):
+        """
+        Get the number of cards for each card ID.
+
+        Returns:
+            List[int]: the number of cards. Index is card ID.
+        """
+        if self.type == PileType.NUMBER:
+            counts = [0] * _get_card_id_size()
+            counts[self.pile_card_id] = self.count
+            return counts
+        return list(self._counts)
+
+    def get_hash(self):
+        """
+        Get the hash of the cards in this pile.
+        This is the sum of the hash keys of card IDs, so it doesn't
+        depend on the order of cards and unique IDs.
+        This is updated whenever cards are added or removed.
+
+        Returns:
+            int: hash. (not masked to 64 bits)
+        """
+        if self.type == PileType.NUMBER:
+            return self.count * _get_zobrist_keys()[self.pile_card_id]
+        return self._hash
+
+    def set_cards(self, card_list: List[Card]):
+        """
+        Replace all cards of this pile. This is for PileType.LIST.
+
+        Args:
+            card_list (List[Card]): new cards. They can be shared with
+                other piles, so they are copied before changed.
+        """
+        assert self.type == PileType.LIST
+        if self.journal is not None:
+            self.journal.record(self._undo_set_cards, self.card_list)
+        self._undo_set_cards(card_list)
+
+    def update_card(
+            self, uniq_id: int, starflake: int = None,
+            create: bool = None, stop_orbit: bool = None):
+        """
+        Change the status of a card in this pile.
+
+        Args:
+            uniq_id (int): unique ID of the card.
+            starflake (int, Optional): new starflake.
+            create (bool, Optional): new create.
+            stop_orbit (bool, Optional): new stop_orbit.
+
+        Returns:
+            Card: the changed card. When not found, None.
+        """
+        self._own()
+        card = self.get_card(uniq_id)
+        if card is None:
+            return None
+        if self.journal is not None:
+            self.journal.record(self._undo_update, [(
+                uniq_id, card.starflake, card.create, card.stop_orbit)])
+        if starflake is not None:
+            card.starflake = starflake
+        if create is not None:
+            card.create = create
+        if stop_orbit is not None:
+            card.stop_orbit = stop_orbit
+        return card
+
+    def reset_cards(self):
+        """
+        Reset the status of all cards in this pile.
+        """
+        cards = self.card_list
+        if self.type == PileType.LISTLIST:
+            cards = [
+                card for card_list in self.card_list for card in card_list]
+        if all(card.is_reset() for card in cards):
+            return
+        self._own()
+        cards = self.card_list
+        if self.type == PileType.LISTLIST:
+            cards = [
+                card for card_list in self.card_list for card in card_list]
+        if self.journal is not None:
+            self.journal.record(self._undo_update, [(
+                card.uniq_id, card.starflake, card.create, card.stop_orbit
+            ) for card in cards if not card.is_reset()])
+        for card in cards:
+            card.reset()
+
+    def fork(self):
+        """
+        Make a copy of this pile for another game state.
+
+        The copy shares card_list and Cards with this pile
+        until either of them is changed. (copy-on-write)
+
+        Returns:
+            Pile: forked pile.
+        """
+        global _fork_generation
+        _fork_generation += 1
+        pile = Pile.__new__(Pile)
+        pile.__dict__.update(self.__dict__)
+        pile.journal = None
+        if self.type != PileType.NUMBER:
+            self._shared = True
+            pile._shared = True
+        return pile
+
+    def _own(self):
+        """
+        Copy shared card_list and Cards before changing this pile,
+        and renew the version.
+        """
+        self.version = next(_versions)
+        if not self._shared:
+            return
         if self.type == PileType.LIST:
-            for card in self.card_list:
-                if card.uniq_id == uniq_id:
-                    return card
+            self.card_list = [card.copy() for card in self.card_list]
         elif self.type == PileType.LISTLIST:
-            for cardlist in self.card_list:
-                for card in cardlist:
-                    if card.uniq_id == uniq_id:
-                        return card
-        return None
+            self.card_list = [[
+                card.copy() for card in card_list
+            ] for card_list in self.card_list]
+        self._index_cards()
+        self._shared = False
+
+    def _index_cards(self):
+        """
+        Make the map from unique IDs to cards.
+        """
+        cards = self.card_list
+        if self.type == PileType.LISTLIST:
+            cards = [
+                card for card_list in self.card_list for card in card_list]
+        self._cards = {card.uniq_id: card for card in cards}
+        self._counts = [0] * _get_card_id_size()
+        keys = _get_zobrist_keys()
+        self._hash = 0
+        for card in cards:
+            self._counts[card.id] += 1
+            self._hash += keys[card.id]
+
+    def _undo_insert(self, index: int, sub_index: int):
+        journal = self.journal
+        self.journal = None
+        self.remove_at(index, sub_index)
+        self.journal = journal
+
+    def _undo_remove(
+            self, card: Card, index: int, sub_index: int,
+            removed_group: bool, generation: int):
+        self._own()
+        if card is not None and generation != _fork_generation:
+            # a forked game may have the removed card in another pile.
+            card = card.copy()
+        if self.type == PileType.LIST:
+            self.card_list.insert(index, card)
+            self.count = len(self.card_list)
+            self._cards[card.uniq_id] = card
+            self._counts[card.id] += 1
+            self._hash += _get_zobrist_keys()[card.id]
+        elif self.type == PileType.NUMBER:
+            self.count += 1
+        else:
+            if removed_group:
+                self.card_list.insert(index, [])
+            self.card_list[index].insert(sub_index, card)
+            self.count += 1
+            self._cards[card.uniq_id] = card
+            self._counts[card.id] += 1
+            self._hash += _get_zobrist_keys()[card.id]
+
+    def _undo_remove_cards(
+            self, positions: List[int], cards: List[Card], generation: int):
+        self._own()
+        if generation != _fork_generation:
+            # a forked game may have the removed cards in other piles.
+            cards = [card.copy() for card in cards]
+        removed = dict(zip(positions, cards))
+        rest = iter(self.card_list)
+        self.card_list = [
+            removed[i] if i in removed else next(rest)
+            for i in range(len(self.card_list) + len(cards))]
+        self.count = len(self.card_list)
+        for card in cards:
+            self._cards[card.uniq_id] = card
+            self._counts[card.id] += 1
+            self._hash += _get_zobrist_keys()[card.id]
+
+    def _undo_set_cards(self, card_list: List[Card]):
+        self.version = next(_versions)
+        self.card_list = list(card_list)
+        self.count = len(self.card_list)
+        self._index_cards()
+        self._shared = True
+
+    def _undo_update(self, states: List[tuple]):
+        journal = self.journal
+        self.journal = None
+        for uniq_id, starflake, create, stop_orbit in states:
+            self.update_card(
+                uniq_id, starflake=starflake, create=create,
+                stop_orbit=stop_orbit)
+        self.journal = journal
@@ -3,7 +3,12 @@ This module defines the Player model.
 """
 from .pile import Pile, PileName, PileType
 from typing import Dict
-from ..utils.card_util import get_colors, CardColor
+from ..utils.card_util import get_card_table, COLOR_BITS, CardColor
+
+
+_THREE_COLOR_BITS = (
+    COLOR_BITS[CardColor.RED] | COLOR_BITS[CardColor.BLUE] |
+    COLOR_BITS[CardColor.GREEN])
 
 
 class Player:
@@ -34,6 +39,21 @@ class Player:
             PileName.REVEAL: Pile(PileType.LIST, card_list=[])
         }
 
+    def fork(self):
+        """
+        Make a copy of this player for another game state.
+        Piles are forked with copy-on-write.
+
+        Returns:
+            Player: forked player.
+        """
+        player = Player.__new__(Player)
+        player.__dict__.update(self.__dict__)
+        player.pile = {
+            pilename: pile.fork() for pilename, pile in self.pile.items()
+        }
+        return player
+
     def get_status_json(self):
         piles = {}
         for pilename, pile in self.pile.items():
@@ -54,39 +74,43 @@ class Player:
 
     def update_tmp_orbit(self, game):
         # check fields.
+        color_bits = get_card_table().color_bits
         add_orbit = 0
         for card_list in self.pile[PileName.FIELD].card_list:
             if len(card_list) <= 0:
                 continue
             stop_orbit = False
+            bits = 0
             for card in card_list:
-                if hasattr(card, "stop_orbit") and card.stop_orbit:
+                if card.stop_orbit:
                     stop_orbit = True
                     break
+                bits |= color_bits[card.id]
             if stop_orbit:
                 continue
-            color_check = {
-                CardColor.RED: False,
-                CardColor.BLUE: False,
-                CardColor.GREEN: False
-            }
-            for card_id in [n.id for n in card_list]:
-                for color in get_colors(card_id, game):
-                    color_check[color] = True
-            if (color_check[CardColor.RED] and color_check[CardColor.BLUE] and
-                    color_check[CardColor.GREEN]):
+            if bits & _THREE_COLOR_BITS == _THREE_COLOR_BITS:
                 continue
             add_orbit += 1
         self.tmp_orbit = self.orbit + add_orbit
 
+    def composition(self):
+        """
+        Get the number of cards for each card ID in all piles of this.
+
+        Returns:
+            List[int]: the number of cards. Index is card ID.
+        """
+        compositions = [pile.composition() for pile in self.pile.values()]
+        return [sum(counts) for counts in zip(*compositions)]
+
     def get_own_card_ids(self):
+        """
+        Get card IDs of all cards that this player has.
+
+        Returns:
+            List[int]: sorted card IDs.
+        """
         card_ids = []
-        for v in self.pile.values():
-            if v.type == PileType.LIST:
-                for card in v.card_list:
-                    card_ids.append(card.id)
-            elif v.type == PileType.LISTLIST:
-                for cardlist in v.card_list:
-                    for card in cardlist:
-                        card_ids.append(card.id)
+        for card_id, count in enumerate(self.composition()):
+            card_ids += [card_id] * count
         return card_ids
@@ -5,7 +5,7 @@ Triggers define the content, timing of calling,
     and lifetime of an interrupt step.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
 if TYPE_CHECKING:
     from ..models.limit import Limit
     from ..models.game import Game
@@ -16,7 +16,6 @@ from ..models.limit import (
 )
 from ..models.variable import VariableName, get_variable
 from ..models.activate import is_match_activate
-import uuid
 
 
 class Trigger:
@@ -35,6 +34,8 @@ class Trigger:
             Default is False.
         exist_uniq_id (int, Optional): This is card unique ID for trigger.
             This is not for game.triggers.
+        trigger_id (int, Optional): Trigger unique ID.
+            When this is None, the game makes it when this is added.
 
     Arrtibutes:
         id (int): Trigger unique ID.
@@ -47,11 +48,30 @@ class Trigger:
             step: AbstractStep,
             can_pass: bool = False,
             auto: bool = False,
-            exist_uniq_id: int = None):
+            exist_uniq_id: int = None,
+            trigger_id: int = None):
         if auto:
             assert not can_pass
-        self.id = str(uuid.uuid4()).replace("-", "")
+        self.id = None
         self.limit = limit
+        self.activate = activate
+        self.step = step
+        self.can_pass = can_pass
+        self.auto = auto
+        self.exist_uniq_id = exist_uniq_id
+        if trigger_id is not None:
+            self.set_id(trigger_id)
+
+    def set_id(self, trigger_id: int):
+        """
+        Set the trigger unique ID.
+        LimitTriggerActivate without trigger ID in limit gets this.
+
+        Args:
+            trigger_id (int): Trigger unique ID.
+        """
+        self.id = trigger_id
+        limit = self.limit
         if (isinstance(
                 limit, LimitTriggerActivate) and limit.trigger_id is None):
             limit.trigger_id = self.id
@@ -60,11 +80,157 @@ class Trigger:
                 if isinstance(
                         ll, LimitTriggerActivate) and ll.trigger_id is None:
                     ll.trigger_id = self.id
-        self.activate = activate
-        self.step = step
-        self.can_pass = can_pass
-        self.auto = auto
-        self.exist_uniq_id = exist_uniq_id
+
+
+class TriggerRegistry:
+    """
+    Triggers of a game indexed by activate class and player ID.
+    This behaves like a list of triggers in added order.
+
+    Args:
+        triggers (Iterable[Trigger], Optional): initial triggers.
+    """
+    def __init__(self, triggers: Iterable[Trigger] = ()):
+        self._triggers: Dict[int, Trigger] = {}
+        self._orders: Dict[int, int] = {}
+        self._count = 0
+        self._activates: Dict[Tuple[type, int], Dict[int, Trigger]] = {}
+        self._limits: Dict[int, Dict[int, Trigger]] = {}
+        for trigger in triggers:
+            self.append(trigger)
+
+    def __iter__(self):
+        return iter(list(self._triggers.values()))
+
+    def __len__(self):
+        return len(self._triggers)
+
+    def __getitem__(self, index: int):
+        return list(self._triggers.values())[index]
+
+    def __contains__(self, trigger: Trigger):
+        return self._triggers.get(trigger.id) is trigger
+
+    def __eq__(self, other):
+        if isinstance(other, (TriggerRegistry, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def copy(self):
+        """
+        Make a copy which doesn't change with this.
+        Triggers are shared.
+
+        Returns:
+            TriggerRegistry: copied registry.
+        """
+        registry = TriggerRegistry.__new__(TriggerRegistry)
+        registry._triggers = dict(self._triggers)
+        registry._orders = dict(self._orders)
+        registry._count = self._count
+        registry._activates = {
+            k: dict(v) for k, v in self._activates.items()}
+        registry._limits = {k: dict(v) for k, v in self._limits.items()}
+        return registry
+
+    def append(self, trigger: Trigger):
+        """
+        Add a trigger.
+
+        Args:
+            trigger (Trigger): added trigger.
+        """
+        assert trigger.id is not None
+        assert trigger.id not in self._triggers
+        self._triggers[trigger.id] = trigger
+        self._orders[trigger.id] = self._count
+        self._count += 1
+        self._activates.setdefault(
+            self._get_activate_key(trigger), {})[trigger.id] = trigger
+        for trigger_id in _get_limit_trigger_ids(trigger.limit):
+            self._limits.setdefault(trigger_id, {})[trigger.id] = trigger
+
+    def remove(self, trigger: Trigger):
+        """
+        Remove a trigger.
+
+        Args:
+            trigger (Trigger): removed trigger.
+        """
+        if trigger not in self:
+            raise ValueError("Not found trigger: %s" % str(trigger.id))
+        del self._triggers[trigger.id]
+        del self._orders[trigger.id]
+        key = self._get_activate_key(trigger)
+        triggers = self._activates[key]
+        del triggers[trigger.id]
+        if len(triggers) == 0:
+            del self._activates[key]
+        for trigger_id in _get_limit_trigger_ids(trigger.limit):
+            triggers = self._limits[trigger_id]
+            del triggers[trigger.id]
+            if len(triggers) == 0:
+                del self._limits[trigger_id]
+
+    def find(self, target_activate: TargetActivate) -> List[Trigger]:
+        """
+        Get triggers which may be called by target activate.
+
+        Args:
+            target_activate (TargetActivate): target activate.
+
+        Returns:
+            List[Trigger]: triggers in added order.
+
+        Note:
+            - Check is_match_activate for the result.
+        """
+        player_ids = [None]
+        if target_activate.player_id is not None:
+            player_ids.append(target_activate.player_id)
+        buckets = []
+        for (activate_class, player_id), triggers in self._activates.items():
+            if player_id in player_ids and issubclass(
+                    activate_class, target_activate.activate_class):
+                buckets.append(triggers)
+        if len(buckets) == 0:
+            return []
+        if len(buckets) == 1:
+            return list(buckets[0].values())
+        orders = self._orders
+        return sorted(
+            [t for triggers in buckets for t in triggers.values()],
+            key=lambda t: orders[t.id])
+
+    def find_by_limit(self, trigger_id: int) -> List[Trigger]:
+        """
+        Get triggers which have LimitTriggerActivate of trigger_id.
+
+        Args:
+            trigger_id (int): trigger ID of LimitTriggerActivate.
+
+        Returns:
+            List[Trigger]: triggers in added order.
+        """
+        triggers = self._limits.get(trigger_id)
+        if triggers is None:
+            return []
+        orders = self._orders
+        return sorted(triggers.values(), key=lambda t: orders[t.id])
+
+    def _get_activate_key(self, trigger: Trigger):
+        return (
+            type(trigger.activate),
+            getattr(trigger.activate, "player_id", None))
+
+
+def _get_limit_trigger_ids(limit: Limit):
+    if isinstance(limit, LimitTriggerActivate):
+        return [limit.trigger_id]
+    if isinstance(limit, LimitOr):
+        return list({
+            n for ll in limit.limits for n in _get_limit_trigger_ids(ll)})
+    return []
 
 
 def get_called_triggers(
@@ -129,13 +295,14 @@ def _get_called_triggers_with_activate(
         source_step: AbstractStep):
     possible_triggers = []
     if hasattr(game, "triggers"):
-        for trigger in game.triggers:
+        for trigger in game.triggers.find(target_activate):
             if is_match_activate(target_activate, trigger.activate, game):
                 if trigger.step.can_play_trigger(game, target_activate):
-                    value = "%s-%s" % (
-                        source_step.step_id, trigger.step.step_id)
+                    value = (
+                        source_step.get_step_id(game),
+                        trigger.step.get_step_id(game))
                     if value not in get_variable(
-                            game, VariableName.DONE_TRIGGER_LIST, list):
+                            game, VariableName.DONE_TRIGGER_LIST, set):
                         trigger.step.trigger_activate = target_activate
                         trigger.step.depth = source_step.depth
                         possible_triggers.append(trigger)
@@ -150,8 +317,12 @@ def remove_triggers(game: Game, target_limit: TargetLimit):
         game (Game): now game
         target_limit (TargetLimit): target limit.
     """
-    copy_triggers = list(game.triggers)
-    for trigger in game.triggers:
+    triggers = game.triggers
+    if (target_limit.limit_class is LimitTriggerActivate
+            and isinstance(triggers, TriggerRegistry)):
+        candidates = triggers.find_by_limit(target_limit.trigger_id)
+    else:
+        candidates = list(triggers)
+    for trigger in candidates:
         if is_match_limit(target_limit, trigger.limit):
-            copy_triggers.remove(trigger)
-    game.triggers = copy_triggers
+            triggers.remove(trigger)
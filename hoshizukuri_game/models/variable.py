@@ -29,6 +29,8 @@ class Variable:
         self.type = type
         if type == list:
             self.value = []
+        elif type == set:
+            self.value = set()
         elif type == int:
             self.value = 0
         else:
@@ -43,9 +45,26 @@ class Variable:
         """
         if self.type == list:
             self.value.append(value)
+        if self.type == set:
+            self.value.add(value)
         if self.type == int:
             self.value = value
 
+    def copy(self):
+        """
+        Copy this variable.
+
+        Returns:
+            Variable: copied variable.
+        """
+        variable = Variable.__new__(Variable)
+        variable.__dict__.update(self.__dict__)
+        if self.type == list:
+            variable.value = list(self.value)
+        if self.type == set:
+            variable.value = set(self.value)
+        return variable
+
 
 def remove_variables(game: Game, target_limit: TargetLimit):
     """
@@ -59,6 +78,9 @@ def remove_variables(game: Game, target_limit: TargetLimit):
     for name, variable in game.variables.items():
         if is_match_limit(target_limit, variable.limit):
             del copy_variables[name]
+    journal = getattr(game, "journal", None)
+    if journal is not None:
+        journal.record(setattr, game, "variables", game.variables)
     game.variables = copy_variables
     """
     for player_id in range(len(game.players)):
@@ -83,11 +105,23 @@ def set_variable(
         limit (Limit): the limit of added variable.
         value (Any): the value of added variable.
     """
+    journal = getattr(game_or_player, "journal", None)
     if name not in game_or_player.variables:
         game_or_player.variables[name] = Variable(
             limit=limit, type=type
         )
-    game_or_player.variables[name].set_value(value)
+        if journal is not None:
+            journal.record(game_or_player.variables.pop, name)
+    variable = game_or_player.variables[name]
+    if journal is not None:
+        if variable.type == list:
+            journal.record(variable.value.pop)
+        elif variable.type == set:
+            if value not in variable.value:
+                journal.record(variable.value.discard, value)
+        else:
+            journal.record(setattr, variable, "value", variable.value)
+    variable.set_value(value)
 
 
 def get_variable(game: Game, name: VariableName, type: Type):
@@ -103,6 +137,8 @@ def get_variable(game: Game, name: VariableName, type: Type):
         return game.variables[name].value
     if type == list:
         return []
+    if type == set:
+        return set()
     if type == int:
         return 0
     raise Exception("Unsupported Variable type: %s" % str(type))
@@ -123,6 +159,17 @@ def delete_variable(game: Game, name: VariableName, type: Type, value: Any):
     if type == list:
         values = get_variable(game, name, type)
         if value in values:
+            journal = getattr(game, "journal", None)
+            if journal is not None:
+                journal.record(values.insert, values.index(value), value)
             values.remove(value)
         return
+    if type == set:
+        values = get_variable(game, name, type)
+        if value in values:
+            journal = getattr(game, "journal", None)
+            if journal is not None:
+                journal.record(values.add, value)
+            values.discard(value)
+        return
     raise Exception("Unsupported Variable type: %s" % str(type))
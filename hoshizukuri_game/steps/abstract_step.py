@@ -2,10 +2,10 @@
 Abstract base class of many steps
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 if TYPE_CHECKING:
     from ..models.game import Game
-import uuid
+    from ..utils.action_util import ActionSpace
 from ..models.activate import TargetActivate
 from ..models.log import LogCondition
 
@@ -16,17 +16,36 @@ class AbstractStep:
 
     Attributes:
         candidates (List[int]): Legal moves when player selection arises.
-        step_id (int): Unique step ID.
+        step_id (int): Unique step ID. This is None until get_step_id
+            is called.
         depth (int): Expected log hierarchy.
     """
     def __init__(self):
         self.candidates = []
-        self.step_id = str(uuid.uuid4()).replace("-", "")
+        self.step_id = None
         self.depth = 0
 
     def __str__(self):
         return "%d:abstract" % self.depth
 
+    def get_step_id(self, game: Game):
+        """
+        Get the unique step ID.
+        The ID is made by the game at the first call,
+        and it is cleared by rolling back before the call.
+
+        Args:
+            game (Game): Now game.
+
+        Returns:
+            int: Unique step ID.
+        """
+        if self.step_id is None:
+            self.step_id = game.make_object_id()
+            if getattr(game, "journal", None) is not None:
+                game.journal.record(setattr, self, "step_id", None)
+        return self.step_id
+
     def process(self, game: Game):
         """
         Take the game and perform this step.
@@ -85,6 +104,26 @@ class AbstractStep:
             )
         return candidates
 
+    def get_candidate_mask(
+            self, game: Game, action_space: ActionSpace, out=None,
+            selected: List[int] = ()):
+        """
+        Get candidates from this step as a legal action mask.
+        The mask is built from the parts of the candidates (Choice),
+        which were made from game when this step was processed.
+
+        Args:
+            game (Game): Now game.
+            action_space (ActionSpace): action space.
+            out (np.ndarray, Optional): bool array to fill.
+            selected (List[int], Optional): card IDs which are already
+                selected for a multiset choice.
+
+        Returns:
+            np.ndarray: Legal action mask.
+        """
+        return action_space.get_mask(self.candidates, out, selected)
+
     def can_play_trigger(self, game: Game, activate: TargetActivate):
         """
         This is for Trigger Step.
@@ -9,7 +9,8 @@ from ..abstract_step import AbstractStep
 from ...models.pile import PileName
 from ...models.log import LogCondition, Command
 from ..common.discard_step import DiscardStep
-from ...utils.choice_util import cparsei, is_included_candidates
+from ...utils.choice_util import (
+    Choice, cparsei, is_included_candidates)
 from ...utils.other_util import call_choice_callback
 
 
@@ -69,9 +70,8 @@ class ArashiStep(AbstractStep):
             if len(cardlist) == 1 and i != len(field) - 1:
                 candidates.append(i)
         return [
-            "%d:arashiindex:%s" % (
-                self.player_id, str(n)
-            ) for n in candidates + [""]
+            Choice(self.player_id, "arashiindex", n)
+            for n in candidates + [None]
         ]
 
     def _log2choice(self, game: Game):
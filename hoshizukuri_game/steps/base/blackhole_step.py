@@ -47,8 +47,6 @@ class BlackholeStep(AbstractStep):
 
     def callback(self, card_ids, uniq_ids, game: Game):
         for uniq_id in uniq_ids:
-            for card in game.players[
-                    self.player_id].pile[PileName.HAND].card_list:
-                if card.uniq_id == uniq_id:
-                    card.create = False
+            game.players[self.player_id].pile[PileName.HAND].update_card(
+                uniq_id, create=False)
         return []
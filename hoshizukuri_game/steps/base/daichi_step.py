@@ -38,7 +38,7 @@ class DaichiStep(AbstractStep):
         count = len(game.players[self.player_id].pile[
             PileName.FIELD].card_list[-1])
         if count >= 5:
-            game.triggers.append(
+            game.add_trigger(
                 Trigger(
                     limit=LimitTriggerActivate(None),
                     activate=ActivatePlaysetEnd(self.player_id),
@@ -12,6 +12,7 @@ from ..common.look_step import LookStep
 from ..common.option_step import option_select_process
 from ..common.discard_step import DiscardStep
 from ..common.putin_step import PutinHandStep
+from ...utils.choice_util import Choice
 
 
 class IzumiStep(AbstractStep):
@@ -91,8 +92,8 @@ class IzumiSelectStep(AbstractStep):
 
     def _create_candidates(self, game: Game, params: Dict[Any]):
         return [
-            "%d:izumi:hand" % self.player_id,
-            "%d:izumi:discard" % self.player_id
+            Choice(self.player_id, "izumi", "hand"),
+            Choice(self.player_id, "izumi", "discard")
         ]
 
     def _log2choice(self, game: Game, params: Dict[Any]):
@@ -5,12 +5,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ...models.game import Game
+from itertools import permutations
 from ..abstract_step import AbstractStep
 from ...models.pile import PileName
 from ...models.log import LogCondition, Command
-from ...utils.choice_util import cparsell, is_included_candidates
+from ...utils.choice_util import (
+    Choice, cparsell, is_included_candidates)
 from ...utils.card_util import CardColor, get_colors, ids2uniq_ids
-from ...utils.other_util import call_choice_callback
+from ...utils.other_util import call_choice_callback, can_check_log_choice
 from ..common.trash_step import TrashStep
 
 
@@ -40,27 +42,28 @@ class KakuyugoStep(AbstractStep):
             3: 7,
             4: 10
         }
-        card = game.players[self.player_id].pile[
-            PileName.FIELD].get_card(self.uniq_id)
+        field = game.players[self.player_id].pile[PileName.FIELD]
         if game.players[self.player_id].pile[PileName.HAND].count <= 0:
-            card.starflake = dic[0]
+            field.update_card(self.uniq_id, starflake=dic[0])
             return []
-        candidates = self._create_candidates(game)
         if game.log_manager is not None:
             game.choice = self._log2choice(game)
-            call_choice_callback(game, candidates, game.choice, self)
-        if game.choice == "" or not is_included_candidates(
-                game.choice, candidates):
-            self.candidates = candidates
-            return [self]
-        else:
-            self.candidates = []
+        if not can_check_log_choice(game) or not self._is_legal_choice(
+                game, game.choice):
+            candidates = self._create_candidates(game)
+            if game.log_manager is not None:
+                call_choice_callback(game, candidates, game.choice, self)
+            if game.choice == "" or not is_included_candidates(
+                    game.choice, candidates):
+                self.candidates = candidates
+                return [self]
+        self.candidates = []
         player_id, command, card_ids, uniq_ids = cparsell(game.choice)
         game.choice = ""
         assert command in ["kakuyugotrash"]
         assert player_id == self.player_id
         if card_ids == []:
-            card.starflake = dic[0]
+            field.update_card(self.uniq_id, starflake=dic[0])
             return []
         if uniq_ids == []:
             uniq_ids = ids2uniq_ids(
@@ -68,7 +71,7 @@ class KakuyugoStep(AbstractStep):
                 card_ids, game
             )
         assert len(card_ids) <= 4
-        card.starflake = dic[len(card_ids)]
+        field.update_card(self.uniq_id, starflake=dic[len(card_ids)])
         return [
             TrashStep(
                 self.player_id, self.depth, card_ids, uniq_ids
@@ -103,8 +106,29 @@ class KakuyugoStep(AbstractStep):
                         if candidate not in candidates:
                             candidates.append(candidate)
         candidates = sorted(candidates)
-        return ["%d:%s:%s" % (self.player_id, command, ",".join(
-            [str(n) for n in cand])) for cand in candidates]
+        return [
+            Choice(self.player_id, command, tuple(cand))
+            for cand in candidates]
+
+    def _is_legal_choice(self, game: Game, choice: str):
+        """
+        Check if choice is in candidates without making candidates.
+        """
+        player_id, command, card_ids, uniq_ids = cparsell(choice)
+        if (player_id != self.player_id or command != "kakuyugotrash" or
+                len(uniq_ids) > 0 or len(card_ids) > 4 or
+                card_ids != sorted(card_ids)):
+            return False
+        hand = game.players[self.player_id].pile[PileName.HAND]
+        if not all(hand.get_count(n) > 0 for n in card_ids):
+            return False
+        colors = [
+            CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.NEUTRAL]
+        card_colors = [get_colors(n, game) for n in card_ids]
+        return any(all(
+            color in card_color for color, card_color in zip(
+                perm, card_colors))
+            for perm in permutations(colors, len(card_ids)))
 
     def _log2choice(self, game: Game):
         if not game.log_manager.has_logs():
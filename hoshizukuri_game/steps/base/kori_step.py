@@ -28,7 +28,6 @@ class KoriStep(AbstractStep):
         return "%d:kori:%d" % (self.depth, self.player_id)
 
     def process(self, game: Game):
-        card = game.players[self.player_id].pile[
-            PileName.FIELD].get_card(self.uniq_id)
-        card.stop_orbit = True
+        game.players[self.player_id].pile[
+            PileName.FIELD].update_card(self.uniq_id, stop_orbit=True)
         return []
@@ -28,27 +28,26 @@ class SeizaStep(AbstractStep):
         return "%d:seiza:%d" % (self.depth, self.player_id)
 
     def get_victory(self, game: Game):
-        card_ids = game.players[self.player_id].get_own_card_ids()
-        color_count = [0, 0, 0]
-        for card_id in card_ids:
-            if CardColor.RED in get_colors(card_id, game):
-                color_count[0] += 1
-            if CardColor.GREEN in get_colors(card_id, game):
-                color_count[1] += 1
-            if CardColor.BLUE in get_colors(card_id, game):
-                color_count[2] += 1
+        color_count = self._get_color_count(game)
         return min(color_count) * 3
 
     def get_victory_detail(self, game: Game):
-        card_ids = game.players[self.player_id].get_own_card_ids()
-        color_count = [0, 0, 0]
-        for card_id in card_ids:
-            if CardColor.RED in get_colors(card_id, game):
-                color_count[0] += 1
-            if CardColor.GREEN in get_colors(card_id, game):
-                color_count[1] += 1
-            if CardColor.BLUE in get_colors(card_id, game):
-                color_count[2] += 1
+        color_count = self._get_color_count(game)
         return "%d:Seiza: %d red, %d green, %d blue" % (
             get_card_id("seiza"), color_count[0],
             color_count[1], color_count[2])
+
+    def _get_color_count(self, game: Game):
+        color_count = [0, 0, 0]
+        composition = game.players[self.player_id].composition()
+        for card_id, count in enumerate(composition):
+            if count <= 0:
+                continue
+            colors = get_colors(card_id, game)
+            if CardColor.RED in colors:
+                color_count[0] += count
+            if CardColor.GREEN in colors:
+                color_count[1] += count
+            if CardColor.BLUE in colors:
+                color_count[2] += count
+        return color_count
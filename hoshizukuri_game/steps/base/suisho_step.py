@@ -8,7 +8,6 @@ if TYPE_CHECKING:
 from ..abstract_step import AbstractStep
 from ...models.pile import PileName
 from ..common.reveal_step import RevealStep
-from ...models.card import Card
 
 
 class SuishoStep(AbstractStep):
@@ -39,11 +38,8 @@ class SuishoStep(AbstractStep):
         if len(uniq_ids) <= 0:
             return []
         assert len(uniq_ids) == 1
-        index = game.players[self.player_id].pile[
-            PileName.REVEAL].index(uniq_id=uniq_ids[0])
-        card: Card = game.players[self.player_id].pile[
-            PileName.REVEAL].card_list[index]
-        card.create = False
+        game.players[self.player_id].pile[PileName.REVEAL].update_card(
+            uniq_ids[0], create=False)
         from ..common.play_step import PlayStep
         orbit_index = len(game.players[self.player_id].pile[
             PileName.FIELD].card_list) - 1
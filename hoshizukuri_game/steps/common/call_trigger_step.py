@@ -12,7 +12,7 @@ from ...models.activate import (
 )
 from ...models.limit import (
     TargetLimit,
-    LimitTriggerActivate, LimitForever,
+    LimitTriggerActivate, LimitTurn,
 )
 from ...models.trigger import (
     get_called_triggers,
@@ -22,7 +22,7 @@ from ...models.variable import (
     set_variable, VariableName
 )
 from ...models.log import InvalidLogException
-from ...utils.choice_util import cparses
+from ...utils.choice_util import Choice, cparses
 from ...utils.other_util import call_choice_callback
 
 
@@ -64,8 +64,10 @@ class CallTriggerStep(AbstractStep):
             #   and has only LimitTriggerActivate.
             cancel_triggers = []
             if hasattr(game, "triggers"):
-                for trigger in game.triggers:
-                    for t_activate in self.target_activates:
+                for t_activate in self.target_activates:
+                    for trigger in game.triggers.find(t_activate):
+                        if trigger in cancel_triggers:
+                            continue
                         if is_match_activate(
                                 t_activate, trigger.activate, game):
                             if not trigger.step.can_play_trigger(
@@ -86,9 +88,10 @@ def _process_triggers(game: Game, trigger: Trigger, source_step: AbstractStep):
     target_limit = TargetLimit(
         LimitTriggerActivate, trigger_id=trigger.id
     )
-    value = "%s-%s" % (source_step.step_id, trigger.step.step_id)
+    value = (
+        source_step.get_step_id(game), trigger.step.get_step_id(game))
     set_variable(
-        game, VariableName.DONE_TRIGGER_LIST, list, LimitForever(), value)
+        game, VariableName.DONE_TRIGGER_LIST, set, LimitTurn(), value)
     remove_triggers(game, target_limit)
 
 
@@ -116,17 +119,15 @@ class _TriggerSelectStep(AbstractStep):
             cannot_pass_count = 0
             all_can_pass = True
             for trigger in self.triggers:
-                self.candidates.append(
-                    "%d:triggerselect:%s" % (
-                        self.player_id, trigger.step.get_trigger_name())
-                )
+                self.candidates.append(Choice(
+                    self.player_id, "triggerselect",
+                    trigger.step.get_trigger_name()))
                 if not trigger.can_pass:
                     all_can_pass = False
                     cannot_pass_count += 1
             if all_can_pass:
                 self.candidates.append(
-                    "%d:triggerselect:pass" % self.player_id
-                )
+                    Choice(self.player_id, "triggerselect", "pass"))
             if cannot_pass_count == 1 and len(self.candidates) == 1:
                 # auto select trigger
                 game.choice = self.candidates[0]
@@ -8,13 +8,17 @@ if TYPE_CHECKING:
 from ..abstract_step import AbstractStep
 from ...models.pile import PileName, PileType
 from ...models.card import Card
-from ...models.card_condition import CardCondition, get_match_card_ids
+from ...models.card_condition import (
+    CardCondition, get_match_card_ids, get_supply_match_counts
+)
 from ...models.log import InvalidLogException, LogCondition
 from ...utils.card_util import ids2cards, ids2uniq_ids
 from ...utils.other_util import (
-    make_combination, make_permutation, call_choice_callback
+    iter_combinations, iter_permutations, call_choice_callback,
+    can_check_log_choice
 )
-from ...utils.choice_util import cparsell, is_included_candidates
+from ...utils.choice_util import (
+    Choice, cparsell, is_included_candidates)
 from .shuffle_step import ReshuffleStep
 
 
@@ -121,7 +125,9 @@ class CardMoveStep(AbstractStep):
                         self._get_from_deck_step_string,
                         self._after_process_callback,
                         self._get_log_condition),
-                    ReshuffleStep(self.player_id, self.depth)]
+                    ReshuffleStep(
+                        self.player_id, self.depth,
+                        self.count - deck_count)]
             return [_ActualCardMoveFromDeckStep(
                 self.player_id, self.depth, self.count, self.to_pilename,
                 self.next_step_callback,
@@ -277,29 +283,90 @@ def select_process(
             raise InvalidLogException(game, log_condition)
         return "%d:%s:" % (select_player_id, choice_name)
 
-    def _create_candidates():
+    def _get_card_list():
         card_list = []
         if from_pile is game.supply:
             for key, value in game.supply.items():
                 if value.count > 0:
                     card_list.append(value.pile_card_id)
         else:
-            card_list = from_pile.card_list
-        if card_condition is not None:
+            card_list = [n.id for n in from_pile.card_list]
+        if card_condition is not None and from_pile is game.supply:
+            # more than count cards of a pile can't be selected
+            card_list = []
+            for card_id, n in get_supply_match_counts(
+                    from_pile, card_condition).items():
+                card_list += [card_id] * min(n, count)
+        elif card_condition is not None:
             card_list = get_match_card_ids(
                 from_pile, card_condition, game
             )
-        candidates = make_combination(
-            card_list, count, can_less
-        )
+        return card_list
+
+    def _has_many_candidates(card_list):
+        # True when candidates have 2 or more choices surely.
+        if len(card_list) == 0:
+            return False
+        if can_less or (count > 0 and can_pass):
+            return True
+        return count < len(card_list) and len(set(card_list)) >= 2
+
+    def _is_legal_choice(card_list):
+        player_id, command, card_ids, uniq_ids = cparsell(game.choice)
+        if (player_id != select_player_id or command != choice_name or
+                len(uniq_ids) > 0):
+            return False
+        if len(card_ids) == 0:
+            return can_less or (count > 0 and can_pass)
+        max_count = min(count, len(card_list))
+        if len(card_ids) > max_count or (
+                not can_less and len(card_ids) < max_count):
+            return False
+        if to_pilename != PileName.DECK and card_ids != sorted(card_ids):
+            return False
+        counts = {}
+        for card_id in card_list:
+            counts[card_id] = counts.get(card_id, 0) + 1
+        for card_id in card_ids:
+            if counts.get(card_id, 0) <= 0:
+                return False
+            counts[card_id] -= 1
+        return True
+
+    def _create_candidates():
+        card_list = _get_card_list()
         if to_pilename == PileName.DECK:
-            candidates = make_permutation(
-                card_list, count, can_less
-            )
+            selections = iter_permutations(card_list, count, can_less)
+        else:
+            selections = iter_combinations(card_list, count, can_less)
+        candidates = [
+            Choice(select_player_id, choice_name, n) for n in selections]
         if count > 0 and can_less is False and can_pass:
-            candidates.append([])
-        return ["%d:%s:%s" % (select_player_id, choice_name, ",".join(
-            [str(a) for a in n])) for n in candidates]
+            candidates.append(Choice(select_player_id, choice_name))
+        return candidates
+
+    def _select():
+        source_step.candidates = []
+        player_id, command, card_ids, uniq_ids = cparsell(game.choice)
+        game.choice = ""
+        assert command == choice_name
+        assert player_id == select_player_id
+        if len(card_ids) <= 0:
+            return next_step_callback([], [], game) + [
+                ] + previous_step_callback([], [], game)
+        if len(uniq_ids) == 0 and from_pile is not game.supply:
+            uniq_ids = ids2uniq_ids(
+                from_pile, card_ids, game
+            )
+        return next_step_callback(card_ids, uniq_ids, game) + [
+            create_step(
+                source_step.player_id,
+                source_step.depth,
+                from_pilename, to_pilename,
+                card_ids=card_ids,
+                uniq_ids=uniq_ids,
+            )
+        ] + previous_step_callback(card_ids, uniq_ids, game)
 
     def _default_callback(card_ids, uniq_ids, game):
         return []
@@ -311,6 +378,15 @@ def select_process(
     if count <= 0:
         return next_step_callback([], [], game) + previous_step_callback(
             [], [], game)
+    if (game.log_manager is not None and
+            getattr(game, "choice_callback", None) is None):
+        # the log choice is checked directly when
+        # the choice is surely not selected automatically.
+        card_list = _get_card_list()
+        if _has_many_candidates(card_list):
+            game.choice = _log2choice()
+            if can_check_log_choice(game) and _is_legal_choice(card_list):
+                return _select()
     candidates = _create_candidates()
     if len(candidates) == 0:
         return next_step_callback([], [], game) + previous_step_callback(
@@ -350,25 +426,4 @@ def select_process(
             game.choice, candidates):
         source_step.candidates = candidates
         return [source_step]
-    else:
-        source_step.candidates = []
-    player_id, command, card_ids, uniq_ids = cparsell(game.choice)
-    game.choice = ""
-    assert command == choice_name
-    assert player_id == select_player_id
-    if len(card_ids) <= 0:
-        return next_step_callback([], [], game) + [
-            ] + previous_step_callback([], [], game)
-    if len(uniq_ids) == 0 and from_pile is not game.supply:
-        uniq_ids = ids2uniq_ids(
-            from_pile, card_ids, game
-        )
-    return next_step_callback(card_ids, uniq_ids, game) + [
-        create_step(
-            source_step.player_id,
-            source_step.depth,
-            from_pilename, to_pilename,
-            card_ids=card_ids,
-            uniq_ids=uniq_ids,
-        )
-    ] + previous_step_callback(card_ids, uniq_ids, game)
+    return _select()
@@ -43,7 +43,8 @@ class DrawStep(AbstractStep):
             return [
                 _ActualDrawStep(
                     self.player_id, self.depth, self.count),
-                ReshuffleStep(self.player_id, self.depth)
+                ReshuffleStep(
+                    self.player_id, self.depth, self.count - deck_n)
             ]
         return [_ActualDrawStep(
             self.player_id, self.depth, self.count)]
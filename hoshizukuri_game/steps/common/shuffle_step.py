@@ -2,32 +2,114 @@
 Steps for shuffle.
 """
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from ...models.game import Game
+from fractions import Fraction
+from math import comb
 from ..abstract_step import AbstractStep
 from ...models.card import Card
 from ...models.pile import PileName
 from ...models.log import LogCondition, Command, InvalidLogException
-import random
+from ...utils.choice_util import Choice, cparsell
+
+
+def get_prefix_outcomes(
+        card_ids: List[int], count: int,
+        ordered: bool = True) -> List[Tuple[Tuple[int], Fraction]]:
+    """
+    Enumerate the top cards after shuffling cards.
+
+    Args:
+        card_ids (List[int]): card IDs of shuffled cards.
+        count (int): the number of top cards. (cut to len(card_ids))
+        ordered (bool, Optional): When this is False, outcomes are
+            grouped by the multiset of top cards. (sorted card IDs)
+
+    Returns:
+        List[Tuple[Tuple[int], Fraction]]: top card IDs and probability.
+    """
+    counts: Dict[int, int] = {}
+    for card_id in sorted(card_ids):
+        counts[card_id] = counts.get(card_id, 0) + 1
+    count = min(count, len(card_ids))
+    outcomes = []
+    if ordered:
+        _make_ordered_outcomes(
+            counts, len(card_ids), count, (), Fraction(1), outcomes)
+    else:
+        _make_multiset_outcomes(
+            list(counts.items()), count, (), 1, outcomes)
+        all_count = comb(len(card_ids), count)
+        outcomes = [(n, Fraction(p, all_count)) for n, p in outcomes]
+    return outcomes
+
+
+def _make_ordered_outcomes(
+        counts: Dict[int, int], total: int, count: int,
+        prefix: Tuple[int], probability: Fraction, outcomes: list):
+    if len(prefix) == count:
+        outcomes.append((prefix, probability))
+        return
+    for card_id, n in counts.items():
+        if n == 0:
+            continue
+        counts[card_id] = n - 1
+        _make_ordered_outcomes(
+            counts, total - 1, count, prefix + (card_id,),
+            probability * Fraction(n, total), outcomes)
+        counts[card_id] = n
+
+
+def _make_multiset_outcomes(
+        counts: List[Tuple[int, int]], count: int,
+        prefix: Tuple[int], ways: int, outcomes: list):
+    if len(prefix) == count:
+        outcomes.append((prefix, ways))
+        return
+    if len(counts) == 0:
+        return
+    card_id, n = counts[0]
+    for k in range(min(n, count - len(prefix)), -1, -1):
+        _make_multiset_outcomes(
+            counts[1:], count, prefix + (card_id,) * k,
+            ways * comb(n, k), outcomes)
 
 
 class ReshuffleStep(AbstractStep):
     """
     Reshuffle deck.
 
+    When game.chance is True (and without log), this stops with
+    the chance decision "player_id:chance:" before shuffling.
+    The choice "player_id:chance:" shuffles with the random generator
+    of game, and "player_id:chance:a,b,c" puts the cards with these
+    card IDs on the top in this order and shuffles the others.
+    While this step waits for the choice, card_ids and draw_count
+    tell what is shuffled and how many cards of it are drawn.
+
     Args:
         player_id (int): turn player ID.
         depth (int): Expected log hierarchy.
+        draw_count (int, Optional): the number of cards which are
+            drawn from the new deck next. This is for chance outcomes.
+            0 doesn't split the chance. (the only outcome is
+            "player_id:chance:")
+
+    Attributes:
+        card_ids (List[int]): sorted card IDs of the shuffled cards.
 
     TODO:
         - call reshuffle trigger.
     """
-    def __init__(self, player_id: int, depth: int):
+    def __init__(
+            self, player_id: int, depth: int, draw_count: int = 0):
         super().__init__()
         self.player_id: int = player_id
         self.depth: int = depth
+        self.draw_count: int = draw_count
         self.deck_list: List[Card] = []
+        self.card_ids: List[int] = []
 
     def __str__(self):
         return "%d:reshuffle:%d:%s" % (self.depth, self.player_id, ",".join(
@@ -42,10 +124,19 @@ class ReshuffleStep(AbstractStep):
                 log = game.log_manager.check_nextlog_and_pop(log_condition)
                 if log is None:
                     raise InvalidLogException(game, log_condition)
-            random.shuffle(
-                game.players[self.player_id].pile[PileName.DISCARD].card_list)
             self.deck_list = list(
                 game.players[self.player_id].pile[PileName.DISCARD].card_list)
+            self.card_ids = sorted([n.id for n in self.deck_list])
+            if game.log_manager is None and getattr(game, "chance", False):
+                if not self._is_chance_choice(game.choice):
+                    self.candidates = [Choice(self.player_id, "chance")]
+                    return [self]
+                top_card_ids = cparsell(game.choice)[2]
+                game.choice = ""
+                self.candidates = []
+                self._put_on_top(game, top_card_ids)
+            else:
+                game.get_random().shuffle(self.deck_list)
             uniq_ids = [n.uniq_id for n in self.deck_list]
             game.move_card(
                 game.players[self.player_id].pile[PileName.DISCARD],
@@ -54,3 +145,44 @@ class ReshuffleStep(AbstractStep):
             )
             return []
         return []
+
+    def get_chance_outcomes(self, game: Game, ordered: bool = True):
+        """
+        Enumerate the drawn cards after this shuffle.
+        Only the top draw_count cards are distinguished.
+
+        Args:
+            game (Game): Now game.
+            ordered (bool, Optional): When this is False, outcomes are
+                grouped by the multiset of drawn cards.
+
+        Returns:
+            List[Tuple[str, Fraction]]: choice and probability.
+        """
+        discard = game.players[self.player_id].pile[PileName.DISCARD]
+        card_ids = [n.id for n in discard.card_list]
+        return [("%d:chance:%s" % (
+            self.player_id, ",".join([str(n) for n in prefix])), p)
+            for prefix, p in get_prefix_outcomes(
+                card_ids, self.draw_count, ordered)]
+
+    def _is_chance_choice(self, choice: str):
+        if len(self.candidates) == 0:
+            return False
+        div = choice.split(":")
+        return len(div) == 3 and div[0] == str(self.player_id) and (
+            div[1] == "chance")
+
+    def _put_on_top(self, game: Game, top_card_ids: List[int]):
+        rest = list(self.deck_list)
+        top = []
+        for card_id in top_card_ids:
+            for i, card in enumerate(rest):
+                if card.id == card_id:
+                    top.append(rest.pop(i))
+                    break
+            else:
+                raise ValueError(
+                    "Card %d is not in the shuffled cards." % card_id)
+        game.get_random().shuffle(rest)
+        self.deck_list = top + rest
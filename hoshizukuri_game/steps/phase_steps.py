@@ -2,7 +2,7 @@
 Steps for sequence of turn.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple
 
 if TYPE_CHECKING:
     from ..models.game import Game
@@ -16,30 +16,32 @@ from .common.gain_step import GainStep
 from .common.discard_step import DiscardStep, discard_select_process
 from .common.call_trigger_step import CallTriggerStep
 from ..models.turn import Phase
-from ..models.pile import PileName, PileType
-from ..models.cost import Cost
+from ..models.pile import PileName
+from ..models.limit import LimitTurn, TargetLimit
+from ..models.variable import remove_variables
 from ..models.log import InvalidLogException, LogCondition, Command
-from ..models.card_condition import (
-    CardCondition,
-    get_match_card_ids
-)
 from ..utils.card_util import (
-    get_colors, get_cost, ids2uniq_ids, CardColor
+    get_cost, ids2uniq_ids, CardColor, COLOR_BITS, get_card_table
 )
 from ..utils.other_util import (
-    make_combination, call_choice_callback
+    iter_combinations, call_choice_callback, can_check_log_choice,
+    is_sub_multiset
 )
 from ..utils.choice_util import (
+    Choice,
     cparsei,
     cparseii,
     cparsell,
     is_included_candidates
 )
 from ..utils.kingdom_step_util import get_kingdom_steps
-from itertools import product
+from functools import lru_cache
+from itertools import permutations, product
 
 
 FINISH_ORBIT = 35
+PLAYSET_CACHE_SIZE = 4096
+"""The max number of hands whose playset candidates are cached."""
 
 
 class TurnStartStep(AbstractStep):
@@ -109,6 +111,59 @@ class PrepareFirstDeckStep(AbstractStep):
         return []
 
 
+@lru_cache(maxsize=PLAYSET_CACHE_SIZE)
+def _make_playset_candidates(player_id: int, hand_ids: Tuple[int]):
+    """
+    Make playset candidates from sorted card IDs in hand.
+    Candidates only depend on these, so they are cached and shared
+    by all games in the process.
+    """
+    command = "playset"
+    # only one play
+    candidates = set([(card_id,) for card_id in hand_ids])
+    # same color
+    same_color_list = {
+        CardColor.RED: [],
+        CardColor.BLUE: [],
+        CardColor.GREEN: []
+    }
+    color_bits = get_card_table().color_bits
+    for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN]:
+        bit = COLOR_BITS[color]
+        for card_id in hand_ids:
+            if color_bits[card_id] & bit:
+                same_color_list[color].append(card_id)
+        candidates.update(iter_combinations(
+            same_color_list[color], len(same_color_list[color]), True))
+    candidates.discard(())
+    # 3 colors
+    for color_3 in product(
+            set(same_color_list[CardColor.RED]),
+            set(same_color_list[CardColor.BLUE]),
+            set(same_color_list[CardColor.GREEN])):
+        candidates.add(tuple(sorted(color_3)))
+
+    return tuple([
+        Choice(player_id, command, cand) for cand in sorted(candidates)])
+
+
+def get_playset_cache_info():
+    """
+    Get statistics of the playset candidate cache.
+
+    Returns:
+        functools._CacheInfo: hits, misses, maxsize and currsize.
+    """
+    return _make_playset_candidates.cache_info()
+
+
+def clear_playset_cache():
+    """
+    Clear the playset candidate cache and its statistics.
+    """
+    _make_playset_candidates.cache_clear()
+
+
 class PlaySelectStep(AbstractStep):
     """
     Select cards to play.
@@ -134,16 +189,18 @@ class PlaySelectStep(AbstractStep):
             return [OrbitAdvanceStep(self.player_id)]
         if game.created:
             return [OrbitAdvanceStep(self.player_id)]
-        candidates = self._create_candidates(game)
         if game.log_manager is not None:
             game.choice = self._log2choice(game)
-            call_choice_callback(game, candidates, game.choice, self)
-        if game.choice == "" or not is_included_candidates(
-                game.choice, candidates):
-            self.candidates = candidates
-            return [self]
-        else:
-            self.candidates = []
+        if not can_check_log_choice(game) or not self._is_legal_choice(
+                game, game.choice):
+            candidates = self._create_candidates(game)
+            if game.log_manager is not None:
+                call_choice_callback(game, candidates, game.choice, self)
+            if game.choice == "" or not is_included_candidates(
+                    game.choice, candidates):
+                self.candidates = candidates
+                return [self]
+        self.candidates = []
         player_id, command, play_ids, uniq_ids = cparsell(game.choice)
         game.choice = ""
         assert command in ["playset"]
@@ -163,42 +220,39 @@ class PlaySelectStep(AbstractStep):
         ]
 
     def _create_candidates(self, game: Game):
-        command = "playset"
-        candidates = []
-        # only one play
-        for card in game.players[self.player_id].pile[PileName.HAND].card_list:
-            if [card.id] not in candidates:
-                candidates.append([card.id])
-        # same color
-        same_color_list = {
-            CardColor.RED: [],
-            CardColor.BLUE: [],
-            CardColor.GREEN: []
-        }
-        for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN]:
-            for card in game.players[self.player_id].pile[
-                    PileName.HAND].card_list:
-                if color in get_colors(card.id, game):
-                    same_color_list[color].append(card.id)
-            perms = make_combination(
-                same_color_list[color], len(same_color_list[color]), True)
-            for perm in perms:
-                if len(perm) > 0 and perm not in candidates:
-                    candidates.append(perm)
-        # 3 colors
-        color_3s = list(product(
-            list(set(same_color_list[CardColor.RED])),
-            list(set(same_color_list[CardColor.BLUE])),
-            list(set(same_color_list[CardColor.GREEN]))
-        ))
-        for color_3 in color_3s:
-            perm = sorted(list(color_3))
-            if perm not in candidates:
-                candidates.append(perm)
-
-        candidates = sorted(candidates)
-        return ["%d:%s:%s" % (self.player_id, command, ",".join(
-            [str(n) for n in cand])) for cand in candidates]
+        hand_ids = tuple(sorted([
+            card.id for card in game.players[self.player_id].pile[
+                PileName.HAND].card_list]))
+        return list(_make_playset_candidates(self.player_id, hand_ids))
+
+    def _is_legal_choice(self, game: Game, choice: str):
+        """
+        Check if choice is in candidates without making candidates.
+        """
+        player_id, command, card_ids, uniq_ids = cparsell(choice)
+        if (player_id != self.player_id or command != "playset" or
+                len(card_ids) == 0 or len(uniq_ids) > 0 or
+                card_ids != sorted(card_ids)):
+            return False
+        hand = game.players[self.player_id].pile[PileName.HAND]
+        color_bits = get_card_table().color_bits
+        colors = [CardColor.RED, CardColor.BLUE, CardColor.GREEN]
+        if is_sub_multiset(card_ids, hand.composition()):
+            if len(card_ids) == 1:
+                return True
+            # same color
+            for color in colors:
+                bit = COLOR_BITS[color]
+                if all(color_bits[n] & bit for n in card_ids):
+                    return True
+        # 3 colors (each card is in hand)
+        if len(card_ids) != 3 or not all(
+                hand.get_count(n) > 0 for n in card_ids):
+            return False
+        bits = [COLOR_BITS[n] for n in colors]
+        return any(all(
+            color_bits[card_id] & bit for card_id, bit in zip(perm, bits))
+            for perm in permutations(card_ids))
 
     def _log2choice(self, game: Game):
         if not game.log_manager.has_logs():
@@ -257,7 +311,8 @@ class PlayCardSelectStep(AbstractStep):
                         [play_id,
                             card.uniq_id] not in self.played_ids_and_uniq_ids):
                     uniq_id = card.uniq_id
-        self.played_ids_and_uniq_ids.append([play_id, uniq_id])
+        self.played_ids_and_uniq_ids = self.played_ids_and_uniq_ids + [
+            [play_id, uniq_id]]
         return [
             self,
             PlayStep(
@@ -271,8 +326,8 @@ class PlayCardSelectStep(AbstractStep):
             self.player_id].pile[PileName.FIELD].card_list[-1]]
         for id_uniq_id in self.played_ids_and_uniq_ids:
             rest_id_uniq_ids.remove(id_uniq_id)
-        return ["%d:play:%d" % (
-            self.player_id, n[0]) for n in rest_id_uniq_ids]
+        return [
+            Choice(self.player_id, "play", n[0]) for n in rest_id_uniq_ids]
 
     def _log2choice(self, game: Game):
         if not game.log_manager.has_logs():
@@ -429,16 +484,18 @@ class GenerateSelectStep(AbstractStep):
         game.phase = Phase.GENERATE
         game.update_starflake()
         assert game.turn.player_id == self.player_id
-        candidates = self._create_candidates(game)
         if game.log_manager is not None:
             game.choice = self._log2choice(game)
-            call_choice_callback(game, candidates, game.choice, self)
-        if game.choice == "" or not is_included_candidates(
-                game.choice, candidates):
-            self.candidates = candidates
-            return [self]
-        else:
-            self.candidates = []
+        if not can_check_log_choice(game) or not self._is_legal_choice(
+                game, game.choice):
+            candidates = self._create_candidates(game)
+            if game.log_manager is not None:
+                call_choice_callback(game, candidates, game.choice, self)
+            if game.choice == "" or not is_included_candidates(
+                    game.choice, candidates):
+                self.candidates = candidates
+                return [self]
+        self.candidates = []
         player_id, command, card_id = cparsei(game.choice)
         game.choice = ""
         assert command in ["generate"]
@@ -455,15 +512,24 @@ class GenerateSelectStep(AbstractStep):
         ]
 
     def _create_candidates(self, game: Game):
-        generate_list = get_match_card_ids(
-            game.supply,
-            CardCondition(le_cost=Cost(game.starflake)),
-            game, uniq_flag=True
-        )
-        return ["%d:generate:%d" % (
-            self.player_id, n) for n in generate_list] + [
-            "%d:generate:" % self.player_id
-        ]
+        generate_list = game.get_affordable_supply_ids(game.starflake)
+        return [
+            Choice(self.player_id, "generate", n) for n in generate_list
+        ] + [Choice(self.player_id, "generate")]
+
+    def _is_legal_choice(self, game: Game, choice: str):
+        """
+        Check if choice is in candidates without making candidates.
+        """
+        div = choice.split(":")
+        if (len(div) != 3 or div[0] != str(self.player_id) or
+                div[1] != "generate"):
+            return False
+        if div[2] == "":
+            return True
+        if not div[2].isdigit():
+            return False
+        return int(div[2]) in game.get_affordable_supply_ids(game.starflake)
 
     def _log2choice(self, game: Game):
         if not game.log_manager.has_logs():
@@ -524,13 +590,7 @@ class CleanupStep(AbstractStep):
         # reset all cards
         for player_id in range(len(game.players)):
             for v in game.players[player_id].pile.values():
-                if v.type == PileType.LIST:
-                    for c in v.card_list:
-                        c.reset()
-                elif v.type == PileType.LISTLIST:
-                    for cl in v.card_list:
-                        for c in cl:
-                            c.reset()
+                v.reset_cards()
         return [UpdateTurnStep(self.player_id)] + draw_steps + steps
 
 
@@ -574,6 +634,7 @@ class UpdateTurnStep(AbstractStep):
 
     def process(self, game: Game):
         game.phase = Phase.TURN_END
+        remove_variables(game, TargetLimit(LimitTurn))
         next_turn = game.turn.turn + 1
         next_uniq_turn = game.turn.uniq_turn + 1
         # next player is who has hewest orbit.
@@ -611,21 +672,15 @@ class GameFinishStep(AbstractStep):
         for player_id in range(len(game.players)):
             sum_point = 0
             cards.append([])
-            for name, pile in game.players[player_id].pile.items():
-                if pile.type == PileType.LIST:
-                    for card in pile.card_list:
-                        cards[-1].append(card.id)
-                        step = get_kingdom_steps(0, 0, card.id, card.uniq_id)
-                        point = step.get_victory(game)
-                        sum_point += point
-                elif pile.type == PileType.LISTLIST:
-                    for cardlist in pile.card_list:
-                        for card in cardlist:
-                            cards[-1].append(card.id)
-                            step = get_kingdom_steps(
-                                0, 0, card.id, card.uniq_id)
-                            point = step.get_victory(game)
-                            sum_point += point
+            # victory points don't depend on unique IDs.
+            composition = game.players[player_id].composition()
+            for card_id, count in enumerate(composition):
+                if count <= 0:
+                    continue
+                cards[-1] += [card_id] * count
+                step = get_kingdom_steps(0, 0, card_id, -1)
+                point = step.get_victory(game)
+                sum_point += point * count
             scores.append(
                 [player_id, sum_point, game.players[player_id].orbit])
         scores = sorted(scores, key=lambda x: (x[1], -x[2]), reverse=True)
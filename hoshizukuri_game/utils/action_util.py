@@ -0,0 +1,251 @@
+"""
+This module defines the fixed integer action space of choices.
+"""
+from typing import Any, Dict, List, Tuple
+from .card_util import get_card_table
+from .choice_util import Choice
+
+SINGLE_CARD_COMMANDS = [
+    "generate", "play",
+    "bisebutsuaddplay", "honowtrash", "ikaduchigain", "ikaduchitrash",
+    "insekidiscard", "mizudiscard", "shinrinaddplay", "sougengain",
+]
+"""Commands whose parameter is a card ID or empty."""
+
+MULTI_CARD_COMMANDS = [
+    "playset", "kakuyugotrash", "cleanupdiscard", "blackholeaddplay"]
+"""Commands whose parameter is a multiset of card IDs.
+A multiset is chosen card by card in ascending order of card IDs
+with "command:+card_id" actions, and fixed with "command:"."""
+
+OPTION_COMMANDS = {
+    "izumi": ["hand", "discard"],
+}
+"""Commands whose parameter is one of fixed strings."""
+
+SLOT_COMMANDS = ["triggerselect"]
+"""Commands whose parameter is chosen by its position in candidates.
+"pass" has its own action."""
+
+COMMANDS = SINGLE_CARD_COMMANDS + MULTI_CARD_COMMANDS + [
+    "arashiindex"] + list(OPTION_COMMANDS) + SLOT_COMMANDS
+"""All commands of the action space."""
+
+
+class ActionSpace:
+    """
+    Fixed integer action space.
+
+    Every choice "player_id:command:param" is mapped to an action
+    by its command and param with tables which are made once.
+    Candidates made by steps are Choice, so their parts are read
+    without parsing. Other strings are parsed.
+    The same arguments always make the same table.
+
+    A choice of MULTI_CARD_COMMANDS is a sequence of actions.
+    "command:+card_id" adds a card to the selected cards,
+    and "command:" chooses the candidate which is just the selected cards.
+    So multisets of any size can be chosen without a table of them.
+
+    Args:
+        max_orbit (int, Optional): the max orbit index for arashiindex.
+        max_slot (int, Optional): the number of slots of SLOT_COMMANDS.
+
+    Attributes:
+        size (int): the number of actions.
+        choices (List[str]): "command:param" of each action.
+            Slot actions are "command:#index".
+
+    Note:
+        - Choices over the limits can't be encoded (the action is -1).
+    """
+    def __init__(self, max_orbit: int = 64, max_slot: int = 8):
+        table = get_card_table()
+        card_ids = [
+            n for n in range(1, len(table.starflakes))
+            if table.costs[n] is not None]
+        keys = []
+        for command in SINGLE_CARD_COMMANDS:
+            keys += [(command, n) for n in [None] + card_ids]
+        for command in MULTI_CARD_COMMANDS:
+            keys += [(command, None)] + [(command, n) for n in card_ids]
+        keys += [("arashiindex", n) for n in [None] + list(range(max_orbit))]
+        for command, params in OPTION_COMMANDS.items():
+            keys += [(command, n) for n in params]
+        for command in SLOT_COMMANDS:
+            keys += [(command, "pass")] + [
+                (command, "#%d" % n) for n in range(max_slot)]
+        self.choices: List[str] = [
+            "%s:%s" % (command, _to_text(command, param))
+            for command, param in keys]
+        self.size = len(keys)
+        self._indices: Dict[Tuple[str, Any], int] = {
+            key: n for n, key in enumerate(keys)}
+        assert len(self._indices) == self.size
+        self._slots: Dict[str, Tuple[int, int]] = {}
+        for command in SLOT_COMMANDS:
+            self._slots[command] = (
+                self._indices[(command, "#0")], max_slot)
+        self._multi_commands = set(MULTI_CARD_COMMANDS)
+        self._int_commands = set(SINGLE_CARD_COMMANDS + ["arashiindex"])
+        self._added_card_ids: Dict[int, int] = {}
+        for command in MULTI_CARD_COMMANDS:
+            for card_id in card_ids:
+                self._added_card_ids[
+                    self._indices[(command, card_id)]] = card_id
+
+    def encode_choice(self, choice: str, selected: List[int] = ()):
+        """
+        Get the next action of a choice.
+
+        Args:
+            choice (str): choice. "#player_id" can be included.
+            selected (List[int], Optional): card IDs which are already
+                selected for the choice of MULTI_CARD_COMMANDS.
+
+        Returns:
+            int: action. -1 when the choice can't be encoded.
+
+        Note:
+            - Choices of SLOT_COMMANDS except "pass" need candidates.
+              Use encode_candidates for them.
+        """
+        return self._encode(self._to_choice(choice), list(selected))
+
+    def encode_candidates(
+            self, candidates: List[str],
+            selected: List[int] = ()) -> List[int]:
+        """
+        Get the next actions of candidates.
+
+        Args:
+            candidates (List[str]): candidates of a step.
+            selected (List[int], Optional): card IDs which are already
+                selected for the choice of MULTI_CARD_COMMANDS.
+
+        Returns:
+            List[int]: action of each candidate. -1 can be included.
+        """
+        actions = []
+        slot = 0
+        selected = list(selected)
+        for candidate in candidates:
+            choice = self._to_choice(candidate)
+            action = self._encode(choice, selected)
+            if action == -1 and len(selected) == 0:
+                if choice.command in self._slots:
+                    start, max_slot = self._slots[choice.command]
+                    if slot < max_slot:
+                        action = start + slot
+                    slot += 1
+            actions.append(action)
+        return actions
+
+    def decode_action(
+            self, action: int, candidates: List[str],
+            selected: List[int] = ()):
+        """
+        Get the choice of an action.
+
+        Args:
+            action (int): action.
+            candidates (List[str]): candidates of the step.
+            selected (List[int], Optional): card IDs which are already
+                selected for the choice of MULTI_CARD_COMMANDS.
+
+        Returns:
+            str: choice without "#player_id".
+                None when the action only adds a card to the selected cards.
+        """
+        if action in self._added_card_ids:
+            return None
+        actions = self.encode_candidates(candidates, selected)
+        choice = candidates[actions.index(action)]
+        if isinstance(choice, Choice):
+            return choice
+        return choice.split("#", 1)[0]
+
+    def get_added_card_id(self, action: int):
+        """
+        Get the card ID which an action adds to the selected cards.
+
+        Args:
+            action (int): action.
+
+        Returns:
+            int: card ID. None when the action chooses a candidate.
+        """
+        return self._added_card_ids.get(action)
+
+    def get_mask(
+            self, candidates: List[str], out=None,
+            selected: List[int] = ()):
+        """
+        Get the legal action mask of candidates.
+
+        Args:
+            candidates (List[str]): candidates of a step.
+            out (np.ndarray, Optional): bool array of size to fill.
+            selected (List[int], Optional): card IDs which are already
+                selected for the choice of MULTI_CARD_COMMANDS.
+
+        Returns:
+            np.ndarray: legal action mask.
+        """
+        import numpy as np
+        if out is None:
+            out = np.zeros(self.size, dtype=bool)
+        else:
+            out[:] = False
+        actions = [
+            n for n in self.encode_candidates(candidates, selected)
+            if n >= 0]
+        out[actions] = True
+        return out
+
+    def _to_choice(self, choice: str) -> Choice:
+        """
+        Get the parts of a choice.
+        Candidates made by steps are Choice already,
+        and other strings are parsed by the type of their command.
+        """
+        if isinstance(choice, Choice):
+            return choice
+        player_id, command, text = choice.split("#", 1)[0].split(":", 2)
+        if text == "":
+            param = None
+        elif command in self._multi_commands:
+            param = tuple([int(n) for n in text.split(",")])
+        elif command in self._int_commands:
+            param = int(text)
+        else:
+            param = text
+        return Choice(int(player_id), command, param)
+
+    def _encode(self, choice: Choice, selected: List[int]):
+        command = choice.command
+        param = choice.param
+        if command not in self._multi_commands:
+            if len(selected) > 0:
+                return -1
+            if isinstance(param, tuple):
+                # a card selection of one card or empty.
+                if len(param) > 1:
+                    return -1
+                param = param[0] if len(param) == 1 else None
+            return self._indices.get((command, param), -1)
+        card_ids = sorted(param) if param else []
+        count = len(selected)
+        if card_ids[:count] != selected:
+            return -1
+        if count == len(card_ids):
+            return self._indices[(command, None)]
+        return self._indices.get((command, card_ids[count]), -1)
+
+
+def _to_text(command: str, param: Any):
+    if param is None:
+        return ""
+    if command in MULTI_CARD_COMMANDS:
+        return "+%d" % param
+    return str(param)
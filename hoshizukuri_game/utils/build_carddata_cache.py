@@ -0,0 +1,16 @@
+"""
+Rebuild the card data cache from carddata.yaml.
+
+Usage:
+    python -m hoshizukuri_game.utils.build_carddata_cache
+"""
+from .card_util import CardData
+
+
+def main():
+    filename = CardData.build_cache()
+    print("Wrote %s" % filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,18 @@
 This module defines the utility functions about carddata.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Union, Dict
+from typing import TYPE_CHECKING, List, Tuple, Union, Dict
 if TYPE_CHECKING:
     from ..models.card import Card
     from ..models.pile import Pile
     from ..models.game import Game
 from enum import Enum
+import hashlib
 import os
-import yaml
+import pickle
 from ..models.cost import Cost
 from ..models.pile import PileType
 import re
-import mojimoji
 
 
 class CardType(Enum):
@@ -29,21 +29,170 @@ class CardColor(Enum):
     GREEN = "green"
 
 
+COLOR_BITS: Dict[CardColor, int] = {
+    color: 1 << i for i, color in enumerate(CardColor)}
+"""Bit of each card color for CardTable.color_bits."""
+TYPE_BITS: Dict[CardType, int] = {
+    card_type: 1 << i for i, card_type in enumerate(CardType)}
+"""Bit of each card type for CardTable.type_bits."""
+
+
+class CardTable:
+    """
+    Flat tables of card data. Each tuple is indexed by card ID.
+
+    Args:
+        cardinfo (Dict[int, dict]): card data loaded by CardData.
+
+    Attributes:
+        colors (Tuple[List[CardColor]]): card colors.
+        color_bits (Tuple[int]): card colors as COLOR_BITS.
+        types (Tuple[List[CardType]]): card types.
+        type_bits (Tuple[int]): card types as TYPE_BITS.
+        costs (Tuple[Cost]): costs.
+        cost_values (Tuple[int]): costs as int.
+        starflakes (Tuple[int]): starflakes.
+        vps (Tuple[int]): victory points.
+        creates (Tuple[bool]): True is for "create".
+    """
+    def __init__(self, cardinfo: Dict[int, dict]):
+        infos = [cardinfo.get(n) for n in range(max(cardinfo) + 1)]
+
+        def table(func, default):
+            return tuple(
+                default if info is None else func(info) for info in infos)
+
+        self.colors: Tuple[List[CardColor]] = table(
+            lambda info: info["color"], [])
+        self.color_bits: Tuple[int] = table(lambda info: sum(
+            COLOR_BITS[n] for n in set(info["color"])), 0)
+        self.types: Tuple[List[CardType]] = table(
+            lambda info: info["type"], [])
+        self.type_bits: Tuple[int] = table(lambda info: sum(
+            TYPE_BITS[n] for n in set(info["type"])), 0)
+        self.costs: Tuple[Cost] = table(lambda info: info["cost"], None)
+        self.cost_values: Tuple[int] = table(
+            lambda info: info["cost"].cost, 0)
+        self.starflakes: Tuple[int] = table(
+            lambda info: info["starflake"], 0)
+        self.vps: Tuple[int] = table(lambda info: info["vp"], 0)
+        self.creates: Tuple[bool] = table(lambda info: info["create"], False)
+
+
+_card_table: CardTable = None
+
+
+def get_card_table():
+    """
+    Get flat tables of card data.
+    This is faster than the functions for each card ID in hot loops.
+
+    Returns:
+        CardTable: card tables.
+    """
+    if _card_table is None:
+        CardData()
+    return _card_table
+
+
 class CardData:
+    """
+    Card data loaded from carddata.yaml.
+
+    Note:
+        - The parsed data is cached in cache_filename with the hash of
+          the YAML file, and the cache is used while the YAML is not changed.
+        - Rebuild the cache with
+          ``python -m hoshizukuri_game.utils.build_carddata_cache``.
+    """
     singleton = None
     filename = os.path.join(
         os.path.abspath(os.path.dirname(__file__)), '../carddata.yaml')
+    cache_filename = os.path.normpath(os.path.join(
+        os.path.abspath(os.path.dirname(__file__)), '../carddata.pickle'))
+    cache_version = 1
     cardinfo = {}
     name2iddic = {}
 
     def __new__(cls, *args, **kwargs):
+        global _card_table
         if cls.singleton is None:
             cls.singleton = super().__new__(cls)
-            cls.cardinfo, cls.name2iddic = cls._load_carddata(
-                cls.filename, cls._normalize_name
-            )
+            cls.cardinfo, cls.name2iddic = cls._load_carddata_with_cache()
+            _card_table = CardTable(cls.cardinfo)
         return cls.singleton
 
+    @classmethod
+    def preload(cls):
+        """
+        Load card data now.
+        Call this before forking worker processes
+        so that they don't load it again.
+
+        Returns:
+            CardData: the singleton.
+        """
+        return cls()
+
+    @classmethod
+    def build_cache(cls):
+        """
+        Parse the YAML file and write the cache file.
+
+        Returns:
+            str: the cache filename.
+        """
+        cardinfo, name2iddic = cls._load_carddata(
+            cls.filename, cls._normalize_name)
+        cls._write_cache(cls._get_digest(), cardinfo, name2iddic)
+        return cls.cache_filename
+
+    @classmethod
+    def _load_carddata_with_cache(cls):
+        digest = cls._get_digest()
+        data = cls._read_cache(digest)
+        if data is not None:
+            return data
+        cardinfo, name2iddic = cls._load_carddata(
+            cls.filename, cls._normalize_name)
+        try:
+            cls._write_cache(digest, cardinfo, name2iddic)
+        except OSError:
+            # read only install.
+            pass
+        return cardinfo, name2iddic
+
+    @classmethod
+    def _get_digest(cls):
+        with open(cls.filename, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    @classmethod
+    def _read_cache(cls, digest: str):
+        try:
+            with open(cls.cache_filename, "rb") as file:
+                data = pickle.load(file)
+        except Exception:
+            return None
+        if (not isinstance(data, dict) or
+                data.get("version") != cls.cache_version or
+                data.get("digest") != digest):
+            return None
+        return data["cardinfo"], data["name2iddic"]
+
+    @classmethod
+    def _write_cache(cls, digest: str, cardinfo: dict, name2iddic: dict):
+        data = {
+            "version": cls.cache_version,
+            "digest": digest,
+            "cardinfo": cardinfo,
+            "name2iddic": name2iddic
+        }
+        tmp_filename = "%s.%d.tmp" % (cls.cache_filename, os.getpid())
+        with open(tmp_filename, "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filename, cls.cache_filename)
+
     def _normalize_name(name):
         """
         Normalize card name.
@@ -54,6 +203,8 @@ class CardData:
         return name
 
     def _load_carddata(filename, normalize_name_func):
+        import yaml
+        import mojimoji
         cardinfo = {}
         name2iddic = {}
         with open(filename) as file:
@@ -140,7 +291,7 @@ def get_vp(card_id: int):
     Returns:
         int: vp.
     """
-    return CardData().cardinfo[card_id]["vp"]
+    return get_card_table().vps[card_id]
 
 
 def get_starflake(card_id: int):
@@ -153,7 +304,7 @@ def get_starflake(card_id: int):
     Returns:
         int: starflake.
     """
-    return CardData().cardinfo[card_id]["starflake"]
+    return get_card_table().starflakes[card_id]
 
 
 def get_types(card_id: int, game: Game = None):
@@ -168,7 +319,7 @@ def get_types(card_id: int, game: Game = None):
     Returns:
         List[CardType]: List of card types.
     """
-    return CardData().cardinfo[card_id]["type"]
+    return get_card_table().types[card_id]
 
 
 def get_colors(card_id: int, game: Game = None):
@@ -183,7 +334,7 @@ def get_colors(card_id: int, game: Game = None):
     Returns:
         List[CardType]: List of card types.
     """
-    return CardData().cardinfo[card_id]["color"]
+    return get_card_table().colors[card_id]
 
 
 def is_create(card_id: int):
@@ -196,7 +347,7 @@ def is_create(card_id: int):
     Returns:
         boolean: Create is True.
     """
-    return CardData().cardinfo[card_id]["create"]
+    return get_card_table().creates[card_id]
 
 
 def id2uniq_id(pile: Pile, card_id: int, game: Game):
@@ -230,7 +381,7 @@ def ids2uniq_ids(pile: Pile, card_ids: List[int], game: Game):
         List[int]: Unique card IDs.
     """
     result = []
-    already_uniq_ids = []
+    already_uniq_ids = set()
     card_list = pile.card_list
     if pile.type == PileType.LISTLIST:
         card_list = pile.card_list[-1]
@@ -239,7 +390,7 @@ def ids2uniq_ids(pile: Pile, card_ids: List[int], game: Game):
         for card in card_list:
             if card.id == card_id and card.uniq_id not in already_uniq_ids:
                 result.append(card.uniq_id)
-                already_uniq_ids.append(card.uniq_id)
+                already_uniq_ids.add(card.uniq_id)
                 hit = True
                 break
         if not hit:
@@ -260,16 +411,7 @@ def ids2cards(pile: Pile, card_ids: List[int], game: Game) -> List[Card]:
         List[Card]: Card list.
     """
     uniq_ids = ids2uniq_ids(pile, card_ids, game)
-    result = []
-    card_list = pile.card_list
-    if pile.type == PileType.LISTLIST:
-        card_list = pile.card_list[-1]
-    for uniq_id in uniq_ids:
-        for card in card_list:
-            if card.uniq_id == uniq_id:
-                result.append(card)
-                break
-    return result
+    return [pile.get_card(uniq_id) for uniq_id in uniq_ids]
 
 
 def get_cost(card_id: int, game: Game) -> Cost:
@@ -283,8 +425,7 @@ def get_cost(card_id: int, game: Game) -> Cost:
     Returns:
         Cost: cost of the card.
     """
-    cost: Cost = CardData().cardinfo[card_id]["cost"]
-    return cost
+    return get_card_table().costs[card_id]
 
 
 def get_count(
@@ -300,33 +441,17 @@ def get_count(
     Returns:
         int: the number of cards.
     """
-    def sub_count(pile: Pile, card_id: int):
-        count = 0
-        if pile.type.value == "list":
-            for card in pile.card_list:
-                if card.id == card_id:
-                    count += 1
-        elif pile.type.value == "listlist":
-            for card_list in pile.card_list:
-                for card in card_list:
-                    if card.id == card_id:
-                        count += 1
-        else:
-            if pile.pile_card_id == card_id:
-                count = pile.count
-        return count
-
     if isinstance(pile_or_piles, list):
         count = 0
         for pile in pile_or_piles:
-            count += sub_count(pile, card_id)
+            count += pile.get_count(card_id)
         return count
     if isinstance(pile_or_piles, dict):
         count = 0
         for pile in pile_or_piles.values():
-            count += sub_count(pile, card_id)
+            count += pile.get_count(card_id)
         return count
-    return sub_count(pile_or_piles, card_id)
+    return pile_or_piles.get_count(card_id)
 
 
 def str2ids(card_str: str) -> List[int]:
@@ -1,10 +1,54 @@
 """
 This module defines the utility functions about choice.
 """
-from typing import List
+from typing import Any, List
 import re
 
 
+class Choice(str):
+    """
+    Choice string which keeps its parts.
+    (player_id:command:param)
+    The parts can be read without parsing the string.
+
+    Args:
+        player_id (int): player ID.
+        command (str): command.
+        param (Any, Optional): card ID, tuple of card IDs,
+            index or option. None is empty.
+
+    Attributes:
+        player_id (int): player ID.
+        command (str): command.
+        param (Any): card ID, tuple of card IDs, index, option or None.
+
+    Note:
+        - A tuple of card IDs is joined with ",". An empty tuple is empty.
+        - A choice is immutable, so copies of it are itself.
+    """
+    def __new__(cls, player_id: int, command: str, param: Any = None):
+        if param is None:
+            text = ""
+        elif isinstance(param, tuple):
+            text = ",".join([str(n) for n in param])
+        else:
+            text = str(param)
+        choice = str.__new__(cls, "%d:%s:%s" % (player_id, command, text))
+        choice.player_id = player_id
+        choice.command = command
+        choice.param = param
+        return choice
+
+    def __reduce__(self):
+        return Choice, (self.player_id, self.command, self.param)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
 def cparseii(choice: str):
     """
     Parse the double int type choice.
@@ -95,6 +139,8 @@ def cparses(choice: str):
 
 
 def is_included_candidates(choice: str, candidates: List[str]):
+    if choice in candidates:
+        return True
     no_hyphen_candidates = [
         re.sub(r"(\d+)-(\d+)", "\\1", n) for n in candidates
     ]
@@ -0,0 +1,112 @@
+"""
+This module samples game states which are consistent with
+the information of a player. (determinization)
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, List
+if TYPE_CHECKING:
+    from ..models.game import Game
+    from ..models.card import Card
+import random
+from ..models.pile import PileName
+
+
+def determinize(game: Game, observer_id: int, rng: random.Random = None):
+    """
+    Sample a game state which the observer can't distinguish from game.
+
+    The deck of the observer is shuffled, and the hand and the deck
+    of each opponent are dealt again from their cards.
+    The other piles are public, so they are kept.
+
+    Args:
+        game (Game): now game. This is not changed.
+        observer_id (int): player ID of the observer.
+        rng (random.Random, Optional): random generator.
+            Default is a copy of game.get_random().
+
+    Returns:
+        Game: sampled game. This has its own random generator.
+
+    Note:
+        - Known positions in decks (e.g. cards put back on the deck)
+          are not kept.
+    """
+    return sample_determinizations(game, observer_id, 1, rng)[0]
+
+
+def sample_determinizations(
+        game: Game, observer_id: int, count: int,
+        rng: random.Random = None) -> List[Game]:
+    """
+    Sample game states for the observer at once.
+
+    Samples are forked from game, so they share all cards and
+    the public piles with game, and only the hidden piles are set again.
+    The candidates of the pending step are made again from the sampled
+    piles.
+
+    Args:
+        game (Game): now game. This is not changed.
+        observer_id (int): player ID of the observer.
+        count (int): the number of samples.
+        rng (random.Random, Optional): random generator.
+            Default is a copy of game.get_random(), so the random state
+            of game is not changed and the same game gives the same
+            samples.
+
+    Returns:
+        List[Game]: sampled games.
+    """
+    if rng is None:
+        rng = random.Random()
+        rng.setstate(game.get_random().getstate())
+    hidden = _get_hidden_cards(game, observer_id)
+    samples = []
+    for _ in range(count):
+        sample = game.fork()
+        sample.rng = random.Random(rng.getrandbits(64))
+        for player_id, hand_count, cards in hidden:
+            cards = list(cards)
+            rng.shuffle(cards)
+            piles = sample.players[player_id].pile
+            if hand_count is not None:
+                piles[PileName.HAND].set_cards(cards[:hand_count])
+                cards = cards[hand_count:]
+            piles[PileName.DECK].set_cards(cards)
+        _remake_candidates(sample)
+        samples.append(sample)
+    return samples
+
+
+def _remake_candidates(game: Game):
+    """
+    Process the pending step again without choice,
+    so that its candidates are made from the piles of game.
+    Steps which wait for a choice don't change game
+    until they get the choice.
+    """
+    if len(game.stack) == 0 or len(game.stack[-1].candidates) == 0:
+        return
+    step = game.stack.pop()
+    game.choice = ""
+    game.stack += step.process(game)
+
+
+def _get_hidden_cards(game: Game, observer_id: int):
+    """
+    Get hidden cards of each player.
+
+    Returns:
+        List[Tuple[int, int, List[Card]]]: player ID, the number of
+            hand cards (None for the observer) and hidden cards.
+    """
+    hidden = []
+    for player in game.players:
+        deck: List[Card] = player.pile[PileName.DECK].card_list
+        if player.player_id == observer_id:
+            hidden.append((player.player_id, None, deck))
+            continue
+        hand: List[Card] = player.pile[PileName.HAND].card_list
+        hidden.append((player.player_id, len(hand), hand + deck))
+    return hidden
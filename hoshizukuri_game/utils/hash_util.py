@@ -0,0 +1,132 @@
+"""
+This module defines hash keys of game states and the transposition table.
+"""
+from typing import Any, Hashable, List
+from collections import OrderedDict
+from hashlib import blake2b
+import random
+from .card_util import get_card_table
+
+HASH_MASK = (1 << 64) - 1
+"""Mask of 64 bits hash."""
+
+_SEED = 20220901
+_zobrist_keys: List[int] = None
+_slot_keys: List[int] = []
+
+
+def get_zobrist_keys():
+    """
+    Get the 64 bits hash key of each card ID.
+    Keys are the same in any process.
+
+    Returns:
+        List[int]: hash keys. Index is card ID.
+    """
+    global _zobrist_keys
+    if _zobrist_keys is None:
+        rng = random.Random(_SEED)
+        _zobrist_keys = [
+            rng.getrandbits(64)
+            for _ in range(len(get_card_table().starflakes))]
+    return _zobrist_keys
+
+
+def get_slot_keys(size: int):
+    """
+    Get odd 64 bits keys for piles of a game.
+    A pile hash is multiplied by the key of its slot.
+
+    Args:
+        size (int): the number of slots.
+
+    Returns:
+        List[int]: keys. The first keys are the same for any size.
+    """
+    if len(_slot_keys) < size:
+        rng = random.Random(_SEED + 1)
+        _slot_keys[:] = [rng.getrandbits(64) | 1 for _ in range(size)]
+    return _slot_keys
+
+
+def get_text_hash(text: str):
+    """
+    Get the 64 bits hash of a text.
+    Unlike hash(), this is the same in any process.
+
+    Args:
+        text (str): text.
+
+    Returns:
+        int: hash.
+    """
+    return int.from_bytes(
+        blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class TranspositionTable:
+    """
+    Bounded map from state hashes to search statistics.
+    When it is full, the least recently used entry is removed.
+
+    Args:
+        capacity (int, Optional): the max number of entries.
+
+    Attributes:
+        hits (int): the number of found gets.
+        misses (int): the number of not found gets.
+    """
+    def __init__(self, capacity: int = 1 << 16):
+        assert capacity > 0
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None):
+        """
+        Get the entry of key and mark it as recently used.
+
+        Args:
+            key (Hashable): state hash.
+            default (Any, Optional): returned when not found.
+
+        Returns:
+            Any: entry.
+        """
+        entries = self._entries
+        if key not in entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        entries.move_to_end(key)
+        return entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Set the entry of key.
+
+        Args:
+            key (Hashable): state hash.
+            value (Any): entry. Mutable entries can be updated in place
+                after get.
+        """
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
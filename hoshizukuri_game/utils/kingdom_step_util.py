@@ -1,31 +1,75 @@
 """
 Get kingdom step with card_id.
 """
-from .card_util import get_card_id
-from ..steps.common_card_steps import (
-    HoshikuzuStep, GansekiStep, EiseiStep, WakuseiStep, KouseiStep
-)
+from typing import List, Type, Union
+import importlib
 from ..steps.abstract_step import AbstractStep
-from ..steps.base.seiun_step import SeiunStep
-from ..steps.base.genshisei_step import GenshiseiStep
-from ..steps.base.ikaduchi_step import IkaduchiStep
-from ..steps.base.shinrin_step import ShinrinStep
-from ..steps.base.sougen_step import SougenStep
-from ..steps.base.mizu_step import MizuStep
-from ..steps.base.suisho_step import SuishoStep
-from ..steps.base.blackhole_step import BlackholeStep
-from ..steps.base.funka_step import FunkaStep
-from ..steps.base.kakuyugo_step import KakuyugoStep
-from ..steps.base.kanketsusen_step import KanketsusenStep
-from ..steps.base.kori_step import KoriStep
-from ..steps.base.kudamononoki_step import KudamononokiStep
-from ..steps.base.honow_step import HonowStep
-from ..steps.base.izumi_step import IzumiStep
-from ..steps.base.seiza_step import SeizaStep
-from ..steps.base.arashi_step import ArashiStep
-from ..steps.base.bisebutsu_step import BisebutsuStep
-from ..steps.base.daichi_step import DaichiStep
-from ..steps.base.inseki_step import InsekiStep
+from .card_util import get_card_id, get_card_table
+
+_BASE_STEPS = {
+    "hoshikuzu": "..steps.common_card_steps:HoshikuzuStep",
+    "ganseki": "..steps.common_card_steps:GansekiStep",
+    "eisei": "..steps.common_card_steps:EiseiStep",
+    "wakusei": "..steps.common_card_steps:WakuseiStep",
+    "kousei": "..steps.common_card_steps:KouseiStep",
+    "daichi": "..steps.base.daichi_step:DaichiStep",
+    "inseki": "..steps.base.inseki_step:InsekiStep",
+    "arashi": "..steps.base.arashi_step:ArashiStep",
+    "bisebutsu": "..steps.base.bisebutsu_step:BisebutsuStep",
+    "izumi": "..steps.base.izumi_step:IzumiStep",
+    "seiza": "..steps.base.seiza_step:SeizaStep",
+    "kudamononoki": "..steps.base.kudamononoki_step:KudamononokiStep",
+    "honow": "..steps.base.honow_step:HonowStep",
+    "kanketsusen": "..steps.base.kanketsusen_step:KanketsusenStep",
+    "kori": "..steps.base.kori_step:KoriStep",
+    "funka": "..steps.base.funka_step:FunkaStep",
+    "kakuyugo": "..steps.base.kakuyugo_step:KakuyugoStep",
+    "suisho": "..steps.base.suisho_step:SuishoStep",
+    "blackhole": "..steps.base.blackhole_step:BlackholeStep",
+    "sougen": "..steps.base.sougen_step:SougenStep",
+    "mizu": "..steps.base.mizu_step:MizuStep",
+    "ikaduchi": "..steps.base.ikaduchi_step:IkaduchiStep",
+    "shinrin": "..steps.base.shinrin_step:ShinrinStep",
+    "seiun": "..steps.base.seiun_step:SeiunStep",
+    "genshisei": "..steps.base.genshisei_step:GenshiseiStep",
+}
+"""Card name and "module:ClassName" of the step for base cards."""
+
+_kingdom_steps: List[Union[Type[AbstractStep], str, None]] = None
+
+
+def register_kingdom_step(
+        card_id: int, step: Union[Type[AbstractStep], str, None]):
+    """
+    Register the step class of a card.
+    This is for adding cards of expansions.
+
+    Args:
+        card_id (int): card ID.
+        step (Type[AbstractStep] or str or None): step class.
+            "module:ClassName" is imported when the card is played first.
+            None removes the step.
+
+    Note:
+        - The step class must be constructed with
+          (player_id, depth, uniq_id).
+        - A registered step overwrites the step of the same card ID.
+    """
+    registry = _get_kingdom_steps()
+    if card_id >= len(registry):
+        registry += [None] * (card_id + 1 - len(registry))
+    registry[card_id] = step
+
+
+def load_kingdom_steps():
+    """
+    Import all registered step classes now.
+    Call this before forking worker processes.
+    """
+    registry = _get_kingdom_steps()
+    for card_id, step in enumerate(registry):
+        if isinstance(step, str):
+            registry[card_id] = _import_step(step)
 
 
 def get_kingdom_steps(
@@ -46,24 +90,27 @@ def get_kingdom_steps(
     """
     if org_id == 0:
         org_id = card_id
-    step_dic = {
-        "daichi": DaichiStep, "inseki": InsekiStep,
-        "arashi": ArashiStep, "bisebutsu": BisebutsuStep,
-        "izumi": IzumiStep, "seiza": SeizaStep,
-        "kudamononoki": KudamononokiStep, "honow": HonowStep,
-        "kanketsusen": KanketsusenStep, "kori": KoriStep,
-        "funka": FunkaStep, "kakuyugo": KakuyugoStep,
-        "suisho": SuishoStep, "blackhole": BlackholeStep,
-        "sougen": SougenStep, "mizu": MizuStep,
-        "ikaduchi": IkaduchiStep, "shinrin": ShinrinStep,
-        "seiun": SeiunStep, "genshisei": GenshiseiStep,
-        "wakusei": WakuseiStep, "kousei": KouseiStep,
-        "hoshikuzu": HoshikuzuStep, "ganseki": GansekiStep, "eisei": EiseiStep,
-    }
-    step_id_dic = {}
-    for k, v in step_dic.items():
-        step_id_dic[get_card_id(k)] = v
-    if card_id not in step_id_dic:
+    registry = _kingdom_steps or _get_kingdom_steps()
+    step = registry[card_id] if 0 <= card_id < len(registry) else None
+    if step is None:
         print("Warining: Not found card step: %d" % card_id)
         return AbstractStep()
-    return step_id_dic[card_id](player_id, depth, uniq_id)
+    if isinstance(step, str):
+        step = _import_step(step)
+        registry[card_id] = step
+    return step(player_id, depth, uniq_id)
+
+
+def _get_kingdom_steps():
+    global _kingdom_steps
+    if _kingdom_steps is None:
+        _kingdom_steps = [None] * len(get_card_table().starflakes)
+        for name, path in _BASE_STEPS.items():
+            _kingdom_steps[get_card_id(name)] = path
+    return _kingdom_steps
+
+
+def _import_step(path: str):
+    module_name, class_name = path.split(":")
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
@@ -0,0 +1,202 @@
+"""
+This module encodes game states into numpy arrays.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, List
+if TYPE_CHECKING:
+    from ..models.game import Game
+from ..models.pile import PileName
+from ..models.turn import Phase
+from .action_util import COMMANDS
+from .card_util import get_card_table
+from .choice_util import Choice
+import numpy as np
+
+_PHASES = list(Phase)
+_PHASE_INDICES = {phase: n for n, phase in enumerate(_PHASES)}
+_COMMAND_INDICES = {command: n for n, command in enumerate(COMMANDS)}
+_PILENAMES = [
+    PileName.HAND, PileName.DECK, PileName.DISCARD, PileName.FIELD]
+
+
+class ObservationEncoder:
+    """
+    Encode a game into a float32 array with fixed layout.
+
+    The layout is bellow. H is the number of card IDs.
+
+    - for each player: card histograms (H each) of hand, deck,
+      discard and field, the number of field groups,
+      the number of cards of each field group (max_field_groups),
+      orbit and tmp_orbit.
+    - turn player (one-hot, player_num).
+    - choice player (one-hot, player_num).
+    - phase (one-hot).
+    - turn and starflake.
+    - supply counts (H).
+    - trash histogram (H).
+    - pending decision command (one-hot, action_util.COMMANDS).
+    - cards already selected for the pending multiset choice (H).
+
+    Args:
+        player_num (int): the number of players.
+        max_field_groups (int, Optional): the number of field groups
+            which have own features.
+
+    Attributes:
+        size (int): the size of an observation.
+    """
+    def __init__(self, player_num: int, max_field_groups: int = 8):
+        self.player_num = player_num
+        self.max_field_groups = max_field_groups
+        self.card_id_size = len(get_card_table().starflakes)
+        self._player_size = (
+            len(_PILENAMES) * self.card_id_size + 1 +
+            max_field_groups + 2)
+        self._turn_offset = player_num * self._player_size
+        self._phase_offset = self._turn_offset + player_num * 2
+        self._supply_offset = self._phase_offset + len(_PHASES) + 2
+        self._trash_offset = self._supply_offset + self.card_id_size
+        self._command_offset = self._trash_offset + self.card_id_size
+        self._selected_offset = self._command_offset + len(COMMANDS)
+        self.size = self._selected_offset + self.card_id_size
+        offsets = [
+            n * self._player_size + m * self.card_id_size
+            for n in range(player_num) for m in range(len(_PILENAMES))]
+        offsets += [
+            self._supply_offset, self._trash_offset, self._selected_offset]
+        self._histogram_indices = np.add.outer(
+            offsets, np.arange(self.card_id_size)).reshape(-1)
+
+    def encode(
+            self, game: Game, out=None, candidates: List[str] = None,
+            selected: List[int] = None):
+        """
+        Encode a game.
+
+        Args:
+            game (Game): game.
+            out (np.ndarray, Optional): float32 array of size to fill.
+            candidates (List[str], Optional): candidates of the pending
+                decision. The choice player and the command
+                are from these.
+            selected (List[int], Optional): card IDs which are already
+                selected for the pending multiset choice.
+
+        Returns:
+            np.ndarray: observation.
+        """
+        if out is None:
+            out = np.zeros(self.size, dtype=np.float32)
+        counts = []
+        indices = []
+        values = []
+        self._collect(game, candidates, selected, 0, counts, indices, values)
+        self._fill(out[np.newaxis], counts, indices, values)
+        return out
+
+    def encode_batch(
+            self, games: List[Game], out=None,
+            candidates: List[List[str]] = None,
+            selected: List[List[int]] = None):
+        """
+        Encode games at once.
+
+        Args:
+            games (List[Game]): games.
+            out (np.ndarray, Optional): float32 array (N, size) to fill.
+            candidates (List[List[str]], Optional): candidates of
+                each game.
+            selected (List[List[int]], Optional): selected card IDs
+                of each game.
+
+        Returns:
+            np.ndarray: observations (N, size).
+
+        Note:
+            - Features of all games are written with one numpy call,
+              so this is faster than encode for each game.
+        """
+        if out is None:
+            out = np.zeros((len(games), self.size), dtype=np.float32)
+        assert out.shape == (len(games), self.size)
+        counts = []
+        indices = []
+        values = []
+        for index, game in enumerate(games):
+            self._collect(
+                game, None if candidates is None else candidates[index],
+                None if selected is None else selected[index],
+                index * self.size, counts, indices, values)
+        self._fill(out, counts, indices, values)
+        return out
+
+    def _collect(
+            self, game: Game, candidates: List[str], selected: List[int],
+            n: int, counts: List[int], indices: List[int],
+            values: List[float]):
+        """
+        Collect features of a game from offset n.
+        Histograms are read from the counts of piles without visiting
+        cards, and they are added to counts in the order of
+        _histogram_indices. The other features are values of indices.
+        """
+        h = self.card_id_size
+        base = n
+        max_groups = self.max_field_groups
+        for player in game.players:
+            piles = player.pile
+            for pilename in _PILENAMES:
+                counts += piles[pilename].composition()
+                n += h
+            groups = piles[PileName.FIELD].card_list
+            indices.append(n)
+            values.append(len(groups))
+            for index, group in enumerate(groups[:max_groups]):
+                indices.append(n + 1 + index)
+                values.append(len(group))
+            n += 1 + max_groups
+            indices += [n, n + 1]
+            values += [player.orbit, player.tmp_orbit]
+            n += 2
+        indices.append(n + game.turn.player_id)
+        values.append(1)
+        n += self.player_num
+        if candidates:
+            choice = candidates[0]
+            if isinstance(choice, Choice):
+                player_id, command = choice.player_id, choice.command
+            else:
+                player_id, command = choice.split(":", 2)[:2]
+            indices.append(n + int(player_id))
+            values.append(1)
+            index = _COMMAND_INDICES.get(command)
+            if index is not None:
+                indices.append(base + self._command_offset + index)
+                values.append(1)
+        n += self.player_num
+        indices += [
+            n + _PHASE_INDICES[game.phase], n + len(_PHASES),
+            n + len(_PHASES) + 1]
+        values += [1, game.turn.turn, game.starflake]
+        supply_counts = [0] * h
+        for card_id, pile in game.supply.items():
+            supply_counts[card_id] = pile.get_count(card_id)
+        counts += supply_counts
+        counts += game.trash.composition()
+        selected_counts = [0] * h
+        if selected:
+            for card_id in selected:
+                selected_counts[card_id] += 1
+        counts += selected_counts
+
+    def _fill(
+            self, out, counts: List[int], indices: List[int],
+            values: List[float]):
+        # indices are offsets in the flattened out, and they are
+        # written by rows and columns so that out can be a view.
+        out[:] = 0
+        out[:, self._histogram_indices] = np.asarray(
+            counts, dtype=np.int32).reshape(len(out), -1)
+        rows, columns = np.divmod(indices, self.size)
+        out[rows, columns] = values
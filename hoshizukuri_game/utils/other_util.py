@@ -7,7 +7,11 @@ if TYPE_CHECKING:
     from ..models.game import Game
     from ..steps.abstract_step import AbstractStep
 from ..models.card import Card
-import itertools
+from itertools import combinations, permutations
+from math import comb, perm
+
+_SMALL_SELECTION_COUNT = 64
+"""Max selections (with duplicates) which are made by itertools."""
 
 
 def get_enemy_ids(player_id: int, player_num: int):
@@ -32,6 +36,147 @@ def get_enemy_ids(player_id: int, player_num: int):
     return ids
 
 
+def iter_combinations(
+        cards: Union[List[int], List[Card]], count: int, less_flag: bool):
+    """
+    Iterate card_id combinations without duplicates.
+    Cards are treated as a multiset of card IDs, so the same combination
+    is never made twice even if cards have many same card IDs.
+
+    Args:
+        cards (List[int] or List[Card]): Select cards from this list.
+        count (int): the number of select cards.
+        less_flag (bool): True is that the number of select cards can be less.
+
+    Yields:
+        Tuple[int]: sorted card IDs. Combinations are yielded from the
+            smaller size, in lexicographic order for the same size,
+            and the empty one is the last when less_flag is True.
+
+    Note:
+        - When count is less than the size of cards, count will be this size.
+        - Combinations of each size are made when the size is reached.
+    """
+    card_ids = _get_sorted_card_ids(cards)
+    count = min(count, len(card_ids))
+    sizes = range(1, count + 1) if less_flag else [count]
+    memo = None
+    for size in sizes:
+        if comb(len(card_ids), size) <= _SMALL_SELECTION_COUNT:
+            # from sorted cards, same combinations are made in a row.
+            yield from dict.fromkeys(combinations(card_ids, size))
+            continue
+        if memo is None:
+            memo = {}
+            distinct_ids, counts = _count_card_ids(card_ids)
+            rests = [sum(counts[i:]) for i in range(len(counts) + 1)]
+        yield from _make_combinations(
+            distinct_ids, counts, rests, 0, size, memo)
+    if less_flag:
+        yield ()
+
+
+def iter_permutations(
+        cards: Union[List[int], List[Card]], count: int, less_flag: bool):
+    """
+    Iterate card_id permutations without duplicates.
+    Cards are treated as a multiset of card IDs.
+
+    Args:
+        cards (List[int] or List[Card]): Select cards from this list.
+        count (int): the number of select cards.
+        less_flag (bool): True is that the number of select cards can be less.
+
+    Yields:
+        Tuple[int]: card IDs. The order is the same as iter_combinations.
+
+    Note:
+        - When count is less than the size of cards, count will be this size.
+        - Permutations of each size are made when the size is reached.
+    """
+    card_ids = _get_sorted_card_ids(cards)
+    count = min(count, len(card_ids))
+    sizes = range(1, count + 1) if less_flag else [count]
+    memo = None
+    for size in sizes:
+        if perm(len(card_ids), size) <= _SMALL_SELECTION_COUNT:
+            yield from dict.fromkeys(permutations(card_ids, size))
+            continue
+        if memo is None:
+            memo = {}
+            distinct_ids, counts = _count_card_ids(card_ids)
+        yield from _make_permutations(distinct_ids, counts, size, memo)
+    if less_flag:
+        yield ()
+
+
+def _get_sorted_card_ids(cards: Union[List[int], List[Card]]):
+    if len(cards) > 0 and isinstance(cards[0], Card):
+        return sorted([card.id for card in cards])
+    return sorted(cards)
+
+
+def _count_card_ids(card_ids: List[int]):
+    """
+    Count sorted card IDs.
+
+    Returns:
+        Tuple[List[int], List[int]]: distinct card IDs and their counts.
+    """
+    counts = {}
+    for card_id in card_ids:
+        counts[card_id] = counts.get(card_id, 0) + 1
+    return list(counts), list(counts.values())
+
+
+def _make_combinations(
+        card_ids: List[int], counts: List[int], rests: List[int],
+        index: int, size: int, memo: dict):
+    """
+    Make combinations of size cards from card_ids[index:].
+    Each combination is n copies of card_ids[index] and a combination
+    of the rest, so the result is memoized by index and size.
+    """
+    if size == 0:
+        return [()]
+    if rests[index] < size:
+        return []
+    key = (index, size)
+    if key in memo:
+        return memo[key]
+    result = []
+    for n in range(min(counts[index], size), -1, -1):
+        head = (card_ids[index],) * n
+        result += [head + row for row in _make_combinations(
+            card_ids, counts, rests, index + 1, size - n, memo)]
+    memo[key] = result
+    return result
+
+
+def _make_permutations(
+        card_ids: List[int], counts: List[int], size: int, memo: dict):
+    """
+    Make permutations of size cards from the rest counts.
+    The result only depends on counts and size, so it is memoized.
+    """
+    if size == 0:
+        return [()]
+    key = (tuple(counts), size)
+    if key in memo:
+        return memo[key]
+    result = []
+    for i, card_id in enumerate(card_ids):
+        if counts[i] == 0:
+            continue
+        counts[i] -= 1
+        rows = _make_permutations(card_ids, counts, size - 1, memo)
+        counts[i] += 1
+        head = (card_id,)
+        result += [head + row for row in rows]
+    memo[key] = result
+    return result
+
+
 def make_combination(
         cards: Union[List[int], List[Card]], count: int, less_flag: bool):
     """
@@ -44,31 +189,12 @@ def make_combination(
 
     Returns:
         List[List[int]]: The list of selected card list.
+            The order is the same as iter_combinations.
 
     Note:
         - When count is less than the size of cards, count will be this size.
     """
-    if count > len(cards):
-        count = len(cards)
-    candidates = []
-    if len(cards) <= 0:
-        return [[]]
-    if isinstance(cards[0], Card):
-        candidates = [card.id for card in cards]
-    else:
-        candidates = [n for n in cards]
-    candidates = sorted(candidates)
-    result = []
-    if less_flag is False:
-        tmp = list(set(list(itertools.combinations(
-            candidates, count))))
-        for t_e in tmp:
-            result.append(list(t_e))
-    else:
-        for i in range(count):
-            result += make_combination(candidates, i + 1, False)
-        result += [[]]
-    return result
+    return [list(n) for n in iter_combinations(cards, count, less_flag)]
 
 
 def make_permutation(
@@ -83,45 +209,12 @@ def make_permutation(
 
     Returns:
         List[List[int]]: The list of selected card list.
+            The order is the same as iter_permutations.
 
     Note:
         - When count is less than the size of cards, count will be this size.
     """
-    if count > len(cards):
-        count = len(cards)
-    candidates = []
-    if len(cards) <= 0:
-        return [[]]
-    if isinstance(cards[0], Card):
-        candidates = [card.id for card in cards]
-    else:
-        candidates = [n for n in cards]
-    candidates = sorted(candidates)
-    result = []
-    if less_flag is False:
-        tmp = _make_permutation_without_itertools(candidates, count)
-        for t_e in tmp:
-            result.append(list(t_e))
-    else:
-        for i in range(count):
-            result += make_permutation(candidates, i + 1, False)
-        result += [[]]
-    return result
-
-
-def _make_permutation_without_itertools(candidates, count):
-    queue = [[[], candidates]]
-    while len(queue[0][1]) > len(candidates) - count:
-        next_queue = []
-        for item in queue:
-            for cand in list(set(item[1])):
-                now_list = list(item[0])
-                next_list = now_list + [cand]
-                next_candidates = list(item[1])
-                next_candidates.remove(cand)
-                next_queue.append([next_list, next_candidates])
-        queue = next_queue
-    return [n[0] for n in queue]
+    return [list(n) for n in iter_permutations(cards, count, less_flag)]
 
 
 def call_choice_callback(
@@ -130,3 +223,42 @@ def call_choice_callback(
     if (hasattr(game, "choice_callback") and
             game.choice_callback is not None):
         game.choice_callback(game, candidates, choice, step)
+
+
+def can_check_log_choice(game: Game):
+    """
+    Check if the choice from log can be checked directly by a rule
+    without making candidates.
+    This is True while simulating with log, the choice is set
+    and nobody reads candidates. (no choice_callback)
+
+    Args:
+        game (Game): now game.
+
+    Returns:
+        bool: True is for checking the choice without candidates.
+    """
+    return (
+        game.log_manager is not None and game.choice != "" and
+        getattr(game, "choice_callback", None) is None)
+
+
+def is_sub_multiset(card_ids: List[int], counts: List[int]):
+    """
+    Check if card IDs are included in the cards.
+
+    Args:
+        card_ids (List[int]): card IDs.
+        counts (List[int]): the number of cards for each card ID.
+            (Pile.composition)
+
+    Returns:
+        bool: True is for included.
+    """
+    needs = {}
+    for card_id in card_ids:
+        needs[card_id] = needs.get(card_id, 0) + 1
+    for card_id, count in needs.items():
+        if card_id < 0 or card_id >= len(counts) or counts[card_id] < count:
+            return False
+    return True
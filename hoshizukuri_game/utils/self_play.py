@@ -0,0 +1,264 @@
+"""
+Play many games with policies.
+
+Usage:
+    python -m hoshizukuri_game.utils.self_play -n GAMES \
+        [-s SEED] [-w WORKERS] [-p random|greedy] [-o RESULT.jsonl]
+"""
+from __future__ import annotations
+from typing import IO, Callable, Iterable, Iterator, List, Union
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from ..hoshizukuri_game import HoshizukuriGame
+from ..models.game import Game
+from ..models.player import Player
+from .card_util import CardData, get_cost
+from .choice_util import cparses
+from .kingdom_step_util import load_kingdom_steps
+
+Policy = Callable[[Game, List[str]], str]
+"""Function which gets a game and candidates and returns a choice."""
+
+_runner: SelfPlayRunner = None
+
+
+def random_policy(game: Game, candidates: List[str]):
+    """
+    Choose a candidate at random with the random generator of game.
+
+    Args:
+        game (Game): now game.
+        candidates (List[str]): candidates without "#player_id".
+
+    Returns:
+        str: choice.
+    """
+    return game.get_random().choice(candidates)
+
+
+def greedy_policy(game: Game, candidates: List[str]):
+    """
+    Generate the most expensive card, and choose others at random.
+
+    Args:
+        game (Game): now game.
+        candidates (List[str]): candidates without "#player_id".
+
+    Returns:
+        str: choice.
+    """
+    if cparses(candidates[0])[1] != "generate":
+        return random_policy(game, candidates)
+    best_cost = -1
+    best_choices = []
+    for candidate in candidates:
+        card_str = cparses(candidate)[2]
+        cost = -1 if card_str == "" else get_cost(int(card_str), game).cost
+        if cost > best_cost:
+            best_cost = cost
+            best_choices = []
+        if cost == best_cost:
+            best_choices.append(candidate)
+    return random_policy(game, best_choices)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+class SelfPlayRunner:
+    """
+    Play games with policies.
+    Each game has its own random generator with the seed of the game,
+    so the result of a seed is the same in any process.
+
+    Args:
+        policies (Policy | List[Policy], Optional): policy of each player.
+            A policy is used by all players. Default is random_policy.
+        player_num (int, Optional): the number of players.
+        supply_ids (List[int], Optional): supplies are chosen from these.
+        max_turn (int, Optional): stop games at this turn.
+
+    Note:
+        - Policies must be picklable (module level functions)
+          for using workers.
+    """
+    def __init__(
+            self, policies: Union[Policy, List[Policy]] = random_policy,
+            player_num: int = 2, supply_ids: List[int] = None,
+            max_turn: int = 100):
+        if not isinstance(policies, list):
+            policies = [policies] * player_num
+        assert len(policies) == player_num
+        self.policies = policies
+        self.player_num = player_num
+        self.supply_ids = supply_ids
+        if supply_ids is None:
+            self.supply_ids = list(range(6, 26))
+        self.max_turn = max_turn
+        self.simulator = HoshizukuriGame()
+
+    def make_game(self, seed: int):
+        """
+        Make a new game with the seed.
+
+        Args:
+            seed (int): seed of the game.
+
+        Returns:
+            Game: new game.
+        """
+        game = Game(seed)
+        game.set_players([Player(n) for n in range(self.player_num)])
+        game.set_supply(self.supply_ids)
+        game.set_initial_step()
+        return game
+
+    def play(self, seed: int):
+        """
+        Play a game.
+
+        Args:
+            seed (int): seed of the game.
+
+        Returns:
+            dict: compact result.
+
+        Note:
+            - Result dictionary likes bellow.
+            - {"seed": SEED, "supply": [CARD_ID, ...], "turn": TURN,
+              "choices": N, "winner_id": PLAYER_ID,
+              "points": [POINT, ...]}
+            - winner_id is -1 and points is [] when the game is stopped
+              by max_turn.
+        """
+        game = self.make_game(seed)
+        supply = sorted(game.supply)
+        choices = 0
+        candidates = self.simulator.run_until_decision(game)
+        while len(candidates) > 0 and game.turn.turn < self.max_turn:
+            choice_player_id = int(candidates[0].split("#")[1])
+            choice = self.policies[choice_player_id](
+                game, [n.split("#")[0] for n in candidates])
+            candidates = self.simulator.run_until_decision(game, choice)
+            choices += 1
+        points = [0] * self.player_num
+        for result in game.result:
+            points[result["player_id"]] = result["point"]
+        return {
+            "seed": seed,
+            "supply": supply,
+            "turn": game.turn.turn,
+            "choices": choices,
+            "winner_id": game.winner_id,
+            "points": points if len(game.result) > 0 else []
+        }
+
+    def iter_play(
+            self, seeds: Iterable[int], workers: int = 1,
+            chunksize: int = 4) -> Iterator[dict]:
+        """
+        Play games and yield results in the order of seeds.
+
+        Args:
+            seeds (Iterable[int]): seeds of games.
+            workers (int, Optional): the number of worker processes.
+                When this is 1, games are played in this process.
+            chunksize (int, Optional): the number of games sent to
+                a worker at once.
+
+        Yields:
+            dict: result of play.
+        """
+        CardData.preload()
+        load_kingdom_steps()
+        if workers <= 1:
+            for seed in seeds:
+                yield self.play(seed)
+            return
+        with multiprocessing.Pool(
+                workers, initializer=_init_worker,
+                initargs=(self,)) as pool:
+            yield from pool.imap(_play, seeds, chunksize)
+
+    def run(
+            self, games: int, seed: int = 0, workers: int = 1,
+            output: IO[str] = None) -> dict:
+        """
+        Play games with seeds from seed to seed + games - 1.
+
+        Args:
+            games (int): the number of games.
+            seed (int, Optional): the first seed.
+            workers (int, Optional): the number of worker processes.
+            output (IO[str], Optional): JSONL output of results.
+
+        Returns:
+            dict: {"games": N, "finished": N, "seconds": SEC,
+                "games_per_sec": N}
+        """
+        summary = {"games": 0, "finished": 0}
+        start = time.perf_counter()
+        for result in self.iter_play(range(seed, seed + games), workers):
+            summary["games"] += 1
+            if result["winner_id"] != -1:
+                summary["finished"] += 1
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+        seconds = time.perf_counter() - start
+        summary["seconds"] = seconds
+        summary["games_per_sec"] = summary["games"] / seconds if seconds else 0
+        return summary
+
+
+def _init_worker(runner: SelfPlayRunner):
+    global _runner
+    _runner = runner
+
+
+def _play(seed: int):
+    return _runner.play(seed)
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description="Play games with policies.")
+    parser.add_argument(
+        "-n", "--games", type=int, default=100, help="the number of games")
+    parser.add_argument(
+        "-s", "--seed", type=int, default=0, help="the first seed")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="the number of worker processes")
+    parser.add_argument(
+        "-p", "--policy", choices=sorted(POLICIES), default="random",
+        help="policy of all players")
+    parser.add_argument(
+        "--players", type=int, default=2, help="the number of players")
+    parser.add_argument(
+        "-o", "--output", default=None,
+        help="JSONL file of results (default: stdout)")
+    parsed = parser.parse_args(args)
+    runner = SelfPlayRunner(
+        POLICIES[parsed.policy], player_num=parsed.players)
+    if parsed.output is None:
+        summary = runner.run(
+            parsed.games, parsed.seed, parsed.workers, sys.stdout)
+    else:
+        with open(parsed.output, "w") as output:
+            summary = runner.run(
+                parsed.games, parsed.seed, parsed.workers, output)
+    print(
+        "games: %d, finished: %d, %.2f sec (%.1f games/sec)" % (
+            summary["games"], summary["finished"],
+            summary["seconds"], summary["games_per_sec"]),
+        file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Validate many game logs with a process pool.
+
+Usage:
+    python -m hoshizukuri_game.utils.validate_corpus LOG_DIR \
+        [-w WORKERS] [-o RESULT.jsonl]
+"""
+from typing import IO, Iterable, Iterator, List
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from ..hoshizukuri_game import HoshizukuriGame
+from .card_util import CardData
+from .kingdom_step_util import load_kingdom_steps
+
+_simulator = None
+
+
+def find_logs(paths: Iterable[str], suffix: str = ".txt") -> List[str]:
+    """
+    Find log files.
+
+    Args:
+        paths (Iterable[str]): log files or directories.
+        suffix (str, Optional): suffix of log files in directories.
+
+    Returns:
+        List[str]: log files. Files in directories are sorted.
+    """
+    filenames = []
+    for path in paths:
+        if not os.path.isdir(path):
+            filenames.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(suffix):
+                    filenames.append(os.path.join(root, name))
+    return filenames
+
+
+def iter_validate_corpus(
+        paths: Iterable[str], workers: int = 1,
+        chunksize: int = 4) -> Iterator[dict]:
+    """
+    Validate logs and yield results as soon as each log finishes.
+
+    Args:
+        paths (Iterable[str]): log files.
+        workers (int, Optional): the number of worker processes.
+            When this is 1, logs are validated in this process.
+        chunksize (int, Optional): the number of logs sent to
+            a worker at once.
+
+    Yields:
+        dict: {"path": PATH, "message": MESSAGE, "line": LINE,
+            "result": RESULT}. The order is not the order of paths.
+
+    Note:
+        - RESULT is game.result ([] when the log is invalid).
+        - LINE is the line number of the failing log or None.
+    """
+    if workers <= 1:
+        _init_worker()
+        for path in paths:
+            yield _validate_log(path)
+        return
+    # load data before forking, so that workers share it.
+    _init_worker()
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(_validate_log, paths, chunksize)
+
+
+def validate_corpus(
+        paths: Iterable[str], workers: int = 1,
+        output: IO[str] = None, chunksize: int = 4) -> dict:
+    """
+    Validate logs and write each result to output as a JSON line.
+
+    Args:
+        paths (Iterable[str]): log files.
+        workers (int, Optional): the number of worker processes.
+        output (IO[str], Optional): JSONL output.
+        chunksize (int, Optional): the number of logs sent to
+            a worker at once.
+
+    Returns:
+        dict: {"files": N, "ok": N, "errors": N,
+            "seconds": SEC, "files_per_sec": N}
+    """
+    summary = {"files": 0, "ok": 0, "errors": 0}
+    start = time.perf_counter()
+    for result in iter_validate_corpus(paths, workers, chunksize):
+        summary["files"] += 1
+        if result["message"] == "ok":
+            summary["ok"] += 1
+        else:
+            summary["errors"] += 1
+        if output is not None:
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    seconds = time.perf_counter() - start
+    summary["seconds"] = seconds
+    summary["files_per_sec"] = summary["files"] / seconds if seconds else 0
+    return summary
+
+
+def _init_worker():
+    global _simulator
+    if _simulator is None:
+        CardData.preload()
+        load_kingdom_steps()
+        _simulator = HoshizukuriGame()
+
+
+def _validate_log(path: str):
+    try:
+        result = _simulator.simulate_with_log(path, stream=True)
+    except Exception as e:
+        return {"path": path, "message": str(e), "line": None, "result": []}
+    game_result = []
+    if len(result["results"]) > 0:
+        game_result = result["results"][0]["game"].result
+    return {
+        "path": path,
+        "message": result["message"],
+        "line": result.get("line"),
+        "result": game_result
+    }
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description="Validate game logs.")
+    parser.add_argument("paths", nargs="+", help="log files or directories")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count() or 1,
+        help="the number of worker processes")
+    parser.add_argument(
+        "-o", "--output", default=None,
+        help="JSONL file of results (default: stdout)")
+    parser.add_argument(
+        "--suffix", default=".txt", help="suffix of log files")
+    parsed = parser.parse_args(args)
+    paths = find_logs(parsed.paths, parsed.suffix)
+    if parsed.output is None:
+        summary = validate_corpus(paths, parsed.workers, sys.stdout)
+    else:
+        with open(parsed.output, "w") as output:
+            summary = validate_corpus(paths, parsed.workers, output)
+    print(
+        "files: %d, ok: %d, errors: %d, %.2f sec (%.1f files/sec)" % (
+            summary["files"], summary["ok"], summary["errors"],
+            summary["seconds"], summary["files_per_sec"]),
+        file=sys.stderr)
+    return 0 if summary["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Vectorized environment of the Hoshizukuri for reinforcement learning.
+"""
+from typing import List
+from .hoshizukuri_game import HoshizukuriGame
+from .models.game import Game
+from .models.player import Player
+from .models.turn import Phase
+from .utils.action_util import ActionSpace
+from .utils.observation_util import ObservationEncoder
+import numpy as np
+
+
+class VecHoshizukuriEnv:
+    """
+    Batch of games which are stepped at once.
+
+    An action is an action of action_space.
+    A multiset choice takes some steps, one for each card and one for
+    fixing it, and the game doesn't advance until it is fixed.
+    Finished games are reset automatically, and the returned
+    observations are of the new games then.
+    When no candidate can be encoded, the first candidate is chosen
+    and it is reported as "forced" of the info.
+
+    Args:
+        num_envs (int): the number of games.
+        player_num (int, Optional): the number of players.
+        supply_ids (List[int], Optional): supplies are chosen from these.
+        seed (int, Optional): seed of the first game.
+            Each new game uses the next seed.
+        action_space (ActionSpace, Optional): action space.
+            Default is ActionSpace() whose limits are the number of
+            cards which a player can have.
+        max_turn (int, Optional): games are stopped at this turn.
+
+    Attributes:
+        games (List[Game]): now games.
+        candidates (List[List[str]]): candidates of each game
+            without "#player_id".
+        actions (List[List[int]]): action of each candidate.
+        selected (List[List[int]]): card IDs which are already selected
+            for the multiset choice of each game.
+        forced (List[List[str]]): choices which were chosen automatically
+            in the last reset or step of each game.
+        player_ids (np.ndarray): player ID who chooses next in each game.
+        encoder (ObservationEncoder): encoder of observations.
+        observation_size (int): the size of an observation.
+    """
+    def __init__(
+            self, num_envs: int, player_num: int = 2,
+            supply_ids: List[int] = None, seed: int = 0,
+            action_space: ActionSpace = None, max_turn: int = 100):
+        self.num_envs = num_envs
+        self.player_num = player_num
+        self.supply_ids = supply_ids
+        if supply_ids is None:
+            self.supply_ids = list(range(6, 26))
+        self.action_space = action_space
+        if action_space is None:
+            max_cards = self._get_max_card_count()
+            self.action_space = ActionSpace(
+                max_orbit=max_cards, max_slot=max_cards)
+        self.max_turn = max_turn
+        self.simulator = HoshizukuriGame()
+        self.encoder = ObservationEncoder(player_num)
+        self.observation_size = self.encoder.size
+        self._next_seed = seed
+        self.games: List[Game] = [None] * num_envs
+        self.candidates: List[List[str]] = [[] for _ in range(num_envs)]
+        self.actions: List[List[int]] = [[] for _ in range(num_envs)]
+        self.selected: List[List[int]] = [[] for _ in range(num_envs)]
+        self.forced: List[List[str]] = [[] for _ in range(num_envs)]
+        self.player_ids = np.zeros(num_envs, dtype=np.int64)
+        self._obs = np.zeros(
+            (num_envs, self.observation_size), dtype=np.float32)
+        self._masks = np.zeros(
+            (num_envs, self.action_space.size), dtype=bool)
+
+    def reset(self):
+        """
+        Start new games.
+
+        Returns:
+            np.ndarray, np.ndarray: observations (N, F)
+                and legal action masks (N, action_space.size).
+        """
+        for index in range(self.num_envs):
+            self.forced[index] = []
+            self._reset_game(index)
+        self._observe()
+        return self._obs.copy(), self._masks.copy()
+
+    def step(self, actions):
+        """
+        Take an action in each game.
+
+        Args:
+            actions (Sequence[int]): action of each game.
+
+        Returns:
+            np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[dict]:
+                observations (N, F), rewards (N, player_num),
+                done flags (N,), legal action masks (N, action_space.size)
+                and infos.
+
+        Note:
+            - Rewards are 1 for the winners and -1 for the others
+              when a game finishes, and 0 otherwise.
+            - The info of a finished game has "result" (game.result)
+              and "truncated" (True when stopped by max_turn).
+            - The info has "forced" (List[str]) when some choices
+              couldn't be encoded and were chosen automatically.
+        """
+        rewards = np.zeros((self.num_envs, self.player_num), dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [{} for _ in range(self.num_envs)]
+        for index, action in enumerate(actions):
+            game = self.games[index]
+            assert action in self.actions[index]
+            self.forced[index] = []
+            card_id = self.action_space.get_added_card_id(action)
+            if card_id is not None:
+                self.selected[index].append(card_id)
+                self._set_actions(index)
+                continue
+            choice = self.candidates[index][self.actions[index].index(action)]
+            self.selected[index] = []
+            if self._advance(index, choice):
+                self._report_forced(index, infos[index])
+                continue
+            dones[index] = True
+            infos[index]["result"] = game.result
+            infos[index]["truncated"] = game.phase != Phase.FINISH
+            for result in game.result:
+                rewards[index, result["player_id"]] = (
+                    1 if result["rank"] == 1 else -1)
+            self._reset_game(index)
+            self._report_forced(index, infos[index])
+        self._observe()
+        return (
+            self._obs.copy(), rewards, dones, self._masks.copy(), infos)
+
+    def _reset_game(self, index: int):
+        game = Game(self._next_seed)
+        self._next_seed += 1
+        game.set_players([Player(n) for n in range(self.player_num)])
+        game.set_supply(self.supply_ids)
+        game.set_initial_step()
+        self.games[index] = game
+        self.selected[index] = []
+        self._advance(index, "")
+
+    def _advance(self, index: int, choice: str):
+        """
+        Run the game until a decision which has encodable candidates.
+
+        Returns:
+            bool: False when the game finishes or reaches max_turn.
+        """
+        game = self.games[index]
+        while True:
+            if len(self.simulator.run_until_decision(game, choice)) == 0 or (
+                    game.turn.turn >= self.max_turn):
+                return False
+            # candidates of the pending step are Choice.
+            candidates = game.stack[-1].candidates
+            actions = self.action_space.encode_candidates(candidates)
+            if max(actions) >= 0:
+                break
+            choice = candidates[0]
+            self.forced[index].append(choice)
+        self.player_ids[index] = candidates[0].player_id
+        self.candidates[index] = list(candidates)
+        self._set_actions(index)
+        return True
+
+    def _set_actions(self, index: int):
+        actions = self.action_space.encode_candidates(
+            self.candidates[index], self.selected[index])
+        self.actions[index] = actions
+        mask = self._masks[index]
+        mask[:] = False
+        mask[[n for n in actions if n >= 0]] = True
+
+    def _get_max_card_count(self):
+        """
+        Get the max number of cards which a player can have.
+        This is the limit of field groups and triggers.
+        """
+        game = Game()
+        game.set_players([Player(n) for n in range(self.player_num)])
+        game.set_supply(self.supply_ids)
+        return len(game.start_deck) + sum(
+            pile.count for pile in game.supply.values())
+
+    def _report_forced(self, index: int, info: dict):
+        if len(self.forced[index]) > 0:
+            info["forced"] = self.forced[index]
+
+    def _observe(self):
+        self.encoder.encode_batch(
+            self.games, self._obs, self.candidates, self.selected)
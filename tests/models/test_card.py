@@ -15,3 +15,17 @@ class TestCard:
         assert card.starflake == 1
         assert card.create is False
         assert card.stop_orbit is False
+
+    def test_is_reset(self):
+        card = Card(1, 1)
+        assert card.is_reset()
+        card.stop_orbit = True
+        assert not card.is_reset()
+
+    def test_copy(self):
+        card = Card(1, 1)
+        card.starflake = 10
+        copy_card = card.copy()
+        assert copy_card is not card
+        assert str(copy_card) == "1-1"
+        assert copy_card.starflake == 10
@@ -2,7 +2,10 @@ from hoshizukuri_game.models.card_condition import (
     CardCondition,
     CardConditionOr,
     is_match_card,
-    get_match_card_ids
+    get_match_card_ids,
+    get_supply_match_counts,
+    compile_condition,
+    _compiled_conditions
 )
 from hoshizukuri_game.models.cost import Cost
 from hoshizukuri_game.utils.card_util import get_card_id, CardType, CardColor
@@ -249,3 +252,77 @@ class TestCardCondition:
             get_card_id("kori"),
             get_card_id("shinrin")
         ])
+
+    def test_get_match_card_ids8(self):
+        game = Game()
+        cond = CardConditionOr([
+            CardCondition(uniq_id=2), CardCondition(card_id=1)])
+        pile = Pile(PileType.LIST, card_list=[
+            Card(1, 1),
+            Card(3, 2),
+            Card(3, 3),
+            Card(1, 4)
+        ])
+        result = get_match_card_ids(pile, cond, game)
+        assert result == [1, 1, 3]
+
+    def test_get_supply_match_counts(self):
+        cond = CardConditionOr([
+            CardCondition(type=CardType.CELESTIAL),
+            CardCondition(le_cost=Cost(2))])
+        hoshikuzu = get_card_id("hoshikuzu")
+        kousei = get_card_id("kousei")
+        shinrin = get_card_id("shinrin")
+        eisei = get_card_id("eisei")
+        supply = {
+            shinrin: Pile(PileType.NUMBER, card_id_and_count=[shinrin, 10]),
+            kousei: Pile(PileType.NUMBER, card_id_and_count=[kousei, 10]),
+            hoshikuzu: Pile(PileType.NUMBER, card_id_and_count=[
+                hoshikuzu, 7]),
+            eisei: Pile(PileType.NUMBER, card_id_and_count=[eisei, 0]),
+        }
+        result = get_supply_match_counts(supply, cond)
+        assert list(result.items()) == [(hoshikuzu, 7), (shinrin, 10)]
+        assert get_match_card_ids(supply, cond, Game()) == sorted(
+            [hoshikuzu] * 7 + [shinrin] * 10)
+
+    def test_compile_condition(self):
+        game = Game()
+        conditions = [
+            CardCondition(),
+            CardCondition(type=CardType.CELESTIAL, le_cost=Cost(5)),
+            CardCondition(card_ids=[1, 4, 7], not_card_id=4),
+            CardCondition(eq_cost=Cost(2), create=False),
+            CardConditionOr([
+                CardCondition(color=CardColor.RED),
+                CardConditionOr([CardCondition(color=CardColor.BLUE)]),
+                CardCondition(uniq_id=3, card_id=7)]),
+            CardCondition(uniq_id=2),
+        ]
+        for condition in conditions:
+            compiled = compile_condition(condition)
+            for card_id in range(1, 26):
+                for uniq_id in [-1, 2, 3]:
+                    assert compiled.match(card_id, uniq_id) == is_match_card(
+                        Card(card_id, uniq_id), condition, game)
+
+    def test_compile_condition_cache(self):
+        compiled = compile_condition(CardConditionOr([
+            CardCondition(color=CardColor.RED, le_cost=Cost(3))]))
+        assert compile_condition(CardConditionOr([
+            CardCondition(color=CardColor.RED, le_cost=Cost(3))])) is compiled
+        assert compile_condition(CardConditionOr([
+            CardCondition(color=CardColor.RED, le_cost=Cost(4))
+        ])) is not compiled
+        condition = CardCondition(uniq_id=1)
+        assert compile_condition(condition) is not compile_condition(
+            condition)
+
+    def test_compile_condition_cache_size(self, monkeypatch):
+        monkeypatch.setattr(
+            "hoshizukuri_game.models.card_condition.COMPILED_CACHE_SIZE", 2)
+        _compiled_conditions.clear()
+        for cost in range(3):
+            compile_condition(CardCondition(le_cost=Cost(cost)))
+            assert len(_compiled_conditions) <= 2
+        assert len(_compiled_conditions) == 1
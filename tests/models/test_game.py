@@ -1,9 +1,15 @@
 from hoshizukuri_game.models.card import Card
 from hoshizukuri_game.models.game import Game
+from hoshizukuri_game.models import pile as pile_module
 from hoshizukuri_game.models.pile import Pile, PileName, PileType
 from hoshizukuri_game.models.player import Player
-from hoshizukuri_game.models.turn import Turn, TurnType
-from hoshizukuri_game.utils.card_util import get_card_id
+from hoshizukuri_game.models.turn import Phase, Turn, TurnType
+from hoshizukuri_game.utils.card_util import get_card_id, get_cost
+from hoshizukuri_game.hoshizukuri_game import HoshizukuriGame
+from hoshizukuri_game.steps.common.draw_step import DrawStep
+import copy
+import itertools
+import pickle
 import random
 
 
@@ -221,3 +227,254 @@ class TestGame:
         game.turn = Turn(5, 5, 0, TurnType.NORMAL)
         game.update_starflake()
         assert game.starflake == 4
+
+    def _play_random(self, simulator, game, count):
+        result = simulator.simulate(game)
+        for _ in range(count):
+            if len(result["candidates"]) <= 0:
+                break
+            choice = random.choice(result["candidates"]).split("#")[0]
+            result = simulator.simulate(game, choice)
+
+    def test_fork(self):
+        random.seed(0)
+        simulator = HoshizukuriGame()
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 26)])
+        game.set_initial_step()
+        self._play_random(simulator, game, 30)
+        status = game.get_status_json()
+        fork = game.fork()
+        deep = copy.deepcopy(game)
+        assert fork.get_status_json() == status
+        state = random.getstate()
+        self._play_random(simulator, fork, 30)
+        random.setstate(state)
+        self._play_random(simulator, deep, 30)
+        assert game.get_status_json() == status
+        assert fork.get_status_json() == deep.get_status_json()
+        assert fork.get_status_json() != status
+
+    def test_seed(self):
+        simulator = HoshizukuriGame()
+        results = []
+        for _ in range(2):
+            game = Game(7)
+            game.set_players([Player(0), Player(1)])
+            game.set_supply([n for n in range(6, 26)])
+            game.set_initial_step()
+            self._play_random_with_rng(simulator, game, 30)
+            results.append(game.get_status_json())
+        assert results[0] == results[1]
+
+    def test_fork_rng(self):
+        simulator = HoshizukuriGame()
+        game = Game(7)
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 26)])
+        game.set_initial_step()
+        self._play_random_with_rng(simulator, game, 10)
+        fork = game.fork()
+        assert fork.rng is not game.rng
+        self._play_random_with_rng(simulator, game, 30)
+        self._play_random_with_rng(simulator, fork, 30)
+        assert fork.get_status_json() == game.get_status_json()
+
+    def test_get_hash(self):
+        simulator = HoshizukuriGame()
+        game = Game(7)
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 26)])
+        game.set_initial_step()
+        self._play_random_with_rng(simulator, game, 10)
+        value = game.get_hash()
+        assert 0 <= value < 1 << 64
+        fork = game.fork()
+        assert fork.get_hash() == value
+        token = game.checkpoint()
+        self._play_random_with_rng(simulator, game, 10)
+        assert game.get_hash() != value
+        game.rollback(token)
+        assert game.get_hash() == value
+        hand = fork.players[0].pile[PileName.HAND]
+        card = hand.card_list[0]
+        fork.move_card(hand, fork.trash, uniq_ids=[card.uniq_id])
+        assert fork.get_hash() != value
+        fork.move_card(fork.trash, hand, uniq_ids=[card.uniq_id])
+        assert fork.get_hash() == value
+        fork.starflake += 1
+        assert fork.get_hash() != value
+
+    def test_get_hash_same_card_id(self):
+        games = []
+        for uniq_id in [1, 2]:
+            game = Game()
+            game.set_players([Player(0), Player(1)])
+            game.players[0].pile[PileName.HAND].push(Card(3, uniq_id))
+            games.append(game)
+        assert games[0].get_hash() == games[1].get_hash()
+        games[1].players[0].pile[PileName.HAND].push(Card(3, 5))
+        assert games[0].get_hash() != games[1].get_hash()
+
+    def test_get_hash_pending_step(self):
+        simulator = HoshizukuriGame()
+        game = Game(7)
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 26)])
+        game.set_initial_step()
+        self._play_random_with_rng(simulator, game, 10)
+        fork = game.fork()
+        assert fork.get_hash() == game.get_hash()
+        step = copy.copy(fork.stack[-1])
+        step.candidates = step.candidates[:1]
+        fork.stack[-1] = step
+        assert fork.get_status_json() == game.get_status_json()
+        assert fork.get_hash() != game.get_hash()
+        fork.stack[-1] = DrawStep(0, 0, 1)
+        assert fork.get_hash() != game.get_hash()
+
+    def test_get_hash_field_groups(self):
+        games = []
+        for groups in [[[1, 2], [4]], [[1], [2, 4]]]:
+            game = Game()
+            game.set_players([Player(0)])
+            game.players[0].pile[PileName.FIELD] = Pile(
+                PileType.LISTLIST, card_list=[
+                    [Card(card_id, card_id) for card_id in group]
+                    for group in groups])
+            games.append(game)
+        assert games[0].get_hash() != games[1].get_hash()
+
+    def test_get_affordable_supply_ids(self):
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 14)])
+        counts = game.get_supply_counts()
+        for starflake in range(0, 12):
+            assert game.get_affordable_supply_ids(starflake) == sorted([
+                card_id for card_id, pile in game.supply.items()
+                if get_cost(card_id, game).cost <= starflake])
+        assert len(game._affordable_supply_cache) == 12
+        eisei = get_card_id("eisei")
+        fork = game.fork()
+        assert eisei in fork.get_affordable_supply_ids(5)
+        for _ in range(2):
+            fork.supply[eisei].remove_at(0)
+        assert fork.get_supply_counts() != counts
+        assert game.get_supply_counts() == counts
+        assert eisei not in fork.get_affordable_supply_ids(5)
+        assert eisei in game.get_affordable_supply_ids(5)
+        assert len(game._affordable_supply_cache) == 13
+        # games which are pickled before the cache is added
+        del game.__dict__["_affordable_supply_cache"]
+        assert eisei in game.get_affordable_supply_ids(5)
+        assert len(game._affordable_supply_cache) == 1
+
+    def test_get_affordable_supply_ids_pickle(self, monkeypatch):
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 14)])
+        eisei = get_card_id("eisei")
+        assert eisei in game.get_affordable_supply_ids(5)
+        loaded = pickle.loads(pickle.dumps(game))
+        # versions of another process can be the same as old ones.
+        version = loaded.supply[eisei].version
+        monkeypatch.setattr(
+            pile_module, "_versions", itertools.count(version - 1))
+        for _ in range(2):
+            loaded.supply[eisei].remove_at(0)
+        assert eisei not in loaded.get_affordable_supply_ids(5)
+        assert eisei in game.get_affordable_supply_ids(5)
+
+    def test_fork_in_checkpoint(self):
+        for uniq_ids in [[2], [1, 2]]:
+            game = Game()
+            game.set_players([Player(0), Player(1)])
+            hand = game.players[0].pile[PileName.HAND]
+            hand.push(Card(3, 1))
+            hand.push(Card(4, 2))
+            token = game.checkpoint()
+            game.move_card(
+                hand, game.players[0].pile[PileName.DISCARD],
+                uniq_ids=uniq_ids)
+            fork = game.fork()
+            game.rollback(token)
+            hand.update_card(2, starflake=99)
+            discard = fork.players[0].pile[PileName.DISCARD]
+            assert discard.get_card(2).starflake != 99
+            discard.update_card(2, starflake=77)
+            assert hand.get_card(2).starflake == 99
+            fork.players[0].pile[PileName.DISCARD].reset_cards()
+            assert hand.get_card(2).starflake == 99
+
+    def _play_random_with_rng(self, simulator, game, count):
+        candidates = simulator.run_until_decision(game)
+        for _ in range(count):
+            if len(candidates) == 0:
+                break
+            choice = game.get_random().choice(candidates).split("#")[0]
+            candidates = simulator.run_until_decision(game, choice)
+
+    def _get_full_status(self, game):
+        return (
+            game.get_status_json(),
+            [str(n) for n in game.stack],
+            [n.id for n in game.triggers],
+            {k: v.value for k, v in game.variables.items()},
+            game.result, game.winner_id
+        )
+
+    def test_checkpoint_rollback(self):
+        random.seed(0)
+        simulator = HoshizukuriGame()
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 26)])
+        game.set_initial_step()
+        self._play_random(simulator, game, 30)
+        deep = copy.deepcopy(game)
+        token = game.checkpoint()
+        self._play_random(simulator, game, 20)
+        middle = self._get_full_status(game)
+        token2 = game.checkpoint()
+        self._play_random(simulator, game, 1000)
+        assert game.phase == Phase.FINISH
+        game.rollback(token2)
+        assert self._get_full_status(game) == middle
+        game.rollback(token)
+        assert self._get_full_status(game) == self._get_full_status(deep)
+        # rollback again after playing with another choices.
+        self._play_random(simulator, game, 50)
+        game.rollback(token)
+        assert self._get_full_status(game) == self._get_full_status(deep)
+        state = random.getstate()
+        self._play_random(simulator, game, 1000)
+        random.setstate(state)
+        self._play_random(simulator, deep, 1000)
+        assert self._get_full_status(game) == self._get_full_status(deep)
+        game.release_journal()
+        assert game.journal is None
+        assert game.players[0].pile[PileName.HAND].journal is None
+
+    def test_commit(self):
+        random.seed(0)
+        simulator = HoshizukuriGame()
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(6, 26)])
+        game.set_initial_step()
+        self._play_random(simulator, game, 30)
+        deep = copy.deepcopy(game)
+        token = game.checkpoint()
+        self._play_random(simulator, game, 20)
+        token2 = game.checkpoint()
+        self._play_random(simulator, game, 20)
+        game.commit(token2)
+        assert len(game.journal.marks) == 1
+        game.rollback(token)
+        assert self._get_full_status(game) == self._get_full_status(deep)
+        self._play_random(simulator, game, 20)
+        game.commit(token)
+        assert game.journal is None
+        assert game.players[0].pile[PileName.HAND].journal is None
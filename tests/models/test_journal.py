@@ -0,0 +1,64 @@
+from hoshizukuri_game.models.journal import (
+    Journal, record_attributes, restore_attributes)
+
+
+class TestJournal:
+    def test_rollback(self):
+        journal = Journal()
+        values = []
+        token = journal.mark("first")
+        values.append(1)
+        journal.record(values.pop)
+        token2 = journal.mark("second")
+        values.append(2)
+        journal.record(values.pop)
+        assert journal.rollback(token2) == "second"
+        assert values == [1]
+        assert journal.rollback(token) == "first"
+        assert values == []
+        assert len(journal.marks) == 1
+        # token can be used again.
+        values.append(3)
+        journal.record(values.pop)
+        assert journal.rollback(token) == "first"
+        assert values == []
+
+    def test_commit(self):
+        journal = Journal()
+        values = []
+        token = journal.mark("first")
+        values.append(1)
+        journal.record(values.pop)
+        token2 = journal.mark("second")
+        values.append(2)
+        journal.record(values.pop)
+        journal.commit(token2)
+        assert len(journal.marks) == 1
+        assert len(journal.records) == 2
+        assert journal.rollback(token) == "first"
+        assert values == []
+        values.append(3)
+        journal.record(values.pop)
+        journal.commit(token)
+        assert journal.marks == []
+        assert journal.records == []
+        assert values == [3]
+
+    def test_record_attributes(self):
+        class A:
+            pass
+        a = A()
+        a.x = 1
+        a.z = [4]
+        journal = Journal()
+        attributes = dict(a.__dict__)
+        record_attributes(journal, a, attributes)
+        assert journal.records == []
+        a.x = 2
+        a.y = 3
+        record_attributes(journal, a, attributes)
+        assert journal.records == [
+            (restore_attributes, (a, {"x": 1}, ["y"]))]
+        undo, args = journal.records.pop()
+        undo(*args)
+        assert a.__dict__ == {"x": 1, "z": [4]}
@@ -1,7 +1,7 @@
 from hoshizukuri_game.models.limit import (
     Limit, LimitOr, LimitTriggerActivate,
     is_match_limit,
-    TargetLimit, LimitForever
+    TargetLimit, LimitForever, LimitTurn
 )
 import pytest
 
@@ -33,6 +33,10 @@ class TestLimit():
         limit = LimitForever()
         assert str(limit) == "limit:forever"
 
+    def test_limit_turn(self):
+        limit = LimitTurn()
+        assert str(limit) == "limit:turn"
+
 
 class TestIsMatchLimit():
     def test_match_1(self):
@@ -60,6 +64,12 @@ class TestIsMatchLimit():
         b = LimitForever()
         assert not is_match_limit(a, b)
 
+    def test_match_turn(self):
+        a = TargetLimit(LimitTurn)
+        assert is_match_limit(a, LimitTurn())
+        assert not is_match_limit(a, LimitForever())
+        assert is_match_limit(a, LimitOr([LimitForever(), LimitTurn()]))
+
     def test_match_error(self):
         a = TargetLimit(int)
         b = 15
@@ -181,6 +181,29 @@ class TestLogFormatter():
                 "Invalid gains a invalid card into their hand."
             ])
 
+    def test_make_log_name_with_space(self):
+        log_formatter = LogFormatter()
+        log_formatter.set_names(["A draws", "B"])
+        logs, _ = log_formatter._make_log([
+            "A draws discards 星屑 from their hand."
+        ])
+        assert str(logs[0]) == (
+            "0:DISCARD_FROM_HAND,player_id=0,card_ids=[1]")
+
+    def test_get_preds(self):
+        log_formatter = LogFormatter()
+        log_formatter.set_names(["A", "B"])
+        preds = log_formatter._get_preds("B discards 星屑 from their hand.")
+        assert [n["command"] for n in preds] == [
+            Command.DISCARD_FROM_HAND,
+            Command.DISCARD_FROM_LOOK,
+            Command.DISCARD_FROM_PLAYAREA
+        ]
+        preds = log_formatter._get_preds("Turn - A.")
+        assert [n["command"] for n in preds] == [Command.TURN_START]
+        preds = log_formatter._get_preds("C draws 星屑.")
+        assert preds is log_formatter.preds
+
     def test_parse_log(self):
         log_formatter = LogFormatter()
         log_formatter.set_names(["A", "B"])
@@ -217,6 +240,21 @@ class TestLogFormatter():
         assert len(logs) == 3
         assert str(logs[0]) == "0:START_WITH,player_id=0,card_ids=[1,1,1,1,1]"
 
+    def test_iter_format(self):
+        formatter = LogFormatter()
+        formatter.set_names(["A", "B"])
+        logs = formatter.iter_format(iter([
+            "Game GameId",
+            "A starts with 星屑, 星屑.",
+            "",
+            "Game over.",
+            "B starts with 星屑."
+        ]))
+        log = next(logs)
+        assert log.command == Command.START_WITH
+        assert log.line_n == 1
+        assert next(logs, None) is None
+
 
 class TestLogManager():
     def get_lines(self):
@@ -513,6 +551,36 @@ class TestLogManager():
             "Not found result of log."
         )
 
+    def test_read_log_stream(self):
+        log_manager = LogManager()
+        log_manager.read_log("tests/test_log/test_1.txt", stream=True)
+        assert log_manager.get_names() == ["エンケ", "ハレー"]
+        assert log_manager.get_supplies() == [
+            3, 4, 5, 6, 12, 13, 15, 17, 18, 19, 25]
+        assert len(log_manager._logs) == 0
+        assert log_manager.check_nextlog(
+            LogCondition(Command.START_WITH, player_id=1, depth=0), 3)
+        assert len(log_manager._logs) == 4
+        expected = LogManager()
+        expected.read_log("tests/test_log/test_1.txt")
+        logs = []
+        while log_manager.has_logs():
+            logs.append(str(log_manager.pop()))
+        assert logs == [str(n) for n in expected._logs]
+        assert log_manager._result == expected._result
+
+    def test_read_log_stream_fork(self):
+        log_manager = LogManager()
+        log_manager.read_log("tests/test_log/test_1.txt", stream=True)
+        log_manager.pop()
+        forked = log_manager.fork()
+        log = log_manager.pop()
+        assert str(forked.pop()) == str(log)
+        while forked.has_logs():
+            forked.pop()
+        assert log_manager.has_logs()
+        assert len(log_manager._result) == 2
+
     def test_reprocess(self):
         log_manager = LogManager()
         lines = log_manager._preprocess([
@@ -1,6 +1,7 @@
 from hoshizukuri_game.models.pile import (
     Pile, PileType
 )
+from hoshizukuri_game.models.journal import Journal
 from hoshizukuri_game.models.card import Card
 
 
@@ -355,3 +356,250 @@ class TestPile:
         pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(1, 2)])
         assert pile.get_card(2).id == 1
         assert pile.get_card(3) is None
+
+    def test_update_card(self):
+        pile = Pile(PileType.LISTLIST, card_list=[[Card(1, 1), Card(1, 2)]])
+        card = pile.update_card(2, starflake=5, stop_orbit=True)
+        assert card is pile.get_card(2)
+        assert card.starflake == 5
+        assert card.stop_orbit
+        assert pile.update_card(3, create=True) is None
+
+    def test_reset_cards(self):
+        card = Card(1, 1)
+        card.starflake = 5
+        pile = Pile(PileType.LIST, card_list=[card, Card(1, 2)])
+        pile.reset_cards()
+        assert card.starflake == 1
+
+    def test_fork_list(self):
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(1, 2)])
+        fork = pile.fork()
+        assert fork.card_list is pile.card_list
+        fork.remove_at(0)
+        fork.update_card(2, starflake=3)
+        assert str(pile) == "[1-1,1-2]"
+        assert str(fork) == "[1-2]"
+        assert pile.get_card(2).starflake == 1
+        assert fork.get_card(2).starflake == 3
+
+    def test_fork_listlist(self):
+        pile = Pile(PileType.LISTLIST, card_list=[[Card(1, 1)], [Card(2, 2)]])
+        fork = pile.fork()
+        pile.insert(Card(3, 3), 1, -1)
+        assert str(pile) == "[[1-1],[2-2,3-3]]"
+        assert str(fork) == "[[1-1],[2-2]]"
+        assert fork.count == 2
+
+    def test_fork_number(self):
+        pile = Pile(PileType.NUMBER, card_id_and_count=[8, 4])
+        fork = pile.fork()
+        fork.remove_at(0)
+        assert str(pile) == "{8:4}"
+        assert str(fork) == "{8:3}"
+
+    def test_version(self):
+        journal = Journal()
+        pile = Pile(PileType.NUMBER, card_id_and_count=[8, 4])
+        pile.journal = journal
+        version = pile.version
+        assert Pile(PileType.NUMBER, [8, 4]).version != version
+        fork = pile.fork()
+        assert fork.version == version
+        token = journal.mark(None)
+        pile.remove_at(0)
+        assert pile.version != version
+        assert fork.version == version
+        versions = [version, pile.version]
+        journal.rollback(token)
+        assert pile.count == 4
+        assert pile.version not in versions
+
+    def test_version_list(self):
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        versions = [pile.version]
+        pile.push(Card(3, 3))
+        versions.append(pile.version)
+        pile.remove_cards([1])
+        versions.append(pile.version)
+        pile.update_card(2, starflake=3)
+        versions.append(pile.version)
+        pile.set_cards([Card(4, 4)])
+        versions.append(pile.version)
+        assert len(set(versions)) == 5
+
+    def test_journal_list(self):
+        journal = Journal()
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.insert(Card(3, 3), 1)
+        pile.remove_at(0)
+        pile.update_card(2, starflake=5)
+        assert str(pile) == "[3-3,2-2]"
+        journal.rollback(token)
+        assert str(pile) == "[1-1,2-2]"
+        assert pile.count == 2
+        assert pile.get_card(2).starflake == Card(2, 2).starflake
+        assert len(journal.records) == 0
+
+    def test_journal_listlist(self):
+        journal = Journal()
+        pile = Pile(PileType.LISTLIST, card_list=[[Card(1, 1)], [Card(2, 2)]])
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.remove_at(0, 0)
+        pile.insert(Card(3, 3), 1, -1)
+        pile.update_card(2, stop_orbit=True)
+        pile.reset_cards()
+        assert str(pile) == "[[2-2],[3-3]]"
+        journal.rollback(token)
+        assert str(pile) == "[[1-1],[2-2]]"
+        assert pile.count == 2
+        assert not pile.get_card(2).stop_orbit
+
+    def test_journal_number(self):
+        journal = Journal()
+        pile = Pile(PileType.NUMBER, card_id_and_count=[8, 4])
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.remove_at(0)
+        pile.remove_at(0)
+        assert pile.count == 2
+        journal.rollback(token)
+        assert pile.count == 4
+
+    def test_journal_fork(self):
+        journal = Journal()
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1)])
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.push(Card(2, 2))
+        fork = pile.fork()
+        assert fork.journal is None
+        journal.rollback(token)
+        assert str(pile) == "[1-1]"
+        assert str(fork) == "[1-1,2-2]"
+
+    def test_position(self):
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        assert pile.position(2) == (1, None)
+        assert pile.position(3) == (-1, None)
+        pile = Pile(PileType.LISTLIST, card_list=[
+            [Card(1, 1)], [Card(2, 2), Card(3, 3)]])
+        assert pile.position(3) == (1, 1)
+        assert pile.position(4) == (-1, None)
+        pile = Pile(PileType.NUMBER, card_id_and_count=[8, 4])
+        assert pile.position(1) == (-1, None)
+
+    def test_remove_cards_list(self):
+        pile = Pile(PileType.LIST, card_list=[
+            Card(1, 1), Card(2, 2), Card(3, 3), Card(4, 4)])
+        cards = pile.remove_cards([3, 1])
+        assert [str(n) for n in cards] == ["3-3", "1-1"]
+        assert str(pile) == "[2-2,4-4]"
+        assert pile.count == 2
+        assert pile.get_card(1) is None
+        assert pile.index(uniq_id=4) == 1
+
+    def test_remove_cards_listlist(self):
+        pile = Pile(PileType.LISTLIST, card_list=[
+            [Card(1, 1)], [Card(2, 2), Card(3, 3)]])
+        cards = pile.remove_cards([3, 1])
+        assert [str(n) for n in cards] == ["3-3", "1-1"]
+        assert str(pile) == "[[2-2]]"
+        assert pile.count == 1
+
+    def test_journal_remove_cards(self):
+        journal = Journal()
+        pile = Pile(PileType.LIST, card_list=[
+            Card(1, 1), Card(2, 2), Card(3, 3), Card(4, 4)])
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.remove_cards([4, 2])
+        fork = pile.fork()
+        pile.push(Card(5, 5))
+        journal.rollback(token)
+        assert str(pile) == "[1-1,2-2,3-3,4-4]"
+        assert pile.index(uniq_id=4) == 3
+        assert str(fork) == "[1-1,3-3]"
+        pile.update_card(1, starflake=9)
+        assert fork.get_card(1).starflake != 9
+
+    def test_fork_get_card(self):
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1)])
+        fork = pile.fork()
+        fork.update_card(1, starflake=9)
+        assert fork.get_card(1).starflake == 9
+        assert pile.get_card(1).starflake != 9
+        assert fork.get_card(1) is fork.card_list[0]
+
+    def test_composition(self):
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        pile.push(Card(2, 3))
+        assert pile.get_count(2) == 2
+        assert pile.composition()[:4] == [0, 1, 2, 0]
+        pile.remove_cards([2, 1])
+        assert pile.composition()[:4] == [0, 0, 1, 0]
+        pile = Pile(PileType.LISTLIST, card_list=[[Card(1, 1)], [Card(2, 2)]])
+        pile.remove_at(0, 0)
+        assert pile.get_count(1) == 0
+        assert pile.get_count(2) == 1
+        pile = Pile(PileType.NUMBER, card_id_and_count=[8, 4])
+        assert pile.get_count(8) == 4
+        assert pile.get_count(7) == 0
+        assert pile.composition()[8] == 4
+        assert sum(pile.composition()) == 4
+
+    def test_composition_fork_journal(self):
+        journal = Journal()
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        pile.journal = journal
+        token = journal.mark(None)
+        fork = pile.fork()
+        pile.remove_cards([1])
+        pile.push(Card(3, 3))
+        assert pile.composition()[:4] == [0, 0, 1, 1]
+        assert fork.composition()[:4] == [0, 1, 1, 0]
+        journal.rollback(token)
+        assert pile.composition()[:4] == [0, 1, 1, 0]
+
+    def test_get_hash(self):
+        journal = Journal()
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        other = Pile(PileType.LIST, card_list=[Card(2, 5), Card(1, 6)])
+        assert pile.get_hash() == other.get_hash()
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.push(Card(3, 3))
+        assert pile.get_hash() != other.get_hash()
+        pile.remove_cards([3])
+        assert pile.get_hash() == other.get_hash()
+        pile.remove_at(0)
+        journal.rollback(token)
+        assert pile.get_hash() == other.get_hash()
+        pile = Pile(PileType.LISTLIST, card_list=[[Card(1, 1)], [Card(2, 2)]])
+        assert pile.get_hash() == other.get_hash()
+        pile = Pile(PileType.NUMBER, card_id_and_count=[8, 4])
+        hash_4 = pile.get_hash()
+        pile.remove_at(0)
+        assert pile.get_hash() != hash_4
+        pile.push(Card(8, 9))
+        assert pile.get_hash() == hash_4
+
+    def test_set_cards(self):
+        journal = Journal()
+        pile = Pile(PileType.LIST, card_list=[Card(1, 1), Card(2, 2)])
+        other = Pile(PileType.LIST, card_list=[Card(3, 3)])
+        pile.journal = journal
+        token = journal.mark(None)
+        pile.set_cards(other.card_list)
+        assert pile.count == 1
+        assert pile.get_count(3) == 1
+        assert pile.get_count(1) == 0
+        assert pile.get_hash() == other.get_hash()
+        pile.update_card(3, starflake=9)
+        assert other.get_card(3).starflake != 9
+        journal.rollback(token)
+        assert [str(n) for n in pile.card_list] == ["1-1", "2-2"]
+        assert pile.get_count(1) == 1
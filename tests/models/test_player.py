@@ -81,3 +81,28 @@ class TestPlayer:
             ]
         )
         assert player.get_own_card_ids() == [1, 1, 3, 4]
+
+    def test_composition(self):
+        player = Player(0)
+        player.pile[PileName.HAND] = Pile(
+            PileType.LIST, card_list=[Card(1, 1), Card(3, 2)]
+        )
+        player.pile[PileName.FIELD] = Pile(
+            PileType.LISTLIST, card_list=[
+                [Card(3, 3), Card(4, 4)]
+            ]
+        )
+        assert player.composition()[:5] == [0, 1, 0, 2, 1]
+
+    def test_fork(self):
+        player = Player(0)
+        player.pile[PileName.HAND] = Pile(
+            PileType.LIST, card_list=[Card(1, 1), Card(1, 2)]
+        )
+        player.orbit = 3
+        fork = player.fork()
+        fork.orbit = 5
+        fork.pile[PileName.HAND].remove_at(0)
+        assert player.orbit == 3
+        assert str(player.pile[PileName.HAND]) == "[1-1,1-2]"
+        assert str(fork.pile[PileName.HAND]) == "[1-2]"
@@ -2,11 +2,13 @@ from hoshizukuri_game.models.game import Game
 from hoshizukuri_game.models.player import Player
 from hoshizukuri_game.models.trigger import (
     Trigger,
+    TriggerRegistry,
     _get_called_triggers_with_activate,
     get_called_triggers,
     remove_triggers,
 )
 from hoshizukuri_game.models.limit import (
+    LimitForever,
     LimitOr,
     LimitTriggerActivate,
     TargetLimit,
@@ -28,7 +30,9 @@ class TestTrigger:
             step=step,
             can_pass=False
         )
-        assert trigger.limit.trigger_id == trigger.id
+        assert trigger.id is None
+        trigger.set_id(3)
+        assert trigger.limit.trigger_id == trigger.id == 3
 
     def test_trigger_2(self):
         step = AbstractStep()
@@ -37,9 +41,22 @@ class TestTrigger:
             activate=ActivatePlaysetEnd(
                 player_id=0),
             step=step,
-            can_pass=False
+            can_pass=False, trigger_id=3
         )
-        assert trigger.limit.limits[0].trigger_id == trigger.id
+        assert trigger.limit.limits[0].trigger_id == trigger.id == 3
+
+    def test_game_id(self):
+        game = Game()
+        triggers = [
+            Trigger(LimitTriggerActivate(None), ActivatePlaysetEnd(0),
+                    AbstractStep()) for _ in range(3)]
+        game.triggers = triggers[:2]
+        game.add_trigger(triggers[2])
+        assert [n.id for n in triggers] == [1, 2, 3]
+        assert [n.limit.trigger_id for n in triggers] == [1, 2, 3]
+        assert AbstractStep().get_step_id(game) == 4
+        forked = game.fork()
+        assert forked.make_object_id() == game.make_object_id() == 5
 
     def test_error(self):
         with pytest.raises(Exception):
@@ -155,3 +172,67 @@ class TestRemoveTriggers:
         remove_triggers(game, target_limit)
         assert len(game.triggers) == 1
         assert game.triggers[0].id == trigger_2.id
+
+
+class TestTriggerRegistry:
+    def get_triggers(self):
+        step = AbstractStep()
+        return [
+            Trigger(
+                LimitTriggerActivate(None), ActivatePlaysetEnd(1), step,
+                trigger_id=1),
+            Trigger(
+                LimitForever(), ActivatePlaysetEnd(None), step,
+                trigger_id=2),
+            Trigger(
+                LimitTriggerActivate(None), ActivatePlaysetEnd(0), step,
+                trigger_id=3),
+            Trigger(
+                LimitTriggerActivate(None), ActivatePlaysetEnd(1), step,
+                trigger_id=4)
+        ]
+
+    def test_list(self):
+        triggers = self.get_triggers()
+        registry = TriggerRegistry(triggers)
+        assert len(registry) == 4
+        assert registry == triggers
+        assert registry[2] is triggers[2]
+        assert triggers[1] in registry
+        registry.remove(triggers[1])
+        assert list(registry) == [triggers[0], triggers[2], triggers[3]]
+        with pytest.raises(ValueError):
+            registry.remove(triggers[1])
+        registry.append(triggers[1])
+        assert registry[-1] is triggers[1]
+
+    def test_find(self):
+        triggers = self.get_triggers()
+        registry = TriggerRegistry(triggers)
+        assert registry.find(TargetActivate(ActivatePlaysetEnd, 1)) == [
+            triggers[0], triggers[1], triggers[3]]
+        assert registry.find(TargetActivate(ActivatePlaysetEnd, 0)) == [
+            triggers[1], triggers[2]]
+        assert registry.find(TargetActivate(ActivatePlaysetEnd)) == [
+            triggers[1]]
+        registry.remove(triggers[1])
+        assert registry.find(TargetActivate(ActivatePlaysetEnd)) == []
+
+    def test_find_by_limit(self):
+        triggers = self.get_triggers()
+        triggers.append(Trigger(
+            LimitOr([LimitTriggerActivate(triggers[0].id)]),
+            ActivatePlaysetEnd(0), AbstractStep(), trigger_id=5))
+        registry = TriggerRegistry(triggers)
+        assert registry.find_by_limit(triggers[0].id) == [
+            triggers[0], triggers[4]]
+        assert registry.find_by_limit(triggers[1].id) == []
+
+    def test_copy(self):
+        triggers = self.get_triggers()
+        registry = TriggerRegistry(triggers)
+        copied = registry.copy()
+        registry.remove(triggers[0])
+        assert copied == triggers
+        assert copied.find(TargetActivate(ActivatePlaysetEnd, 1)) == [
+            triggers[0], triggers[1], triggers[3]]
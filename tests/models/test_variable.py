@@ -30,6 +30,12 @@ class TestVariable:
         variable.set_value(2)
         assert variable.value == [15, 2]
 
+    def test_set_value_set(self):
+        variable = Variable(LimitForever(), set)
+        variable.set_value((1, 2))
+        variable.set_value((1, 2))
+        assert variable.value == {(1, 2)}
+
     def test_set_value_2(self):
         variable = Variable(LimitForever(), int)
         variable.set_value(15)
@@ -110,3 +116,43 @@ class TestDeleteVariable:
         game.variables[VariableName.DONE_TRIGGER_LIST] = variable
         with pytest.raises(Exception):
             delete_variable(game, VariableName.DONE_TRIGGER_LIST, int, "1-5")
+
+
+class TestVariableRollback:
+    def test_1(self):
+        game = Game()
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, list,
+            LimitTriggerActivate("1234"), "1-5")
+        token = game.checkpoint()
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, list,
+            LimitTriggerActivate("1234"), "2-6")
+        delete_variable(game, VariableName.DONE_TRIGGER_LIST, list, "1-5")
+        assert get_variable(
+            game, VariableName.DONE_TRIGGER_LIST, list) == ["2-6"]
+        remove_variables(game, TargetLimit(
+            LimitTriggerActivate, trigger_id="1234"))
+        assert VariableName.DONE_TRIGGER_LIST not in game.variables
+        game.rollback(token)
+        assert get_variable(
+            game, VariableName.DONE_TRIGGER_LIST, list) == ["1-5"]
+
+    def test_set(self):
+        game = Game()
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set,
+            LimitForever(), (1, 5))
+        token = game.checkpoint()
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set,
+            LimitForever(), (1, 5))
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set,
+            LimitForever(), (2, 6))
+        delete_variable(game, VariableName.DONE_TRIGGER_LIST, set, (1, 5))
+        assert get_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set) == {(2, 6)}
+        game.rollback(token)
+        assert get_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set) == {(1, 5)}
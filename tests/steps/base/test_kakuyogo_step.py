@@ -1,3 +1,4 @@
+from itertools import combinations_with_replacement
 from hoshizukuri_game.steps.base.kakuyugo_step import (
     KakuyugoStep
 )
@@ -160,3 +161,20 @@ class TestKakuyugoStep():
         )
         next_steps = step.process(game)
         assert get_step_classes(next_steps) == []
+
+    def test_is_legal_choice(self):
+        step = KakuyugoStep(0, 0, 5)
+        pool = [1, 2, 6, 7, 10, 14, 17, 22, 25]
+        game = self.get_game([
+            Card(card_id, n) for n, card_id in enumerate(
+                [1, 2, 6, 10, 10, 14, 17, 22])
+        ], [[Card(get_card_id("kakuyugo"), 20)]])
+        candidates = step._create_candidates(game)
+        choices = ["0:kakuyugotrash:", "1:kakuyugotrash:1"]
+        for count in range(1, 6):
+            for card_ids in combinations_with_replacement(pool, count):
+                choices.append("0:kakuyugotrash:%s" % ",".join(
+                    [str(n) for n in card_ids]))
+        for choice in choices:
+            assert step._is_legal_choice(game, choice) == (
+                choice in candidates), choice
@@ -17,6 +17,7 @@ from hoshizukuri_game.steps.common.card_move_step import (
     get_pile
 )
 from hoshizukuri_game.steps.common.shuffle_step import ReshuffleStep
+from hoshizukuri_game.steps.common import card_move_step
 import pytest
 
 
@@ -553,3 +554,24 @@ class TestSelectProcess():
                 log="A discards 岩石 from their hand.", count=1,
                 expected_next_steps=[],
                 make_log_manager=make_log_manager)
+
+    def test_select_process_log_without_candidates(
+            self, get_step_classes, make_log_manager, monkeypatch):
+        def _iter_combinations(*args, **kwargs):
+            raise AssertionError("candidates are made.")
+        monkeypatch.setattr(
+            card_move_step, "iter_combinations", _iter_combinations)
+        self.check(
+            get_step_classes, 0, [Card(1, 1), Card(4, 2), Card(4, 3)],
+            log="A discards 惑星 from their hand.", count=2, can_less=True,
+            expected_next_steps=[PlayStep],
+            expected_card_ids=[4],
+            make_log_manager=make_log_manager)
+
+    def test_select_process_log_without_candidates_invalid(
+            self, get_step_classes, make_log_manager):
+        self.check(
+            get_step_classes, 0, [Card(1, 1), Card(4, 2), Card(4, 3)],
+            log="A discards 岩石 from their hand.", count=2, can_less=True,
+            expected_next_steps=[],
+            make_log_manager=make_log_manager)
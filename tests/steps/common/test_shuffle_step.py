@@ -1,9 +1,11 @@
+from fractions import Fraction
 import random
 from hoshizukuri_game.models.card import Card
 from hoshizukuri_game.models.pile import Pile, PileName, PileType
 from hoshizukuri_game.models.player import Player
 from hoshizukuri_game.steps.common.shuffle_step import (
     ReshuffleStep,
+    get_prefix_outcomes,
 )
 from hoshizukuri_game.models.game import Game
 from hoshizukuri_game.models.log import InvalidLogException
@@ -78,3 +80,86 @@ class TestReshuffleStep():
         )
         with pytest.raises(InvalidLogException):
             step.process(game)
+
+    def _make_chance_game(self):
+        game = Game()
+        game.chance = True
+        game.set_players([Player(0)])
+        game.players[0].pile[PileName.DISCARD] = Pile(
+            PileType.LIST, card_list=[
+                Card(1, 1), Card(1, 2), Card(4, 3)
+            ]
+        )
+        return game
+
+    def test_process_chance(self):
+        random.seed(0)
+        step = ReshuffleStep(0, 0, 1)
+        game = self._make_chance_game()
+        assert step.process(game) == [step]
+        assert step.get_candidates(game) == ["0:chance:#0"]
+        assert step.card_ids == [1, 1, 4]
+        assert step.draw_count == 1
+        assert game.players[0].pile[PileName.DECK].count == 0
+        game.choice = "0:chance:4,1"
+        assert step.process(game) == []
+        assert game.choice == ""
+        assert step.candidates == []
+        deck = game.players[0].pile[PileName.DECK]
+        assert [n.id for n in deck.card_list] == [4, 1, 1]
+        assert game.players[0].pile[PileName.DISCARD].count == 0
+
+    def test_process_chance_sample(self):
+        step = ReshuffleStep(0, 0)
+        game = self._make_chance_game()
+        game.choice = "0:chance:"
+        assert step.process(game) == [step]
+        assert step.process(game) == []
+        assert game.players[0].pile[PileName.DECK].count == 3
+
+    def test_process_chance_invalid(self):
+        step = ReshuffleStep(0, 0)
+        game = self._make_chance_game()
+        step.process(game)
+        game.choice = "0:chance:5"
+        with pytest.raises(ValueError):
+            step.process(game)
+
+    def test_get_chance_outcomes(self):
+        step = ReshuffleStep(0, 0, 2)
+        game = self._make_chance_game()
+        outcomes = dict(step.get_chance_outcomes(game))
+        assert outcomes == {
+            "0:chance:1,1": Fraction(1, 3),
+            "0:chance:1,4": Fraction(1, 3),
+            "0:chance:4,1": Fraction(1, 3),
+        }
+        outcomes = dict(step.get_chance_outcomes(game, ordered=False))
+        assert outcomes == {
+            "0:chance:1,1": Fraction(1, 3),
+            "0:chance:1,4": Fraction(2, 3),
+        }
+        step = ReshuffleStep(0, 0)
+        assert step.get_chance_outcomes(game) == [
+            ("0:chance:", Fraction(1))]
+        assert step.get_chance_outcomes(game, ordered=False) == [
+            ("0:chance:", Fraction(1))]
+
+
+class TestGetPrefixOutcomes():
+    def test_ordered(self):
+        outcomes = get_prefix_outcomes([1, 1, 2, 3], 2)
+        assert len(outcomes) == 7
+        assert dict(outcomes)[(1, 1)] == Fraction(1, 6)
+        assert dict(outcomes)[(2, 3)] == Fraction(1, 12)
+        assert sum(p for _, p in outcomes) == 1
+
+    def test_multiset(self):
+        outcomes = get_prefix_outcomes([1, 1, 2, 3], 2, ordered=False)
+        assert dict(outcomes) == {
+            (1, 1): Fraction(1, 6), (1, 2): Fraction(1, 3),
+            (1, 3): Fraction(1, 3), (2, 3): Fraction(1, 6)}
+
+    def test_count_over(self):
+        assert get_prefix_outcomes([1, 1], 5) == [((1, 1), Fraction(1))]
+        assert get_prefix_outcomes([], 2) == [((), Fraction(1))]
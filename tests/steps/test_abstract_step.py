@@ -8,6 +8,26 @@ class TestAbstractStep:
         step = AbstractStep()
         assert str(step) == "0:abstract"
 
+    def test_step_id(self):
+        game = Game()
+        step_1 = AbstractStep()
+        step_2 = AbstractStep()
+        assert step_1.step_id is None
+        assert step_2.get_step_id(game) == 1
+        assert step_1.get_step_id(game) == 2
+        assert step_2.get_step_id(game) == 1
+
+    def test_step_id_rollback(self):
+        game = Game()
+        step_1 = AbstractStep()
+        step_2 = AbstractStep()
+        token = game.checkpoint()
+        assert step_1.get_step_id(game) == 1
+        game.rollback(token)
+        assert step_1.step_id is None
+        assert step_2.get_step_id(game) == 1
+        assert step_1.get_step_id(game) == 2
+
     def test_process(self):
         step = AbstractStep()
         game = Game()
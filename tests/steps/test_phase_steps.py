@@ -19,12 +19,17 @@ from hoshizukuri_game.steps.phase_steps import (
     CleanupDiscardHandStep,
     UpdateTurnStep,
     PlaysetEndStep,
+    get_playset_cache_info,
+    clear_playset_cache,
 )
 from hoshizukuri_game.models.turn import Phase, Turn, TurnType
 from hoshizukuri_game.models.game import Game
 from hoshizukuri_game.models.player import Player
 from hoshizukuri_game.utils.card_util import get_card_id
 from hoshizukuri_game.models.log import InvalidLogException
+from hoshizukuri_game.models.limit import LimitForever, LimitTurn
+from hoshizukuri_game.models.variable import VariableName, set_variable
+from itertools import combinations_with_replacement
 import pytest
 
 
@@ -268,6 +273,67 @@ class TestPlaySelectStep:
         with pytest.raises(InvalidLogException):
             step.process(game)
 
+    def test_process_log_without_candidates(
+            self, get_step_classes, make_log_manager, monkeypatch):
+        step = PlaySelectStep(0)
+        game = self.get_game([
+            Card(get_card_id("honow"), 0),
+            Card(get_card_id("funka"), 1),
+            Card(get_card_id("hoshikuzu"), 2),
+        ])
+        game.log_manager = make_log_manager(
+            "A plays 炎."
+        )
+
+        def _create_candidates(game):
+            raise AssertionError("candidates are made.")
+        monkeypatch.setattr(step, "_create_candidates", _create_candidates)
+        next_steps = step.process(game)
+        assert get_step_classes(next_steps) == [
+            PlayCardSelectStep,
+            PlayStep
+        ]
+
+    def test_create_candidates_cache(self):
+        clear_playset_cache()
+        step = PlaySelectStep(0)
+        game = self.get_game([Card(6, 0), Card(1, 1), Card(14, 2)])
+        candidates = step._create_candidates(game)
+        info = get_playset_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (0, 1, 1)
+        game = self.get_game([Card(14, 3), Card(6, 4), Card(1, 5)])
+        assert step._create_candidates(game) == candidates
+        info = get_playset_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        candidates.append("0:playset:")
+        assert "0:playset:" not in step._create_candidates(game)
+        game.players[1].pile[PileName.HAND] = game.players[0].pile[
+            PileName.HAND]
+        assert PlaySelectStep(1)._create_candidates(game) == [
+            "1" + n[1:] for n in candidates[:-1]]
+        info = get_playset_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+        clear_playset_cache()
+        assert get_playset_cache_info().currsize == 0
+
+    def test_is_legal_choice(self):
+        step = PlaySelectStep(0)
+        pool = [1, 2, 6, 7, 10, 14, 17, 22, 25]
+        game = self.get_game([
+            Card(card_id, n) for n, card_id in enumerate(
+                [1, 1, 2, 6, 10, 10, 14, 17, 22])
+        ])
+        candidates = step._create_candidates(game)
+        choices = []
+        for count in range(1, 5):
+            for card_ids in combinations_with_replacement(pool, count):
+                choices.append("0:playset:%s" % ",".join(
+                    [str(n) for n in card_ids]))
+        choices += ["1:playset:1", "0:playset:", "0:playset:6,1"]
+        for choice in choices:
+            assert step._is_legal_choice(game, choice) == (
+                choice in candidates), choice
+
 
 class TestPlayCardSelectStep:
     def test_str(self):
@@ -689,6 +755,20 @@ class TestGenerateSelectStep:
         ]
         assert game.phase == Phase.GENERATE
 
+    def test_is_legal_choice(self):
+        step = GenerateSelectStep(0)
+        game = self.get_game()
+        game.set_supply([n for n in range(8, 17)])
+        game.supply[9] = Pile(PileType.NUMBER, [9, 0])
+        choices = ["0:generate:%d" % n for n in range(26)] + [
+            "0:generate:", "1:generate:8", "0:generate:x"]
+        for starflake in range(0, 12):
+            game.starflake = starflake
+            candidates = step._create_candidates(game)
+            for choice in choices:
+                assert step._is_legal_choice(game, choice) == (
+                    choice in candidates), choice
+
 
 class TestCleanupStep:
     def test_str(self):
@@ -805,6 +885,20 @@ class TestUpdateTurnStep:
         next_steps[0].player_id == 0
         assert game.phase == Phase.TURN_END
 
+    def test_process_clear_turn_variables(self):
+        step = UpdateTurnStep(0)
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([])
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set, LimitTurn(), (1, 2))
+        step.process(game)
+        assert VariableName.DONE_TRIGGER_LIST not in game.variables
+        set_variable(
+            game, VariableName.DONE_TRIGGER_LIST, set, LimitForever(), (1, 2))
+        step.process(game)
+        assert VariableName.DONE_TRIGGER_LIST in game.variables
+
     def test_process_2(self, get_step_classes, is_equal_candidates):
         step = UpdateTurnStep(0)
         game = Game()
@@ -1,5 +1,6 @@
-from hoshizukuri_game.hoshizukuri_game import HoshizukuriGame
+from hoshizukuri_game.hoshizukuri_game import HoshizukuriGame, Trace
 from hoshizukuri_game.models.game import Game
+from hoshizukuri_game.models.pile import PileName
 from hoshizukuri_game.models.player import Player
 from hoshizukuri_game.steps.abstract_step import AbstractStep
 import random
@@ -48,6 +49,57 @@ class TestHoshizukuriGame:
             "0:abstract"
         ]
 
+    def test_simulate_trace(self):
+        simulator = HoshizukuriGame()
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(8, 17)])
+        game.set_initial_step()
+        result = simulator.simulate(game.fork(), trace=Trace.NAME)
+        assert result["steps"][:3] == [
+            "PrepareFirstDeckStep", "ReshuffleStep", "DrawStep"]
+        result = simulator.simulate(game.fork(), trace=Trace.OFF)
+        assert result["steps"] == []
+        assert len(result["candidates"]) > 0
+
+    def test_run_until_decision(self):
+        random.seed(0)
+        simulator = HoshizukuriGame()
+        game = Game()
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(8, 17)])
+        game.set_initial_step()
+        fork = game.fork()
+        random.seed(1)
+        candidates = simulator.run_until_decision(game)
+        random.seed(1)
+        assert candidates == simulator.simulate(fork)["candidates"]
+        choice = candidates[0].split("#")[0]
+        random.seed(2)
+        candidates = simulator.run_until_decision(game, choice)
+        random.seed(2)
+        assert candidates == simulator.simulate(fork, choice)["candidates"]
+        assert game.get_status_json() == fork.get_status_json()
+
+    def test_chance(self):
+        simulator = HoshizukuriGame()
+        game = Game(0)
+        game.chance = True
+        game.set_players([Player(0), Player(1)])
+        game.set_supply([n for n in range(8, 17)])
+        game.set_initial_step()
+        candidates = simulator.run_until_decision(game)
+        assert candidates == ["0:chance:#0"]
+        outcomes = game.stack[-1].get_chance_outcomes(game, ordered=False)
+        assert len(outcomes) == 7
+        assert sum(p for _, p in outcomes) == 1
+        candidates = simulator.run_until_decision(game, "0:chance:3,3,3,1")
+        assert candidates == ["1:chance:#1"]
+        hand = game.players[0].pile[PileName.HAND]
+        assert [n.id for n in hand.card_list] == [3, 3, 3, 1]
+        candidates = simulator.run_until_decision(game, "1:chance:")
+        assert candidates[0].split(":")[1] == "playset"
+
 
 class TestSimulateSampleLogs():
     def test_simulate_log_1(self):
@@ -69,6 +121,23 @@ class TestSimulateSampleLogs():
             " (command=resolve_effect,player_id=1,depth=0)"
         )
 
+    def test_simulate_log_stream(self):
+        simulator = HoshizukuriGame()
+        filename = "tests/test_log/test_1.txt"
+        result = simulator.simulate_with_log(filename, stream=True)
+        assert result["message"] == "ok"
+        result = result["results"]
+        assert result[0]["game"].result[0]["point"] == 19
+
+    def test_simulate_log_error_1_stream(self):
+        simulator = HoshizukuriGame()
+        filename = "tests/test_log/error_1.txt"
+        result = simulator.simulate_with_log(filename, stream=True)
+        assert result["message"] == (
+            "Invalid Log Exception - line 48: ハレー draws 星屑."
+            " (command=resolve_effect,player_id=1,depth=0)"
+        )
+
     def test_simulate_log_error_2(self):
         simulator = HoshizukuriGame()
         filename = "tests/test_log/error_2.txt"
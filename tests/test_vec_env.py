@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+from hoshizukuri_game.vec_env import VecHoshizukuriEnv
+from hoshizukuri_game.models.turn import Phase
+from hoshizukuri_game.steps.abstract_step import AbstractStep
+from hoshizukuri_game.utils.choice_util import Choice
+
+
+class TestVecHoshizukuriEnv():
+    def test_reset(self):
+        env = VecHoshizukuriEnv(3, seed=10)
+        obs, masks = env.reset()
+        assert obs.shape == (3, env.observation_size)
+        assert obs.dtype == np.float32
+        assert masks.shape == (3, env.action_space.size)
+        for index in range(3):
+            assert list(np.flatnonzero(masks[index])) == sorted(
+                n for n in env.actions[index] if n >= 0)
+        assert list(env.player_ids) == [0, 0, 0]
+
+    def test_step(self):
+        env = VecHoshizukuriEnv(2, seed=0)
+        obs, masks = env.reset()
+        rng = np.random.default_rng(0)
+        finished = 0
+        for _ in range(400):
+            actions = [rng.choice(np.flatnonzero(m)) for m in masks]
+            obs, rewards, dones, masks, infos = env.step(actions)
+            assert masks.any(axis=1).all()
+            for index in np.flatnonzero(dones):
+                finished += 1
+                assert not infos[index]["truncated"]
+                assert sorted(rewards[index]) in ([-1, 1], [1, 1])
+                assert env.games[index].phase != Phase.FINISH
+            assert (rewards[~dones] == 0).all()
+        assert finished > 0
+
+    def test_max_turn(self):
+        env = VecHoshizukuriEnv(1, max_turn=2)
+        _, masks = env.reset()
+        for _ in range(100):
+            _, rewards, dones, masks, infos = env.step(
+                [np.flatnonzero(masks[0])[0]])
+            if dones[0]:
+                break
+        assert dones[0]
+        assert infos[0]["truncated"]
+        assert (rewards == 0).all()
+        assert env.games[0].turn.turn == 1
+
+    def test_invalid_action(self):
+        env = VecHoshizukuriEnv(1)
+        _, masks = env.reset()
+        with pytest.raises(AssertionError):
+            env.step([np.flatnonzero(~masks[0])[0]])
+
+    def test_multiset(self):
+        env = VecHoshizukuriEnv(1, seed=3)
+        _, masks = env.reset()
+        space = env.action_space
+        for _ in range(200):
+            added = [
+                n for n in np.flatnonzero(masks[0])
+                if space.get_added_card_id(n) is not None]
+            if len(added) > 0:
+                break
+            _, _, _, masks, _ = env.step([np.flatnonzero(masks[0])[0]])
+        candidates = list(env.candidates[0])
+        action = added[0]
+        obs, _, dones, masks, _ = env.step([action])
+        card_id = space.get_added_card_id(action)
+        assert not dones[0]
+        assert env.candidates[0] == candidates
+        assert env.selected[0] == [card_id]
+        assert obs[0, env.observation_size - env.encoder.card_id_size +
+                   card_id] == 1
+        assert list(np.flatnonzero(masks[0])) == sorted(
+            n for n in space.encode_candidates(candidates, [card_id])
+            if n >= 0)
+        while env.selected[0]:
+            _, _, _, masks, _ = env.step([np.flatnonzero(masks[0])[0]])
+        assert env.candidates[0] != candidates
+
+    def test_forced(self, monkeypatch):
+        env = VecHoshizukuriEnv(1)
+        _, masks = env.reset()
+        run_until_decision = env.simulator.run_until_decision
+        choices = []
+
+        def fake(game, choice=""):
+            choices.append(choice)
+            if len(choices) == 1:
+                step = AbstractStep()
+                step.candidates = [Choice(0, "unknown")]
+                game.stack.append(step)
+                return step.get_candidates(game)
+            game.stack.pop()
+            return run_until_decision(game, choices[0])
+        monkeypatch.setattr(env.simulator, "run_until_decision", fake)
+        while len(choices) == 0:
+            _, _, _, masks, infos = env.step([np.flatnonzero(masks[0])[0]])
+        assert choices[1] == "0:unknown:"
+        assert infos[0]["forced"] == ["0:unknown:"]
+        assert env.forced[0] == ["0:unknown:"]
+        monkeypatch.undo()
+        _, _, _, _, infos = env.step([np.flatnonzero(masks[0])[0]])
+        assert "forced" not in infos[0]
@@ -0,0 +1,114 @@
+import numpy as np
+from hoshizukuri_game.utils.action_util import ActionSpace
+from hoshizukuri_game.steps.abstract_step import AbstractStep
+from hoshizukuri_game.utils.choice_util import Choice
+
+
+class TestActionSpace:
+    def test_stable(self):
+        space = ActionSpace()
+        assert space.choices == ActionSpace().choices
+        assert space.size == len(space.choices)
+        assert len(set(space.choices)) == space.size
+
+    def test_encode_choice(self):
+        space = ActionSpace()
+        action = space.encode_choice("0:playset:6#0")
+        assert space.choices[action] == "playset:+6"
+        action = space.encode_choice("0:playset:6#0", [6])
+        assert space.choices[action] == "playset:"
+        action = space.encode_choice("1:generate:")
+        assert space.choices[action] == "generate:"
+        assert space.encode_choice("0:generate:7") == space.encode_choice(
+            "1:generate:7")
+        assert space.encode_choice("0:kakuyugotrash:1,6") >= 0
+        assert space.encode_choice("0:izumi:hand") >= 0
+        assert space.encode_choice("0:triggerselect:pass") >= 0
+        assert space.encode_choice("0:unknown:1") == -1
+        assert space.encode_choice("0:generate:7", [7]) == -1
+
+    def test_encode_multiset(self):
+        space = ActionSpace()
+        choice = "0:cleanupdiscard:2,1,1,1,1,1,1,1"
+        selected = []
+        while True:
+            action = space.encode_choice(choice, selected)
+            card_id = space.get_added_card_id(action)
+            if card_id is None:
+                break
+            selected.append(card_id)
+        assert selected == [1, 1, 1, 1, 1, 1, 1, 2]
+        assert space.choices[action] == "cleanupdiscard:"
+        assert space.encode_choice(choice, [2]) == -1
+
+    def test_encode_candidates_multiset(self):
+        space = ActionSpace()
+        candidates = [
+            "0:playset:1,1#0", "0:playset:1,2#0", "0:playset:1#0",
+            "0:playset:#0"]
+        actions = space.encode_candidates(candidates)
+        assert [space.choices[n] for n in actions] == [
+            "playset:+1", "playset:+1", "playset:+1", "playset:"]
+        actions = space.encode_candidates(candidates, [1])
+        assert [space.choices[n] for n in actions[:3]] == [
+            "playset:+1", "playset:+2", "playset:"]
+        assert actions[3] == -1
+        action = space.encode_choice("0:playset:1#0", [1])
+        assert space.decode_action(action, candidates, [1]) == "0:playset:1"
+        assert space.decode_action(actions[0], candidates, [1]) is None
+
+    def test_encode_candidates_slot(self):
+        space = ActionSpace(max_slot=2)
+        candidates = [
+            "0:triggerselect:a#0", "0:triggerselect:b#0",
+            "0:triggerselect:c#0", "0:triggerselect:pass#0"]
+        actions = space.encode_candidates(candidates)
+        assert [space.choices[n] for n in actions[:2]] == [
+            "triggerselect:#0", "triggerselect:#1"]
+        assert actions[2] == -1
+        assert space.choices[actions[3]] == "triggerselect:pass"
+
+    def test_decode_action(self):
+        space = ActionSpace()
+        candidates = ["0:triggerselect:a#0", "0:triggerselect:b#0"]
+        action = space.encode_candidates(candidates)[1]
+        assert space.decode_action(action, candidates) == (
+            "0:triggerselect:b")
+        candidates = ["1:generate:#1", "1:generate:7#1"]
+        action = space.encode_choice("1:generate:7")
+        assert space.decode_action(action, candidates) == "1:generate:7"
+
+    def test_get_mask(self):
+        space = ActionSpace()
+        candidates = ["0:generate:#0", "0:generate:7#0"]
+        mask = space.get_mask(candidates)
+        assert mask.shape == (space.size,)
+        assert list(np.flatnonzero(mask)) == sorted(
+            space.encode_candidates(candidates))
+        out = np.ones(space.size, dtype=bool)
+        assert space.get_mask(candidates, out) is out
+        assert out.sum() == 2
+
+    def test_step_candidate_mask(self):
+        space = ActionSpace()
+        step = AbstractStep()
+        step.candidates = ["0:izumi:hand", "0:izumi:discard"]
+        mask = step.get_candidate_mask(None, space)
+        assert mask[space.encode_choice("0:izumi:hand")]
+        assert mask.sum() == 2
+
+    def test_encode_choice_parts(self):
+        space = ActionSpace()
+        candidates = [
+            Choice(0, "playset", (2, 1)), Choice(0, "mizudiscard", (7,)),
+            Choice(0, "mizudiscard", ()), Choice(0, "arashiindex", 3),
+            Choice(0, "izumi", "hand")]
+        actions = space.encode_candidates(candidates)
+        assert [space.choices[n] for n in actions] == [
+            "playset:+1", "mizudiscard:7", "mizudiscard:",
+            "arashiindex:3", "izumi:hand"]
+        assert actions == space.encode_candidates(
+            ["%s#0" % n for n in candidates])
+        assert space.encode_choice(candidates[0], [1, 2]) == (
+            space.encode_choice("0:playset:", []))
+        assert space.decode_action(actions[3], candidates) is candidates[3]
@@ -15,12 +15,15 @@ from hoshizukuri_game.utils.card_util import (
     get_starflake,
     get_japanese_name,
     str2ids,
-    CardType, CardColor
+    get_card_table,
+    CardData,
+    CardType, CardColor, COLOR_BITS, TYPE_BITS
 )
 from hoshizukuri_game.models.game import Game
 from hoshizukuri_game.models.card import Card
 from hoshizukuri_game.models.pile import Pile, PileType
 from hoshizukuri_game.models.cost import Cost
+import os
 import pytest
 
 
@@ -59,6 +62,22 @@ class TestCardUtil:
         result = get_colors(get_card_id("honow"), game)
         assert result == [CardColor.RED]
 
+    def test_get_card_table(self):
+        table = get_card_table()
+        eisei = get_card_id("eisei")
+        assert table.type_bits[eisei] == (
+            TYPE_BITS[CardType.STAR] | TYPE_BITS[CardType.INITIAL])
+        assert table.color_bits[get_card_id("honow")] == COLOR_BITS[
+            CardColor.RED]
+        assert table.cost_values[eisei] == 2
+        assert table.costs[eisei] == Cost(2)
+        assert table.starflakes[2] == 2
+        assert table.vps[24] == 3
+        assert table.creates[eisei] is True
+        for card_id in range(1, 26):
+            assert table.colors[card_id] == get_colors(card_id)
+            assert table.types[card_id] == get_types(card_id)
+
     def test_id2uniqid_1(self):
         card_id = 8
         pile = Pile(PileType.LIST, card_list=[
@@ -208,3 +227,34 @@ class TestCardUtil:
 
     def test_str2ids_2(self):
         assert str2ids("1 星屑, 2 岩石") == [1, 2, 2]
+
+
+class TestCardData:
+    def test_preload(self):
+        assert CardData.preload() is CardData()
+
+    def test_cache(self, tmp_path, monkeypatch):
+        cache_filename = str(tmp_path / "carddata.pickle")
+        monkeypatch.setattr(CardData, "cache_filename", cache_filename)
+        cardinfo, name2iddic = CardData._load_carddata_with_cache()
+        assert os.path.exists(cache_filename)
+        assert name2iddic == CardData().name2iddic
+        assert cardinfo[3]["type"] == [CardType.STAR, CardType.INITIAL]
+
+        def not_called(*args):
+            raise Exception("YAML must not be parsed.")
+        monkeypatch.setattr(CardData, "_load_carddata", not_called)
+        cached_cardinfo, _ = CardData._load_carddata_with_cache()
+        assert cached_cardinfo[3]["cost"] == Cost(2)
+        assert cached_cardinfo.keys() == cardinfo.keys()
+
+    def test_cache_stale(self, tmp_path, monkeypatch):
+        cache_filename = str(tmp_path / "carddata.pickle")
+        monkeypatch.setattr(CardData, "cache_filename", cache_filename)
+        assert CardData._read_cache(CardData._get_digest()) is None
+        assert CardData.build_cache() == cache_filename
+        assert CardData._read_cache(CardData._get_digest()) is not None
+        assert CardData._read_cache("other digest") is None
+        with open(cache_filename, "wb") as file:
+            file.write(b"broken")
+        assert CardData._read_cache(CardData._get_digest()) is None
@@ -1,4 +1,7 @@
+import copy
+import pickle
 from hoshizukuri_game.utils.choice_util import (
+    Choice,
     cparseii,
     cparsei,
     cparsell,
@@ -88,3 +91,16 @@ class TestChoiceUtil:
                 "0:playset:6,7"
             ]
         )
+
+    def test_choice(self):
+        choice = Choice(1, "playset", (3, 5))
+        assert choice == "1:playset:3,5"
+        assert (choice.player_id, choice.command, choice.param) == (
+            1, "playset", (3, 5))
+        assert Choice(0, "generate") == "0:generate:"
+        assert Choice(0, "generate", 7) == "0:generate:7"
+        assert Choice(0, "cleanupdiscard", ()) == "0:cleanupdiscard:"
+        assert copy.deepcopy(choice) is choice
+        loaded = pickle.loads(pickle.dumps(choice))
+        assert loaded == choice
+        assert loaded.param == (3, 5)
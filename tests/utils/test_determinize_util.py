@@ -0,0 +1,104 @@
+import random
+from hoshizukuri_game.hoshizukuri_game import HoshizukuriGame
+from hoshizukuri_game.models.pile import PileName
+from hoshizukuri_game.utils.determinize_util import (
+    determinize,
+    sample_determinizations,
+)
+from hoshizukuri_game.utils.other_util import is_sub_multiset
+from hoshizukuri_game.utils.self_play import SelfPlayRunner
+
+
+def make_game(seed, choices):
+    simulator = HoshizukuriGame()
+    game = SelfPlayRunner().make_game(seed)
+    candidates = simulator.run_until_decision(game)
+    for _ in range(choices):
+        choice = game.get_random().choice(candidates).split("#")[0]
+        candidates = simulator.run_until_decision(game, choice)
+    return game
+
+
+def get_ids(pile):
+    return sorted(n.id for n in pile.card_list)
+
+
+class TestDeterminizeUtil:
+    def test_determinize(self):
+        game = make_game(1, 30)
+        status = game.get_status_json()
+        sample = determinize(game, 0, random.Random(0))
+        assert game.get_status_json() == status
+        assert sample.rng is not game.rng
+        me = game.players[0].pile
+        sample_me = sample.players[0].pile
+        assert [str(n) for n in sample_me[PileName.HAND].card_list] == [
+            str(n) for n in me[PileName.HAND].card_list]
+        assert get_ids(sample_me[PileName.DECK]) == get_ids(me[PileName.DECK])
+        opp = game.players[1].pile
+        sample_opp = sample.players[1].pile
+        assert sample_opp[PileName.HAND].count == opp[PileName.HAND].count
+        assert sample_opp[PileName.DECK].count == opp[PileName.DECK].count
+        assert sorted(
+            get_ids(sample_opp[PileName.HAND]) +
+            get_ids(sample_opp[PileName.DECK])) == sorted(
+            get_ids(opp[PileName.HAND]) + get_ids(opp[PileName.DECK]))
+        for pilename in [PileName.DISCARD, PileName.FIELD]:
+            assert sample_opp[pilename].get_hash() == opp[
+                pilename].get_hash()
+
+    def test_sample_determinizations(self):
+        game = make_game(2, 30)
+        samples = sample_determinizations(game, 1, 20, random.Random(0))
+        assert len(samples) == 20
+        assert len(set(n.get_hash() for n in samples)) > 1
+        hands = set(
+            tuple(get_ids(n.players[1].pile[PileName.HAND]))
+            for n in samples)
+        assert hands == {tuple(get_ids(game.players[1].pile[PileName.HAND]))}
+        again = sample_determinizations(game, 1, 20, random.Random(0))
+        assert [n.get_hash() for n in samples] == [
+            n.get_hash() for n in again]
+
+    def test_play_sample(self):
+        simulator = HoshizukuriGame()
+        game = make_game(3, 20)
+        status = game.get_status_json()
+        for sample in sample_determinizations(game, 0, 5, random.Random(0)):
+            candidates = simulator.run_until_decision(sample)
+            for _ in range(30):
+                if len(candidates) == 0:
+                    break
+                choice = sample.get_random().choice(
+                    candidates).split("#")[0]
+                candidates = simulator.run_until_decision(sample, choice)
+        assert game.get_status_json() == status
+
+    def test_opponent_candidates(self):
+        simulator = HoshizukuriGame()
+        game = make_game(4, 0)
+        candidates = simulator.run_until_decision(game)
+        while not candidates[0].startswith("1:playset:"):
+            choice = game.get_random().choice(candidates).split("#")[0]
+            candidates = simulator.run_until_decision(game, choice)
+        changed = False
+        for sample in sample_determinizations(game, 0, 20, random.Random(0)):
+            hand = sample.players[1].pile[PileName.HAND]
+            step = sample.stack[-1]
+            assert step is not game.stack[-1]
+            for candidate in step.get_candidates(sample):
+                card_ids = candidate.split("#")[0].split(":")[2]
+                card_ids = [int(n) for n in card_ids.split(",") if n != ""]
+                assert is_sub_multiset(card_ids, hand.composition())
+            changed |= step.candidates != game.stack[-1].candidates
+            choice = step.candidates[0].split("#")[0]
+            simulator.run_until_decision(sample, choice)
+        assert changed
+
+    def test_rng_not_changed(self):
+        game = make_game(5, 10)
+        state = game.rng.getstate()
+        first = [n.get_hash() for n in sample_determinizations(game, 0, 5)]
+        assert game.rng.getstate() == state
+        assert [n.get_hash() for n in sample_determinizations(
+            game, 0, 5)] == first
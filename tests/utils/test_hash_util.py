@@ -0,0 +1,60 @@
+from hoshizukuri_game.utils.card_util import get_card_table
+from hoshizukuri_game.utils.hash_util import (
+    TranspositionTable,
+    get_slot_keys,
+    get_text_hash,
+    get_zobrist_keys,
+)
+
+
+class TestHashUtil:
+    def test_get_zobrist_keys(self):
+        keys = get_zobrist_keys()
+        assert len(keys) == len(get_card_table().starflakes)
+        assert len(set(keys)) == len(keys)
+        assert all(0 <= n < 1 << 64 for n in keys)
+        assert get_zobrist_keys() is keys
+
+    def test_get_slot_keys(self):
+        keys = list(get_slot_keys(4))
+        assert len(keys) >= 4
+        assert all(n % 2 == 1 for n in keys)
+        assert get_slot_keys(30)[:4] == keys[:4]
+
+    def test_get_text_hash(self):
+        value = get_text_hash("0:generate:7")
+        assert 0 <= value < 1 << 64
+        assert get_text_hash("0:generate:7") == value
+        assert get_text_hash("0:generate:") != value
+
+
+class TestTranspositionTable:
+    def test_get_put(self):
+        table = TranspositionTable(4)
+        assert table.get(1) is None
+        assert table.get(1, 0) == 0
+        table.put(1, {"visits": 1})
+        table.get(1)["visits"] += 1
+        assert table.get(1) == {"visits": 2}
+        assert 1 in table
+        assert len(table) == 1
+        assert table.hits == 2
+        assert table.misses == 2
+
+    def test_lru(self):
+        table = TranspositionTable(2)
+        table.put(1, "a")
+        table.put(2, "b")
+        table.get(1)
+        table.put(3, "c")
+        assert 2 not in table
+        assert table.get(1) == "a"
+        assert table.get(3) == "c"
+        table.put(1, "d")
+        table.put(4, "e")
+        assert 3 not in table
+        assert table.get(1) == "d"
+        assert len(table) == 2
+        table.clear()
+        assert len(table) == 0
+        assert table.hits == 0
@@ -1,5 +1,8 @@
-from hoshizukuri_game.utils.kingdom_step_util import get_kingdom_steps
-from hoshizukuri_game.utils.card_util import get_card_id
+from hoshizukuri_game.utils import kingdom_step_util
+from hoshizukuri_game.utils.kingdom_step_util import (
+    get_kingdom_steps, load_kingdom_steps, register_kingdom_step
+)
+from hoshizukuri_game.utils.card_util import get_card_id, get_original_name
 from hoshizukuri_game.steps.common_card_steps import (
     HoshikuzuStep
 )
@@ -17,3 +20,32 @@ class TestKingdomStepUtil():
     def test_get_kingdom_steps_error(self):
         step = get_kingdom_steps(1, 2, 0, 3, 0)
         assert isinstance(step, AbstractStep)
+
+    def test_get_kingdom_steps_all(self):
+        load_kingdom_steps()
+        for card_id in range(1, 26):
+            step = get_kingdom_steps(0, 1, card_id, 3)
+            assert type(step).__name__.lower() == "%sstep" % (
+                get_original_name(card_id).lower())
+
+    def test_register_kingdom_step(self, monkeypatch):
+        # registration is done on a copy of the registry.
+        monkeypatch.setattr(
+            kingdom_step_util, "_kingdom_steps",
+            list(kingdom_step_util._get_kingdom_steps()))
+
+        class NewStep(AbstractStep):
+            def __init__(self, player_id, depth, uniq_id):
+                super().__init__()
+                self.uniq_id = uniq_id
+
+        register_kingdom_step(30, NewStep)
+        step = get_kingdom_steps(0, 1, 30, 3)
+        assert isinstance(step, NewStep)
+        assert step.uniq_id == 3
+        register_kingdom_step(
+            30, "hoshizukuri_game.steps.common_card_steps:HoshikuzuStep")
+        step = get_kingdom_steps(0, 1, 30, 3)
+        assert isinstance(step, HoshikuzuStep)
+        register_kingdom_step(30, None)
+        assert type(get_kingdom_steps(0, 1, 30, 3)) == AbstractStep
@@ -0,0 +1,123 @@
+import numpy as np
+from hoshizukuri_game.hoshizukuri_game import HoshizukuriGame
+from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.pile import PileName
+from hoshizukuri_game.models.turn import Phase
+from hoshizukuri_game.utils.action_util import COMMANDS
+from hoshizukuri_game.utils.observation_util import (
+    ObservationEncoder
+)
+from hoshizukuri_game.utils.self_play import SelfPlayRunner
+
+
+def make_games(count, choices=20):
+    runner = SelfPlayRunner()
+    simulator = HoshizukuriGame()
+    games = []
+    candidates_list = []
+    for seed in range(count):
+        game = runner.make_game(seed)
+        candidates = simulator.run_until_decision(game)
+        for _ in range(choices):
+            choice = game.get_random().choice(candidates).split("#")[0]
+            candidates = simulator.run_until_decision(game, choice)
+        games.append(game)
+        candidates_list.append([n.split("#")[0] for n in candidates])
+    return games, candidates_list
+
+
+class TestObservationEncoder:
+    def test_encode(self):
+        games, candidates_list = make_games(1)
+        game = games[0]
+        candidates = candidates_list[0]
+        encoder = ObservationEncoder(2)
+        obs = encoder.encode(game, candidates=candidates, selected=[1, 1, 6])
+        assert obs.shape == (encoder.size,)
+        assert obs.dtype == np.float32
+        h = encoder.card_id_size
+        n = 0
+        for player in game.players:
+            for pilename in [
+                    PileName.HAND, PileName.DECK, PileName.DISCARD,
+                    PileName.FIELD]:
+                assert list(obs[n:n + h]) == player.pile[
+                    pilename].composition()
+                n += h
+            groups = player.pile[PileName.FIELD].card_list
+            assert obs[n] == len(groups)
+            assert list(obs[n + 1:n + 1 + len(groups)]) == [
+                len(group) for group in groups]
+            n += 1 + encoder.max_field_groups
+            assert obs[n] == player.orbit
+            assert obs[n + 1] == player.tmp_orbit
+            n += 2
+        assert obs[n + game.turn.player_id] == 1
+        assert obs[n:n + 2].sum() == 1
+        choice_player_id = int(candidates[0].split(":")[0])
+        assert obs[n + 2 + choice_player_id] == 1
+        n += 4
+        phases = list(Phase)
+        assert obs[n + phases.index(game.phase)] == 1
+        assert obs[n:n + len(phases)].sum() == 1
+        n += len(phases)
+        assert obs[n] == game.turn.turn
+        assert obs[n + 1] == game.starflake
+        n += 2
+        for card_id, pile in game.supply.items():
+            assert obs[n + card_id] == pile.count
+        n += h
+        assert list(obs[n:n + h]) == game.trash.composition()
+        n += h
+        command = candidates[0].split(":")[1]
+        assert obs[n + COMMANDS.index(command)] == 1
+        assert obs[n:n + len(COMMANDS)].sum() == 1
+        n += len(COMMANDS)
+        assert obs[n + 1] == 2
+        assert obs[n + 6] == 1
+        assert obs[n:].sum() == 3
+        assert n + h == encoder.size
+
+    def test_encode_out(self):
+        games, candidates_list = make_games(1)
+        encoder = ObservationEncoder(2)
+        out = np.full(encoder.size, 9, dtype=np.float32)
+        assert encoder.encode(games[0], out) is out
+        assert (out == encoder.encode(games[0])).all()
+        offset = encoder.size - len(COMMANDS) - encoder.card_id_size
+        assert out[offset:].sum() == 0
+
+    def test_encode_batch(self):
+        games, candidates_list = make_games(3)
+        encoder = ObservationEncoder(2)
+        out = np.full((3, encoder.size), 9, dtype=np.float32)
+        assert encoder.encode_batch(games, out, candidates_list) is out
+        for index, game in enumerate(games):
+            assert (out[index] == encoder.encode(
+                game, candidates=candidates_list[index])).all()
+        assert encoder.encode_batch(games).shape == (3, encoder.size)
+
+    def test_encode_view(self):
+        games, candidates_list = make_games(3)
+        encoder = ObservationEncoder(2)
+        out = np.full((3, encoder.size + 1), 9, dtype=np.float32)[:, 1:]
+        encoder.encode_batch(games, out, candidates_list)
+        one = np.full(encoder.size * 2, 9, dtype=np.float32)[::2]
+        encoder.encode(games[0], one, candidates_list[0])
+        assert (out[0] == one).all()
+        for index, game in enumerate(games):
+            assert (out[index] == encoder.encode(
+                game, candidates=candidates_list[index])).all()
+
+    def test_encode_many_cards(self):
+        games, candidates_list = make_games(1)
+        game = games[0]
+        hand = game.players[0].pile[PileName.HAND]
+        card = hand.card_list[0]
+        for uniq_id in range(1000, 1300):
+            hand.push(Card(card.id, uniq_id))
+        encoder = ObservationEncoder(2)
+        obs = encoder.encode(game)
+        # the hand of player 0 is the first histogram.
+        assert obs[card.id] == hand.get_count(card.id)
+        assert hand.get_count(card.id) >= 300
@@ -1,10 +1,13 @@
+from itertools import combinations, permutations
 from hoshizukuri_game.models.game import Game
 from hoshizukuri_game.steps.abstract_step import AbstractStep
 from hoshizukuri_game.utils.other_util import (
     make_combination, make_permutation, get_enemy_ids,
-    call_choice_callback
+    iter_combinations, iter_permutations,
+    call_choice_callback, can_check_log_choice, is_sub_multiset
 )
 from hoshizukuri_game.models.card import Card
+from hoshizukuri_game.models.log import LogManager
 
 
 class TestGetEnemyIds():
@@ -18,13 +21,13 @@ class TestGetEnemyIds():
 class TestMakeCombination():
     def test_make_combination1(self):
         result = make_combination([1, 1, 2, 3], 2, False)
-        assert result == [[2, 3], [1, 1], [1, 2], [1, 3]]
+        assert result == [[1, 1], [1, 2], [1, 3], [2, 3]]
 
     def test_make_combination2(self):
         result = make_combination([
             Card(1, 1), Card(1, 2), Card(2, 3), Card(3, 4)
         ], 2, False)
-        assert result == [[2, 3], [1, 1], [1, 2], [1, 3]]
+        assert result == [[1, 1], [1, 2], [1, 3], [2, 3]]
 
     def test_make_combination3(self):
         result = make_combination([], 0, False)
@@ -32,7 +35,7 @@ class TestMakeCombination():
 
     def test_make_combination4(self):
         result = make_combination([1, 1, 2, 3], 2, True)
-        assert result == [[1], [2], [3], [2, 3], [1, 1], [1, 2], [1, 3], []]
+        assert result == [[1], [2], [3], [1, 1], [1, 2], [1, 3], [2, 3], []]
 
     def test_make_combination5(self):
         result = make_combination([1, 1, 2], 5, False)
@@ -66,6 +69,36 @@ class TestMakePermutation():
         assert result == [[1, 1, 3], [1, 3, 1], [3, 1, 1]]
 
 
+class TestIterCombinations():
+    def test_iter_combinations_1(self):
+        cards = [5, 1, 1, 1, 2, 1, 5, 3]
+        for count in range(len(cards) + 2):
+            result = list(iter_combinations(cards, count, False))
+            expected = sorted(set(combinations(sorted(cards), min(
+                count, len(cards)))))
+            assert result == expected
+
+    def test_iter_combinations_2(self):
+        iterator = iter_combinations([1] * 30 + [2] * 30, 30, True)
+        assert next(iterator) == (1,)
+        assert next(iterator) == (2,)
+        assert next(iterator) == (1, 1)
+
+
+class TestIterPermutations():
+    def test_iter_permutations_1(self):
+        cards = [Card(3, 1), Card(1, 2), Card(1, 3), Card(2, 4), Card(1, 5)]
+        card_ids = [card.id for card in cards]
+        for count in range(len(cards) + 1):
+            result = list(iter_permutations(cards, count, False))
+            expected = sorted(set(permutations(card_ids, count)))
+            assert result == expected
+
+    def test_iter_permutations_2(self):
+        result = list(iter_permutations([1, 1, 3], 2, True))
+        assert result == [(1,), (3,), (1, 1), (1, 3), (3, 1), ()]
+
+
 class TestCallChoiceCallback():
     def callback(self, game, candidates, choice, step):
         assert candidates == ["aaa", "bbb"]
@@ -78,3 +111,31 @@ class TestCallChoiceCallback():
         choice = "choice"
         step = AbstractStep()
         call_choice_callback(game, candidates, choice, step)
+
+
+class TestCanCheckLogChoice():
+    def test_can_check_log_choice_1(self):
+        game = Game()
+        game.choice = "0:playset:1"
+        assert not can_check_log_choice(game)
+        game.log_manager = LogManager()
+        assert can_check_log_choice(game)
+        game.choice_callback = lambda *args: None
+        assert not can_check_log_choice(game)
+
+    def test_can_check_log_choice_2(self):
+        game = Game()
+        game.log_manager = LogManager()
+        assert not can_check_log_choice(game)
+
+
+class TestIsSubMultiset():
+    def test_is_sub_multiset_1(self):
+        assert is_sub_multiset([1, 1, 3], [0, 2, 0, 1])
+        assert is_sub_multiset([], [0, 2, 0, 1])
+
+    def test_is_sub_multiset_2(self):
+        assert not is_sub_multiset([3, 3], [0, 2, 0, 1])
+        assert not is_sub_multiset([2], [0, 2, 0, 1])
+        assert not is_sub_multiset([4], [0, 2, 0, 1])
+        assert not is_sub_multiset([-1], [0, 2, 0, 1])
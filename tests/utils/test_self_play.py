@@ -0,0 +1,64 @@
+from hoshizukuri_game.models.game import Game
+from hoshizukuri_game.utils.card_util import get_card_id
+from hoshizukuri_game.utils.self_play import (
+    SelfPlayRunner, greedy_policy, random_policy, main
+)
+import io
+import json
+
+
+class TestPolicy():
+    def test_random_policy(self):
+        game = Game(0)
+        assert random_policy(game, ["0:generate:3"]) == "0:generate:3"
+
+    def test_greedy_policy(self):
+        game = Game(0)
+        candidates = [
+            "0:generate:%d" % get_card_id("eisei"),
+            "0:generate:%d" % get_card_id("kousei"),
+            "0:generate:%d" % get_card_id("wakusei"),
+            "0:generate:"
+        ]
+        assert greedy_policy(game, candidates) == (
+            "0:generate:%d" % get_card_id("kousei"))
+        assert greedy_policy(game, ["0:generate:"]) == "0:generate:"
+
+
+class TestSelfPlayRunner():
+    def test_play(self):
+        runner = SelfPlayRunner()
+        result = runner.play(3)
+        assert result["seed"] == 3
+        assert result["winner_id"] in [0, 1]
+        assert len(result["points"]) == 2
+        assert runner.play(3) == result
+
+    def test_play_max_turn(self):
+        runner = SelfPlayRunner(
+            [random_policy, greedy_policy], max_turn=3)
+        result = runner.play(0)
+        assert result["turn"] == 3
+        assert result["winner_id"] == -1
+        assert result["points"] == []
+
+    def test_iter_play_workers(self):
+        runner = SelfPlayRunner(greedy_policy)
+        results = list(runner.iter_play(range(4)))
+        assert [n["seed"] for n in results] == [0, 1, 2, 3]
+        assert list(runner.iter_play(range(4), workers=2)) == results
+
+    def test_run(self):
+        runner = SelfPlayRunner()
+        output = io.StringIO()
+        summary = runner.run(3, seed=5, output=output)
+        assert summary["games"] == 3
+        assert summary["finished"] == 3
+        lines = output.getvalue().splitlines()
+        assert [json.loads(n)["seed"] for n in lines] == [5, 6, 7]
+
+    def test_main(self, tmp_path):
+        filename = str(tmp_path / "result.jsonl")
+        assert main(["-n", "2", "-p", "greedy", "-o", filename]) == 0
+        with open(filename) as f:
+            assert len(f.readlines()) == 2
@@ -0,0 +1,52 @@
+from hoshizukuri_game.utils.validate_corpus import (
+    find_logs, iter_validate_corpus, validate_corpus, main
+)
+import io
+import json
+
+
+class TestValidateCorpus():
+    def test_find_logs(self):
+        assert find_logs(["tests/test_log"]) == [
+            "tests/test_log/error_1.txt",
+            "tests/test_log/error_2.txt",
+            "tests/test_log/error_3.txt",
+            "tests/test_log/test_1.txt"
+        ]
+        assert find_logs(["tests/test_log/test_1.txt"]) == [
+            "tests/test_log/test_1.txt"]
+
+    def test_iter_validate_corpus(self):
+        results = {
+            n["path"]: n for n in iter_validate_corpus(
+                find_logs(["tests/test_log"]))
+        }
+        result = results["tests/test_log/test_1.txt"]
+        assert result["message"] == "ok"
+        assert result["line"] is None
+        assert result["result"][0]["point"] == 19
+        result = results["tests/test_log/error_1.txt"]
+        assert result["message"].startswith("Invalid Log Exception")
+        assert result["line"] == 48
+        assert result["result"] == []
+
+    def test_validate_corpus_workers(self):
+        output = io.StringIO()
+        summary = validate_corpus(
+            find_logs(["tests/test_log"]) * 2, workers=2, output=output)
+        assert summary["files"] == 8
+        assert summary["ok"] == 2
+        assert summary["errors"] == 6
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 8
+        assert sorted(json.loads(n)["path"] for n in lines)[-1] == (
+            "tests/test_log/test_1.txt")
+
+    def test_main(self, tmp_path):
+        filename = str(tmp_path / "result.jsonl")
+        assert main([
+            "tests/test_log/test_1.txt", "-w", "1", "-o", filename]) == 0
+        with open(filename) as f:
+            result = json.loads(f.readline())
+        assert result["message"] == "ok"
+        assert main(["tests/test_log", "-w", "1", "-o", filename]) == 1